@@ -17,15 +17,33 @@
 # Course: Fundamentals of Computer Science using Python
 # University: Lok Jagruti University
 
+import sys  # For reading command-line arguments
+import time  # For measuring startup time
+
 # Import our custom modules from the modules package
 # Since we created an __init__.py file in the modules directory,
 # Python now recognizes it as a package and we can import from it directly
-from modules.menu import main_menu  # Import the main_menu function from modules/menu.py
+# (menu.py only imports the feature modules when they are first used)
+menu_import_start = time.perf_counter()
+from modules.menu import main_menu, profile_startup  # Import functions from modules/menu.py
+menu_import_ms = (time.perf_counter() - menu_import_start) * 1000
 
 def main():
     # Main function to start the application
     # This function contains all the startup code for our program
 
+    # "python main.py --profile-startup" shows import times and exits
+    if "--profile-startup" in sys.argv[1:]:
+        print(f"Menu ready after {menu_import_ms:.1f} ms")
+        profile_startup()
+        return
+
+    # Any other arguments are a command for the command-line interface,
+    # e.g. "python main.py expiry purge" (runs without the menus)
+    if len(sys.argv) > 1:
+        from modules.cli import run_cli  # Only needed when a command is given
+        sys.exit(run_cli(sys.argv[1:]))
+
     # Use try-except block to handle errors gracefully
     try:
         # Start the main menu system directly - this calls the function from menu.py
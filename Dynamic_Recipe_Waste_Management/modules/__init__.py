@@ -17,6 +17,18 @@ This package contains all the feature modules for the kitchen management system:
 - expiry_ml.py: AI-powered expiry prediction
 - expense.py: Expense tracking and cost management
 - reports.py: Data visualization and analytics reports
+- data_store.py: Shared, cached loading and saving of the CSV tables
+- sqlite_store.py: Optional SQLite storage backend for the tables
+- parquet_store.py: Optional Parquet storage for the waste and expense history
+- model_store.py: Saving and reloading trained ML models (with versions)
+- recipe_index.py: Bitmask index of recipes for fast feasibility checks
+- expiry_index.py: Sorted expiry date index for date range queries
+- name_index.py: Ingredient name index for fast searching by name
+- rollups.py: Running waste and expense totals for the reports
+- report_jobs.py: Parallel report rendering for many kitchens/sites
+- cli.py: Command-line interface for scripts (no interactive menus)
+- bulk_import.py: Bulk import of large CSV files in chunks
+- schema.py: Allowed values, validation shared by all add/import paths, unit conversion and compact column types
 
 Each module is designed to be educational and demonstrate
 different Python concepts from the computer science syllabus.
@@ -0,0 +1,145 @@
+# Bulk CSV Import
+#
+# This module adds many rows at once from a CSV file, e.g. a supplier's
+# delivery list (ingredients), a till's waste log (waste) or a list of
+# purchases (expenses):
+# - The file is read in chunks (pd.read_csv with chunksize), so even a file
+#   with millions of lines never has to fit in memory at once
+# - Every chunk is checked by schema.validate_frame() with whole-column
+#   operations (no loop over the rows): names, numbers, units, storage
+#   types, reasons and dates - the same rules as the menus use
+# - The good rows of a chunk get their new IDs in one go and are appended
+#   to the table in one write (one transaction per chunk with SQLite)
+# - Rows that fail a check are written to a "rejects" CSV file together
+#   with their line number and what was wrong, and are not imported
+#
+# The input file needs a header line with the column names of the table
+# (upper/lowercase does not matter). 'id' is ignored - new IDs are always
+# handed out. Optional columns: 'cost' (empty = 0), 'date' for waste and
+# 'date_added' for ingredients (empty = today).
+#
+# Every chunk is saved as soon as it is checked, so the import as a whole is
+# NOT one transaction (keeping every chunk until the end would need the whole
+# file in memory). If the import stops halfway (e.g. the disk is full), the
+# chunks before are already in the table. Running the same file again then
+# adds those rows a second time under new IDs, so remove them first (they
+# have the highest IDs) or import only the lines that were not saved yet.
+#
+# Usage from the command line:
+#     python -m modules.bulk_import ingredients deliveries.csv
+#     python main.py waste import pos_waste.csv
+#
+# Uses concepts from syllabus:
+# - Pandas for reading CSV files in chunks
+# - Boolean indexing for filtering rows
+# - Dictionaries for the import definitions
+# - File handling and exception handling
+
+# Import required libraries
+import os  # For file paths
+import sys  # For command line arguments
+import time  # For measuring how long the import takes
+import numpy as np  # For checking whole columns at once
+import pandas as pd  # For reading the CSV file in chunks
+from .data_store import append_rows, next_id  # Shared table access
+from .schema import validate_frame, get_today  # Shared validation rules
+
+# Number of lines read and saved at a time
+DEFAULT_CHUNK_SIZE = 10000
+
+# Tables that can be imported: short name -> filename
+# (the columns and their checks are in schema.py)
+IMPORT_TABLES = {
+    'ingredients': 'ingredients.csv',
+    'waste': 'waste.csv',
+    'expenses': 'expenses.csv',
+}
+
+def get_rejects_path(source_path):
+    # Get the file for rejected rows, e.g. deliveries.csv -> deliveries.rejects.csv
+    base_path, extension = os.path.splitext(source_path)
+    return base_path + ".rejects.csv"
+
+def import_csv_file(table_name, source_path, chunk_size=DEFAULT_CHUNK_SIZE, rejects_path=None):
+    # Import all rows of a CSV file into a table
+    #
+    # Args:
+    #     table_name (str) - 'ingredients', 'waste' or 'expenses'
+    #     source_path (str) - CSV file to import
+    #     chunk_size (int) - number of lines read and saved at a time
+    #                        (each chunk is saved on its own, see the top)
+    #     rejects_path (str) - file for rejected rows
+    #                          (default: <source>.rejects.csv)
+    # Returns: dictionary with 'read', 'imported' and 'rejected' row counts,
+    #          'rejects_path' (None if no row was rejected) and 'seconds'
+    # Raises: ValueError for an unknown table or missing columns,
+    #         FileNotFoundError if the file does not exist
+    if table_name not in IMPORT_TABLES:
+        raise ValueError(f"Unknown table: {table_name} (use {', '.join(IMPORT_TABLES)})")
+    filename = IMPORT_TABLES[table_name]
+    if rejects_path is None:
+        rejects_path = get_rejects_path(source_path)
+    if os.path.exists(rejects_path):
+        os.remove(rejects_path)  # Old rejects belong to an earlier import
+
+    start_time = time.perf_counter()
+    today = get_today()
+    result = {'read': 0, 'imported': 0, 'rejected': 0, 'rejects_path': None}
+
+    # Read everything as text, so the checks see exactly what is in the file
+    reader = pd.read_csv(source_path, chunksize=chunk_size, dtype=str, keep_default_na=False)
+    line_number = 2  # Line 1 is the header
+    for chunk in reader:
+        chunk.columns = chunk.columns.str.strip().str.lower()
+        chunk.index = pd.RangeIndex(line_number, line_number + len(chunk))
+        line_number = line_number + len(chunk)
+        result['read'] = result['read'] + len(chunk)
+
+        good_rows, errors = validate_frame(filename, chunk, today)
+        is_good = errors == ""
+
+        # Good rows: new IDs in one go, then one append
+        new_rows = good_rows[is_good]
+        if len(new_rows) > 0:
+            first_id = next_id(filename, 'id')
+            new_rows.insert(0, 'id', np.arange(first_id, first_id + len(new_rows)))
+            append_rows(filename, new_rows.reset_index(drop=True))
+            result['imported'] = result['imported'] + len(new_rows)
+
+        # Rejected rows: as they were in the file, plus line number and errors
+        rejected = chunk[~is_good]
+        if len(rejected) > 0:
+            rejected = rejected.assign(error=errors[~is_good])
+            rejected.insert(0, 'line', rejected.index)
+            write_header = result['rejects_path'] is None
+            rejected.to_csv(rejects_path, mode='w' if write_header else 'a', header=write_header, index=False)
+            result['rejects_path'] = rejects_path
+            result['rejected'] = result['rejected'] + len(rejected)
+
+    result['seconds'] = time.perf_counter() - start_time
+    return result
+
+def print_import_result(table_name, result):
+    # Print a short summary of an import
+    print(f" Read {result['read']} row(s) in {result['seconds']:.2f} s.")
+    print(f"SUCCESS: Imported {result['imported']} row(s) into {table_name}.")
+    if result['rejected'] > 0:
+        print(f"WARNING: Rejected {result['rejected']} row(s) - see {result['rejects_path']}")
+
+def main(arguments):
+    # Command line entry: TABLE FILE
+    if len(arguments) != 2:
+        print(f"Usage: python -m modules.bulk_import {{{','.join(IMPORT_TABLES)}}} FILE")
+        return 1
+    table_name, source_path = arguments
+    try:
+        result = import_csv_file(table_name, source_path)
+    except (ValueError, FileNotFoundError) as e:
+        print(f"ERROR: {e}")
+        return 1
+    print_import_result(table_name, result)
+    return 0
+
+# Run the importer when this file is executed directly
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
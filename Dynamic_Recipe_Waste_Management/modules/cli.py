@@ -0,0 +1,545 @@
+# Command-Line Interface (no menus)
+#
+# This module lets scripts use the main features without the interactive
+# menus. Every menu action is one command (AREA ACTION), e.g.:
+#     python main.py ingredient add --name Tomato --qty 2 --unit kg --expiry 2025-08-25 --storage fridge --cost 40
+#     python main.py ingredient list --sort expiry
+#     python main.py ingredient update --id 3 --qty 500
+#     python main.py waste add --name Bread --qty 1 --unit pieces --reason expired --cost 30
+#     python main.py waste summary --by month
+#     python main.py expense add --name Tomato --cost 40
+#     python main.py expense delete --id 7
+#     python main.py expiry purge
+#     python main.py expiry soon --days 3
+#     python main.py expiry predict --type Dairy --days 4 --storage fridge
+#     python main.py expiry check   (predict the status of the whole stock)
+#     python main.py recipe suggest --top 10
+#     python main.py recipe add --name "Tomato Soup" --ingredients "Tomato, Onion"
+#     python main.py report render --format svg
+#     python main.py report text
+#     python main.py report memory   (memory used by each table)
+#     python main.py waste import pos_waste.csv   (bulk import, see bulk_import.py)
+# Run 'python main.py AREA --help' to see all actions of an area.
+# Chart windows (reports menu 1-4) are not opened; 'report render' saves
+# the same charts as files instead. Deleting by ID does not ask for a
+# confirmation like the menu does.
+#
+# Starting Python and importing pandas takes much longer than one command,
+# so many commands can be run in ONE process with the batch command:
+#     python main.py batch commands.txt      (one command per line)
+#     python main.py batch - < commands.txt  (read the commands from stdin)
+# Tables, indexes and models (e.g. the expiry predictor) stay loaded between
+# the commands of a batch.
+#
+# Every command returns an exit code: 0 = success, 1 = error (wrong
+# arguments are an error too).
+# Like the menu, feature modules are only imported by the commands that
+# need them.
+#
+# Uses concepts from syllabus:
+# - Functions and modular programming
+# - Command line arguments (argparse from the standard library)
+# - String operations (shlex for splitting command lines)
+# - Exception handling with try-except
+
+# Import required libraries
+import argparse  # For reading command line options
+import os  # For comparing folder paths
+import shlex  # For splitting a batch line into words like a shell does
+import sys  # For reading commands from stdin
+from .data_store import get_data_dir, set_data_dir, get_storage_backend, set_storage_backend, STORAGE_BACKENDS, delete_row, get_rows, print_memory_report  # Shared table access
+from .menu import load_feature_module  # Imports a feature module on first use
+
+def ingredient_add(options):
+    # ingredient add: add one ingredient to the stock
+    ingredient = load_feature_module("ingredient")
+    row = ingredient.record_ingredient(options.name, options.qty, options.unit,
+                                       options.expiry, options.storage, options.cost)
+    print(f"SUCCESS: Ingredient '{row['name']}' added (id {row['id']}).")
+    return 0
+
+def ingredient_list(options):
+    # ingredient list: print the stock (optionally sorted, filtered or searched)
+    ingredient = load_feature_module("ingredient")
+    if options.search is not None:
+        # Partial matching with the name index (no scan of every name)
+        name_index = load_feature_module("name_index")
+        matching_ids = name_index.find_ids_containing(options.search.strip().lower())
+        ingredients = get_rows("ingredients.csv", matching_ids)
+    else:
+        ingredients = ingredient.load_ingredients()
+    if options.storage is not None:
+        ingredients = ingredients[ingredients['storage_type'] == options.storage.strip().lower()]
+    if options.sort == "expiry":
+        ingredients = ingredients.sort_values(by='expiry_date')
+    ingredient.display_ingredients_table(ingredients)
+    return 0
+
+def ingredient_update(options):
+    # ingredient update: change the quantity of one ingredient
+    ingredient = load_feature_module("ingredient")
+    try:
+        row = ingredient.set_ingredient_quantity(options.id, options.qty)
+    except ValueError as e:
+        print(f"ERROR: {e}")
+        return 1
+    print(f"SUCCESS: Updated {row['name']} quantity to {row['quantity']} {row['unit']}.")
+    return 0
+
+def ingredient_remove(options):
+    # ingredient remove: remove one ingredient by its ID
+    if not delete_row("ingredients.csv", 'id', options.id):
+        print(f"ERROR: No ingredient with id {options.id}.")
+        return 1
+    print(f"SUCCESS: Ingredient {options.id} removed.")
+    return 0
+
+def waste_add(options):
+    # waste add: record one wasted ingredient
+    waste = load_feature_module("waste")
+    row = waste.record_waste_entry(options.name, options.qty, options.unit,
+                                   options.reason, options.cost, options.date)
+    print(f"SUCCESS: Waste entry for '{row['name']}' added (id {row['id']}).")
+    return 0
+
+def waste_list(options):
+    # waste list: print the waste entries (optionally sorted or filtered)
+    waste = load_feature_module("waste")
+    waste_df = waste.load_waste_data()
+    if options.reason is not None:
+        waste_df = waste_df[waste_df['reason'] == options.reason.strip().title()]
+    if options.newest_first:
+        waste_df = waste_df.sort_values(by='date', ascending=False)
+    waste.display_waste_table(waste_df)
+    return 0
+
+def waste_summary(options):
+    # waste summary: waste totals per ingredient or per month
+    waste = load_feature_module("waste")
+    if options.by == "month":
+        waste.print_monthly_waste()
+    else:
+        waste.print_waste_by_ingredient()
+    return 0
+
+def waste_tips(options):
+    # waste tips: show the waste reduction tips
+    waste = load_feature_module("waste")
+    waste.waste_reduction_tips()
+    return 0
+
+def delete_by_id(options):
+    # waste/expense delete: delete one entry by its ID (no confirmation)
+    if not delete_row(options.table, 'id', options.id):
+        print(f"ERROR: No entry with id {options.id} in {options.table}.")
+        return 1
+    print(f"SUCCESS: Entry {options.id} deleted from {options.table}.")
+    return 0
+
+def add_delete_parser(actions, table_filename):
+    # Add the 'delete' action for one table
+    action = actions.add_parser("delete", help="delete an entry by ID")
+    action.add_argument("--id", type=int, required=True)
+    action.set_defaults(handler=delete_by_id, table=table_filename)
+
+def expense_add(options):
+    # expense add: record one expense
+    expense = load_feature_module("expense")
+    row = expense.record_expense(options.name, options.cost)
+    print(f"SUCCESS: Expense for '{row['name']}' added (id {row['id']}).")
+    return 0
+
+def expense_show(options):
+    # expense list/total/by-ingredient/summary: print one expense view
+    expense = load_feature_module("expense")
+    if options.view == "list":
+        expense.view_all_expenses()
+    elif options.view == "total":
+        expense.view_total_expenses()
+    elif options.view == "by-ingredient":
+        expense.view_ingredient_wise_expenses()
+    else:
+        expense.expense_summary()
+    return 0
+
+def import_rows(options):
+    # ingredient/waste/expense import: add all rows of a CSV file
+    bulk_import = load_feature_module("bulk_import")
+    result = bulk_import.import_csv_file(options.table, options.file, options.chunk_size, options.rejects)
+    bulk_import.print_import_result(options.table, result)
+    return 0
+
+def add_import_parser(actions, table_name):
+    # Add the 'import' action for one table
+    action = actions.add_parser("import", help=f"import many rows into {table_name} from a CSV file")
+    action.add_argument("file", help="CSV file with a header line")
+    action.add_argument("--chunk-size", type=int, default=10000, help="lines read at a time (default: 10000)")
+    action.add_argument("--rejects", help="file for rejected rows (default: FILE.rejects.csv)")
+    action.set_defaults(handler=import_rows, table=table_name)
+
+def expiry_purge(options):
+    # expiry purge: remove every expired ingredient
+    expiry = load_feature_module("expiry")
+    if expiry.remove_expired_ingredients() is None:
+        return 1
+    return 0
+
+def expiry_scan(options):
+    # expiry scan: check every ingredient by date (no ML, nothing removed)
+    expiry = load_feature_module("expiry")
+    expiry.check_expiry_simple(ask_to_remove=False)
+    return 0
+
+def expiry_status(options):
+    # expiry status: detailed expiry status sorted by urgency
+    expiry = load_feature_module("expiry")
+    expiry.show_expiry_status()
+    return 0
+
+def expiry_soon(options):
+    # expiry soon: ingredients that expire within the next few days
+    expiry = load_feature_module("expiry")
+    if options.days is not None and options.days < 0:
+        print("ERROR: --days cannot be negative.")
+        return 1
+    days = options.days
+    if days is None:
+        days = expiry.SOON_DAYS
+    expiry.show_expiring_soon(days)
+    return 0
+
+def expiry_ingredient(options):
+    # expiry ingredient: expiry status of one ingredient by name
+    expiry = load_feature_module("expiry")
+    expiry.check_specific_ingredient(options.name)
+    return 0
+
+def expiry_dataset(options):
+    # expiry dataset: show the data the expiry model is trained on
+    expiry_ml = load_feature_module("expiry_ml")
+    expiry_ml.view_expiry_dataset()
+    return 0
+
+def expiry_predict(options):
+    # expiry predict: predict the status of one ingredient
+    expiry_ml = load_feature_module("expiry_ml")
+    if options.days < 0:
+        print("ERROR: --days cannot be negative.")
+        return 1
+    predictor = expiry_ml.get_expiry_predictor()
+    if predictor is None:
+        print("ERROR: Could not train the expiry model.")
+        return 1
+    ingredient_type = options.type.strip().title()
+    storage_type = options.storage.strip().lower()
+    predicted_status, confidence = expiry_ml.predict_expiry_status(predictor, ingredient_type,
+                                                                    options.days, storage_type)
+    expiry_ml.print_expiry_prediction(ingredient_type, options.days, storage_type,
+                                      predicted_status, confidence)
+    return 0
+
+def expiry_check(options):
+    # expiry check: predict the status of every ingredient in stock
+    expiry_ml = load_feature_module("expiry_ml")
+    if expiry_ml.get_expiry_predictor() is None:
+        print("ERROR: Could not train the expiry model.")
+        return 1
+    expiry_ml.check_current_ingredients_expiry()
+    return 0
+
+def expiry_models(options):
+    # expiry models: list the saved versions of the expiry model
+    expiry_ml = load_feature_module("expiry_ml")
+    expiry_ml.show_model_versions()
+    return 0
+
+def recipe_suggest(options):
+    # recipe suggest: show the best recipes for the current stock
+    recipe_ml = load_feature_module("recipe_ml")
+    available_ingredients = recipe_ml.load_available_ingredients()
+    if not available_ingredients:
+        print(" No ingredients available in stock.")
+        return 0
+    if options.top <= 0:
+        print("ERROR: --top must be a positive number.")
+        return 1
+    recipe_ml.print_ranked_recipes(recipe_ml.rank_recipes(available_ingredients, options.top))
+    return 0
+
+def recipe_predict(options):
+    # recipe predict: the single AI suggestion (menu option 1)
+    recipe_ml = load_feature_module("recipe_ml")
+    recipe_ml.suggest_recipes()
+    return 0
+
+def recipe_possible(options):
+    # recipe possible: every recipe that can be made with the stock
+    recipe_ml = load_feature_module("recipe_ml")
+    recipe_ml.get_all_possible_recipes()
+    return 0
+
+def recipe_add(options):
+    # recipe add: add a recipe (the model is retrained on the next suggestion)
+    recipe_ml = load_feature_module("recipe_ml")
+    try:
+        row = recipe_ml.record_recipe(options.name, options.ingredients)
+    except ValueError as e:
+        print(f"ERROR: {e}")
+        return 1
+    print(f"SUCCESS: Recipe '{row['recipe_name']}' added (id {row['recipe_id']}).")
+    return 0
+
+def recipe_regenerate(options):
+    # recipe regenerate: build the ML dataset again from recipes.csv
+    recipe_ml = load_feature_module("recipe_ml")
+    recipe_ml.generate_ml_dataset()
+    return 0
+
+def report_render(options):
+    # report render: save chart reports as files (no display needed)
+    reports = load_feature_module("reports")
+    report_names = options.report
+    if not report_names:
+        report_names = list(reports.REPORT_FIGURE_SIZES)
+
+    for report_name in report_names:
+        output_path = reports.render_report(report_name, options.output, options.format)
+        if output_path is None:
+            print(f" {report_name}: no data - skipped.")
+        else:
+            print(f" Saved: {output_path}")
+    return 0
+
+def report_text(options):
+    # report text: print the text summary report
+    reports = load_feature_module("reports")
+    reports.generate_text_report()
+    return 0
+
+def report_memory(options):
+    # report memory: show how much memory each table uses when loaded
+    print_memory_report()
+    return 0
+
+def run_batch(options):
+    # batch: run many commands (one per line) in this process
+    # Empty lines and lines starting with # are skipped.
+    if options.file == "-":
+        lines = sys.stdin.readlines()
+    else:
+        try:
+            with open(options.file) as batch_file:
+                lines = batch_file.readlines()
+        except OSError as e:
+            print(f"ERROR: Could not read {options.file}: {e}")
+            return 1
+
+    parser = build_parser()
+    failed_count = 0
+    command_count = 0
+    for line_number in range(len(lines)):
+        line = lines[line_number].strip()
+        if line == "" or line.startswith("#"):
+            continue
+        command_count = command_count + 1
+        try:
+            arguments = shlex.split(line)
+        except ValueError as e:
+            print(f"ERROR: Line {line_number + 1}: {e}")
+            failed_count = failed_count + 1
+            continue
+        if arguments and arguments[0] == "batch":
+            print(f"ERROR: Line {line_number + 1}: batch files cannot run other batch files.")
+            failed_count = failed_count + 1
+            continue
+        if run_arguments(parser, arguments) != 0:
+            print(f"ERROR: Line {line_number + 1} failed: {line}")
+            failed_count = failed_count + 1
+
+    print(f" Batch finished: {command_count - failed_count} of {command_count} command(s) succeeded.")
+    if failed_count > 0:
+        return 1
+    return 0
+
+def build_parser():
+    # Build the argument parser with one sub-command per action
+    parser = argparse.ArgumentParser(prog="main.py",
+                                     description="Dynamic Recipe & Waste Management System (no menus)")
+    parser.add_argument("--data-dir", help="folder with the data files (default: data/)")
+    parser.add_argument("--backend", choices=STORAGE_BACKENDS, help="storage backend to use")
+    areas = parser.add_subparsers(dest="area", metavar="AREA")
+    areas.required = True
+
+    # ingredient add / list / update / remove / import
+    ingredient_parser = areas.add_parser("ingredient", help="manage the ingredient stock")
+    ingredient_actions = ingredient_parser.add_subparsers(dest="action", metavar="ACTION")
+    ingredient_actions.required = True
+    action = ingredient_actions.add_parser("add", help="add an ingredient")
+    action.add_argument("--name", required=True)
+    action.add_argument("--qty", type=float, required=True, help="quantity")
+    action.add_argument("--unit", required=True, help="g, kg, ml, l, pieces or slices")
+    action.add_argument("--expiry", required=True, help="expiry date (YYYY-MM-DD)")
+    action.add_argument("--storage", required=True, help="fridge, pantry or freezer")
+    action.add_argument("--cost", type=float, default=0.0)
+    action.set_defaults(handler=ingredient_add)
+    action = ingredient_actions.add_parser("list", help="show the ingredients")
+    action.add_argument("--sort", choices=["expiry"], help="sort by expiry date")
+    action.add_argument("--storage", help="only show one storage type (fridge, pantry or freezer)")
+    action.add_argument("--search", help="only show names containing this text")
+    action.set_defaults(handler=ingredient_list)
+    action = ingredient_actions.add_parser("update", help="change the quantity of an ingredient")
+    action.add_argument("--id", type=int, required=True)
+    action.add_argument("--qty", type=float, required=True, help="new quantity (in the stored unit)")
+    action.set_defaults(handler=ingredient_update)
+    action = ingredient_actions.add_parser("remove", help="remove an ingredient by ID")
+    action.add_argument("--id", type=int, required=True)
+    action.set_defaults(handler=ingredient_remove)
+    add_import_parser(ingredient_actions, "ingredients")
+
+    # waste add / list / summary / tips / delete / import
+    waste_parser = areas.add_parser("waste", help="record wasted food")
+    waste_actions = waste_parser.add_subparsers(dest="action", metavar="ACTION")
+    waste_actions.required = True
+    action = waste_actions.add_parser("add", help="add a waste entry")
+    action.add_argument("--name", required=True)
+    action.add_argument("--qty", type=float, required=True, help="quantity")
+    action.add_argument("--unit", required=True, help="g, kg, ml, l, pieces or slices")
+    action.add_argument("--reason", required=True, help="expired, spoiled, leftover, overcooked or burnt")
+    action.add_argument("--cost", type=float, default=0.0)
+    action.add_argument("--date", help="date of the waste (YYYY-MM-DD, default: today)")
+    action.set_defaults(handler=waste_add)
+    action = waste_actions.add_parser("list", help="show the waste entries")
+    action.add_argument("--newest-first", action="store_true", help="sort by date, newest first")
+    action.add_argument("--reason", help="only show one reason")
+    action.set_defaults(handler=waste_list)
+    action = waste_actions.add_parser("summary", help="waste totals per ingredient or month")
+    action.add_argument("--by", choices=["ingredient", "month"], default="ingredient")
+    action.set_defaults(handler=waste_summary)
+    action = waste_actions.add_parser("tips", help="show waste reduction tips")
+    action.set_defaults(handler=waste_tips)
+    add_delete_parser(waste_actions, "waste.csv")
+    add_import_parser(waste_actions, "waste")
+
+    # expense add / list / total / by-ingredient / summary / delete / import
+    expense_parser = areas.add_parser("expense", help="record expenses")
+    expense_actions = expense_parser.add_subparsers(dest="action", metavar="ACTION")
+    expense_actions.required = True
+    action = expense_actions.add_parser("add", help="add an expense")
+    action.add_argument("--name", required=True)
+    action.add_argument("--cost", type=float, required=True)
+    action.set_defaults(handler=expense_add)
+    action = expense_actions.add_parser("list", help="show all expense records")
+    action.set_defaults(handler=expense_show, view="list")
+    action = expense_actions.add_parser("total", help="show the total expenses")
+    action.set_defaults(handler=expense_show, view="total")
+    action = expense_actions.add_parser("by-ingredient", help="show the expenses per ingredient")
+    action.set_defaults(handler=expense_show, view="by-ingredient")
+    action = expense_actions.add_parser("summary", help="show the expense summary")
+    action.set_defaults(handler=expense_show, view="summary")
+    add_delete_parser(expense_actions, "expenses.csv")
+    add_import_parser(expense_actions, "expenses")
+
+    # expiry scan / purge / status / soon / ingredient (by date)
+    # expiry predict / check / dataset / models (ML)
+    expiry_parser = areas.add_parser("expiry", help="expiry checks")
+    expiry_actions = expiry_parser.add_subparsers(dest="action", metavar="ACTION")
+    expiry_actions.required = True
+    action = expiry_actions.add_parser("scan", help="check all ingredients by date (nothing is removed)")
+    action.set_defaults(handler=expiry_scan)
+    action = expiry_actions.add_parser("purge", help="remove all expired ingredients")
+    action.set_defaults(handler=expiry_purge)
+    action = expiry_actions.add_parser("status", help="show the detailed expiry status")
+    action.set_defaults(handler=expiry_status)
+    action = expiry_actions.add_parser("soon", help="show the ingredients expiring soon")
+    action.add_argument("--days", type=int, help="days to look ahead (default: 2)")
+    action.set_defaults(handler=expiry_soon)
+    action = expiry_actions.add_parser("ingredient", help="check one ingredient by name")
+    action.add_argument("--name", required=True)
+    action.set_defaults(handler=expiry_ingredient)
+    action = expiry_actions.add_parser("predict", help="predict the expiry status of one ingredient (ML)")
+    action.add_argument("--type", required=True, help="Vegetables, Dairy or Grains")
+    action.add_argument("--days", type=int, required=True, help="days since purchase")
+    action.add_argument("--storage", required=True, help="fridge, freezer or pantry")
+    action.set_defaults(handler=expiry_predict)
+    action = expiry_actions.add_parser("check", help="predict the expiry status of all ingredients (ML)")
+    action.set_defaults(handler=expiry_check)
+    action = expiry_actions.add_parser("dataset", help="show the expiry training dataset")
+    action.set_defaults(handler=expiry_dataset)
+    action = expiry_actions.add_parser("models", help="list the saved versions of the expiry model")
+    action.set_defaults(handler=expiry_models)
+
+    # recipe suggest / predict / possible / add / regenerate
+    recipe_parser = areas.add_parser("recipe", help="recipe suggestions")
+    recipe_actions = recipe_parser.add_subparsers(dest="action", metavar="ACTION")
+    recipe_actions.required = True
+    action = recipe_actions.add_parser("suggest", help="rank recipes by the ingredients in stock")
+    action.add_argument("--top", type=int, default=5, help="number of recipes to show (default: 5)")
+    action.set_defaults(handler=recipe_suggest)
+    action = recipe_actions.add_parser("predict", help="get the single AI recipe suggestion")
+    action.set_defaults(handler=recipe_predict)
+    action = recipe_actions.add_parser("possible", help="show all recipes that can be made now")
+    action.set_defaults(handler=recipe_possible)
+    action = recipe_actions.add_parser("add", help="add a new recipe")
+    action.add_argument("--name", required=True)
+    action.add_argument("--ingredients", required=True, help="comma-separated, e.g. \"Tomato, Onion\"")
+    action.set_defaults(handler=recipe_add)
+    action = recipe_actions.add_parser("regenerate", help="build the ML dataset again")
+    action.set_defaults(handler=recipe_regenerate)
+
+    # report render / text / memory
+    report_parser = areas.add_parser("report", help="chart reports")
+    report_actions = report_parser.add_subparsers(dest="action", metavar="ACTION")
+    report_actions.required = True
+    action = report_actions.add_parser("render", help="save chart reports as image files")
+    # Same report names as REPORT_FIGURE_SIZES in reports.py (not imported
+    # here, so commands that don't draw charts don't load matplotlib)
+    action.add_argument("--report", action="append",
+                        choices=["ingredient_usage", "expense_report", "waste_analysis", "dashboard"],
+                        help="report to render (can be given more than once, default: all)")
+    action.add_argument("--output", help="output folder (default: data/reports)")
+    action.add_argument("--format", choices=["png", "svg"], default="png")
+    action.set_defaults(handler=report_render)
+    action = report_actions.add_parser("text", help="print the text summary report")
+    action.set_defaults(handler=report_text)
+    action = report_actions.add_parser("memory", help="show the memory used by each table")
+    action.set_defaults(handler=report_memory)
+
+    # batch
+    batch_parser = areas.add_parser("batch", help="run many commands from a file in one process")
+    batch_parser.add_argument("file", help="file with one command per line ('-' = stdin)")
+    batch_parser.set_defaults(handler=run_batch)
+
+    return parser
+
+def run_arguments(parser, arguments):
+    # Parse one command and run it
+    # Returns: exit code (0 = success, 1 = error or wrong arguments)
+    try:
+        options = parser.parse_args(arguments)
+    except SystemExit as e:
+        # argparse already printed the problem (or the help text)
+        # argparse uses 2 for wrong arguments; we use 1 for every error
+        if e.code is None or e.code == 0:
+            return 0
+        return 1
+
+    try:
+        # Only switch when it changes, so loaded tables are kept in a batch
+        if options.data_dir is not None and os.path.abspath(options.data_dir) != get_data_dir():
+            set_data_dir(options.data_dir)
+        if options.backend is not None and options.backend != get_storage_backend():
+            set_storage_backend(options.backend)
+        return options.handler(options)
+    except Exception as e:
+        print(f"ERROR: {e}")
+        return 1
+
+def run_cli(arguments):
+    # Entry point: run one command line, e.g. ["expiry", "purge"]
+    # Returns: exit code for sys.exit()
+    return run_arguments(build_parser(), arguments)
+
+# Run the command-line interface when this file is executed directly:
+#     python -m modules.cli expiry purge
+if __name__ == "__main__":
+    sys.exit(run_cli(sys.argv[1:]))
@@ -0,0 +1,831 @@
+# Shared Data Store
+#
+# This module is the one place where our CSV tables are read and written.
+# Every feature module reads its data through here instead of calling
+# pd.read_csv() itself:
+# - Find the correct path of a data file
+# - Keep each parsed table in memory after the first read, with compact
+#   column types (categories, int32/float32, dates) and quantities in base
+#   units (kg -> g, l -> ml) - see schema.py
+# - Check with a cheap os.stat() (modification time and size) whether the
+#   file changed since then, and only parse it again if it did
+# - Save tables and forget the cached copy so the next read is fresh
+# - Append single rows to the end of a file without rewriting it
+# - Append many rows at once (e.g. a bulk import) in one write
+# - Hand out new IDs from a cached maximum ID
+# - Look up rows by ID in O(1) with a dictionary ID -> row position
+# - Update or delete single rows by ID
+# - Delete many rows at once through a tombstone log (see below)
+# - Tell other modules (e.g. indexes) about each appended, updated or
+#   deleted row, so they can update themselves instead of being rebuilt
+#
+# The tables can be stored in three ways (the "storage backend"):
+# - "csv"     - one CSV file per table in data/ (default)
+# - "sqlite"  - one SQLite database, data/kitchen.db (see sqlite_store.py)
+# - "parquet" - the waste and expense history in typed Parquet files,
+#               split by month (see parquet_store.py); the other tables
+#               stay CSV files. Needs the optional pyarrow library.
+# Choose the backend with the KITCHEN_STORAGE_BACKEND environment variable
+# or with set_storage_backend(). The ML datasets always stay files of their own.
+#
+# The data files are normally in the data/ folder of the project. Another
+# folder (e.g. one per kitchen or site) can be chosen with the
+# KITCHEN_DATA_DIR environment variable or with set_data_dir().
+#
+# load_table() can be asked for only some columns and a date range. The
+# Parquet backend reads only those from disk; the other backends load the
+# table and then select them.
+#
+# Deleting many rows (delete_rows) does not rewrite the CSV file. The IDs
+# of the deleted rows ("tombstones") are appended to a small log file next
+# to the table, e.g. data/ingredients.tombstones.csv, and those rows are
+# skipped whenever the table is loaded. This is quick (only the deleted
+# rows are written) and safe: if the program stops halfway, the table file
+# itself was never touched. Later the table is "compacted" in a background
+# thread: written again without the deleted rows to a temporary file, which
+# then replaces the old file in one step, and the log is removed.
+#
+# Uses concepts from syllabus:
+# - Pandas for CSV operations
+# - Dictionaries for storing cached data
+# - File handling and os module functions
+# - Exception handling with try-except
+
+# Import required libraries
+import pandas as pd  # For CSV operations and data manipulation
+import csv  # For writing single CSV rows
+import os  # For file path operations
+import sys  # For finding backend modules that are already loaded
+import threading  # For compacting tables in the background
+from .schema import COLUMN_TYPES, apply_column_types, append_typed_rows, get_default_types_copy, get_memory_usage, normalize_units, set_typed_value, to_python_value  # Compact column types of the tables
+
+# Cache of parsed tables
+# Key: full file path
+# Value: dictionary with
+#   'signature'    - signature of the table file and its tombstone log
+#   'frame'        - parsed DataFrame (without deleted rows)
+#   'pending_rows' - rows appended since the frame was parsed
+#   'max_ids'      - highest ID seen so far, per ID column
+#   'deleted_ids'  - IDs listed in the tombstone log, per ID column
+#   'id_positions' - ID -> row position in 'frame', per ID column
+#                    (built on first lookup, see get_id_positions)
+_table_cache = {}
+
+# Lock held while a table file is written, so the background compaction
+# and normal writes never work on the same file at the same time
+_write_lock = threading.RLock()
+
+# Compact a table once its tombstone log lists at least this share of its rows
+COMPACT_RATIO = 0.1
+
+# Functions to call after a table was changed row by row
+# Key: filename, Value: list of functions (see add_table_listener)
+_table_listeners = {}
+
+# Names of the available storage backends
+STORAGE_BACKENDS = ['csv', 'sqlite', 'parquet']
+
+# Current settings (the backend and data folder can be changed while the
+# program runs; 'data_dir' None means the data/ folder of the project)
+_settings = {'backend': os.environ.get("KITCHEN_STORAGE_BACKEND", "csv").strip().lower(),
+             'data_dir': os.environ.get("KITCHEN_DATA_DIR") or None}
+
+def get_storage_backend():
+    # Get the name of the storage backend in use ("csv", "sqlite" or "parquet")
+    if _settings['backend'] not in STORAGE_BACKENDS:
+        print(f" Unknown storage backend '{_settings['backend']}'. Using csv.")
+        _settings['backend'] = 'csv'
+    return _settings['backend']
+
+def set_storage_backend(backend_name):
+    # Choose the storage backend ("csv", "sqlite" or "parquet")
+    backend_name = backend_name.strip().lower()
+    if backend_name not in STORAGE_BACKENDS:
+        raise ValueError(f"Unknown storage backend: {backend_name}")
+    _settings['backend'] = backend_name
+    clear_cache()
+
+def get_backend_store(filename):
+    # Get the backend module that stores this table
+    # Returns: sqlite_store or parquet_store module, or None if the table
+    #          is a CSV file
+    backend_name = get_storage_backend()
+    if backend_name == 'csv':
+        return None
+
+    # Imported here because the backend modules themselves import this module
+    if backend_name == 'sqlite':
+        from . import sqlite_store as backend_store
+    else:
+        from . import parquet_store as backend_store
+        if not backend_store.is_available():
+            print(" WARNING: pyarrow is not installed. Using csv storage.")
+            _settings['backend'] = 'csv'
+            return None
+
+    if not backend_store.is_supported(filename):
+        return None
+    return backend_store
+
+def get_data_dir():
+    # Get the folder that holds the data files
+    data_dir = _settings['data_dir']
+    if data_dir is None:
+        current_dir = os.path.dirname(os.path.abspath(__file__))
+        parent_dir = os.path.dirname(current_dir)
+        data_dir = os.path.join(parent_dir, "data")
+    return os.path.abspath(data_dir)
+
+def set_data_dir(data_dir):
+    # Use another folder for the data files (None = the project's data/)
+    # Cached tables and open databases of the old folder are dropped.
+    _settings['data_dir'] = data_dir
+    clear_cache()
+
+    # Backend modules that are already loaded keep their own caches
+    sqlite_store = sys.modules.get(__package__ + ".sqlite_store")
+    if sqlite_store is not None:
+        sqlite_store.close_connection()
+    parquet_store = sys.modules.get(__package__ + ".parquet_store")
+    if parquet_store is not None:
+        parquet_store.clear_cache()
+
+def get_data_file_path(filename):
+    # Get the correct path to data files
+    # This function helps us find the right location for our data files
+    # no matter where the program is run from
+    data_path = os.path.join(get_data_dir(), filename)
+
+    # If data directory doesn't exist, create it
+    data_dir = os.path.dirname(data_path)
+    if not os.path.exists(data_dir):
+        os.makedirs(data_dir)
+
+    return data_path
+
+def get_file_signature(file_path):
+    # Get a cheap "fingerprint" of a file: (modification time, size)
+    # If either value changes, the file has been changed
+    #
+    # Returns: tuple, or None if the file does not exist
+    try:
+        file_stat = os.stat(file_path)
+    except FileNotFoundError:
+        return None
+    return (file_stat.st_mtime_ns, file_stat.st_size)
+
+def get_tombstone_file_path(filename):
+    # Get the path of the tombstone log of a table
+    # e.g. "ingredients.csv" -> data/ingredients.tombstones.csv
+    base_name = os.path.splitext(filename)[0]
+    return get_data_file_path(base_name + ".tombstones.csv")
+
+def get_table_signature(filename):
+    # Get the signature of a CSV table: its own file signature and the
+    # signature of its tombstone log (None if there is no log)
+    #
+    # Returns: tuple, or None if the table file does not exist
+    file_signature = get_file_signature(get_data_file_path(filename))
+    if file_signature is None:
+        return None
+    return (file_signature, get_file_signature(get_tombstone_file_path(filename)))
+
+def get_table_version(filename):
+    # Get a value that changes whenever a table changes
+    # Indexes built from a table remember this value, so they know
+    # when they have to be built again. The data folder is part of the
+    # value, so nothing built from another folder's table is reused.
+    #
+    # Returns: version value, or None if the table does not exist
+    backend_store = get_backend_store(filename)
+    if backend_store is not None:
+        version = backend_store.get_table_version(filename)
+    else:
+        version = get_table_signature(filename)
+    if version is None:
+        return None
+    return (get_data_dir(), version)
+
+def add_table_listener(filename, listener):
+    # Register a function that is called after every append_row(),
+    # append_rows(), update_row(), delete_row() and delete_rows() on a table
+    #
+    # The function is called as listener(change, details, old_version, new_version):
+    #     change (str) - 'append', 'append_many', 'update', 'delete' or 'delete_many'
+    #     details (dict) - 'row' for append; 'rows' (list of dicts) for
+    #                      append_many; 'id_column' and 'id_value'
+    #                      (and 'values' for update) for update and delete;
+    #                      'id_column' and 'id_values' (list) for delete_many
+    #     old_version, new_version - get_table_version() before and after
+    # A listener whose data was built from old_version can apply the change
+    # and remember new_version. Whole-table saves are not reported - the
+    # version changes, so anything built from the table is rebuilt.
+    listeners = _table_listeners.setdefault(filename, [])
+    if listener not in listeners:
+        listeners.append(listener)
+
+def get_version_for_listeners(filename):
+    # Get the table version before a change, only if someone is listening
+    if filename not in _table_listeners:
+        return None
+    return get_table_version(filename)
+
+def notify_listeners(filename, change, details, old_version):
+    # Call the listeners of a table after it was changed
+    listeners = _table_listeners.get(filename)
+    if not listeners:
+        return
+    new_version = get_table_version(filename)
+    for listener in listeners:
+        listener(change, details, old_version, new_version)
+
+def read_tombstones(filename):
+    # Read the IDs listed in the tombstone log of a table
+    # Returns: dictionary ID column -> set of deleted IDs (empty if no log)
+    tombstone_path = get_tombstone_file_path(filename)
+    try:
+        tombstones_df = pd.read_csv(tombstone_path)
+    except (FileNotFoundError, pd.errors.EmptyDataError):
+        return {}
+
+    deleted_ids = {}
+    for id_column, id_values in tombstones_df.groupby('id_column')['id_value']:
+        deleted_ids[id_column] = set(id_values.tolist())
+    return deleted_ids
+
+def remove_deleted_rows(frame, deleted_ids):
+    # Remove the rows whose IDs are in deleted_ids (ID column -> set of IDs)
+    for id_column in deleted_ids:
+        if id_column in frame.columns:
+            is_deleted = frame[id_column].isin(deleted_ids[id_column])
+            if is_deleted.any():
+                frame = frame[~is_deleted].reset_index(drop=True)
+    return frame
+
+def get_cache_entry(filename):
+    # Get the cache entry of a table, parsing the file only if it changed
+    #
+    # Returns: cache dictionary (see _table_cache above)
+    # Raises: FileNotFoundError if the file does not exist
+    file_path = get_data_file_path(filename)
+
+    # The lock makes sure a background compaction does not replace the
+    # file between reading the table and reading its tombstone log
+    with _write_lock:
+        signature = get_table_signature(filename)
+
+        if signature is None:
+            # File is gone - forget any cached copy
+            _table_cache.pop(file_path, None)
+            raise FileNotFoundError(file_path)
+
+        cached = _table_cache.get(file_path)
+        if cached is None or cached['signature'] != signature:
+            # First read, or the file changed on disk - parse it again
+            # and leave out the rows listed in the tombstone log
+            deleted_ids = read_tombstones(filename)
+            frame = remove_deleted_rows(pd.read_csv(file_path), deleted_ids)
+            frame = apply_column_types(filename, normalize_units(frame))
+            cached = {'signature': signature, 'frame': frame, 'pending_rows': [],
+                      'max_ids': {}, 'deleted_ids': deleted_ids, 'id_positions': {}}
+            _table_cache[file_path] = cached
+
+        # Add rows appended with append_row() since the file was parsed
+        if cached['pending_rows']:
+            old_row_count = len(cached['frame'])
+            new_rows_df = pd.DataFrame(cached['pending_rows'], columns=cached['frame'].columns)
+            if old_row_count == 0:
+                cached['frame'] = apply_column_types(filename, new_rows_df)
+            else:
+                cached['frame'] = append_typed_rows(filename, cached['frame'], new_rows_df)
+
+            # The new rows are at the end, so existing positions stay the same
+            for id_column in cached['id_positions']:
+                positions = cached['id_positions'][id_column]
+                for offset in range(len(cached['pending_rows'])):
+                    positions[cached['pending_rows'][offset].get(id_column)] = old_row_count + offset
+            cached['pending_rows'] = []
+
+    return cached
+
+def get_id_positions(cached, id_column):
+    # Get the dictionary ID -> row position of a cached table
+    # It is built once (one pass over the ID column) and then kept up to
+    # date as rows are appended, so every lookup after that is O(1).
+    positions = cached['id_positions'].get(id_column)
+    if positions is None:
+        ids = cached['frame'][id_column].tolist()
+        positions = dict(zip(ids, range(len(ids))))
+        cached['id_positions'][id_column] = positions
+    return positions
+
+def has_id(filename, id_value, id_column="id"):
+    # Check if a table has a row with the given ID
+    # Returns: True or False (False if the table does not exist)
+    backend_store = get_backend_store(filename)
+    if backend_store is not None:
+        return backend_store.get_row(filename, id_column, id_value) is not None
+
+    try:
+        cached = get_cache_entry(filename)
+    except FileNotFoundError:
+        return False
+    return id_value in get_id_positions(cached, id_column)
+
+def get_row(filename, id_value, id_column="id"):
+    # Get the row with the given ID
+    # Returns: dictionary column name -> value, or None if not found
+    backend_store = get_backend_store(filename)
+    if backend_store is not None:
+        return backend_store.get_row(filename, id_column, id_value)
+
+    try:
+        cached = get_cache_entry(filename)
+    except FileNotFoundError:
+        return None
+    position = get_id_positions(cached, id_column).get(id_value)
+    if position is None:
+        return None
+
+    # Read the values column by column, so each keeps its own type
+    # (dates come back as datetime.date, like with Parquet)
+    frame = cached['frame']
+    row = {}
+    for column in frame.columns:
+        row[column] = to_python_value(frame[column].iat[position])
+    return row
+
+def get_rows(filename, id_values, id_column="id"):
+    # Get the rows with the given IDs, in the same order as id_values
+    # IDs that are not in the table are skipped.
+    # Returns: pandas DataFrame (a new copy)
+    # Raises: FileNotFoundError if the table does not exist
+    backend_store = get_backend_store(filename)
+    if backend_store is not None:
+        return backend_store.get_rows(filename, id_column, id_values)
+
+    cached = get_cache_entry(filename)
+    positions = get_id_positions(cached, id_column)
+    row_positions = []
+    for id_value in id_values:
+        position = positions.get(id_value)
+        if position is not None:
+            row_positions.append(position)
+    return cached['frame'].iloc[row_positions].reset_index(drop=True)
+
+def load_table(filename, columns=None, start_date=None, end_date=None):
+    # Load a CSV table from the data directory, using the cache if possible
+    #
+    # Args:
+    #     filename (str) - name of the CSV file, e.g. "ingredients.csv"
+    #     columns (list) - only return these columns (default: all)
+    #     start_date, end_date - only return rows whose 'date' is in this
+    #                            range, both days included (default: all)
+    # Returns: pandas DataFrame (a copy, so callers may change it freely)
+    # Raises: FileNotFoundError if the file does not exist
+    backend_store = get_backend_store(filename)
+    if backend_store is not None and getattr(backend_store, 'SUPPORTS_FILTERS', False):
+        return backend_store.load_table(filename, columns, start_date, end_date)
+
+    if backend_store is not None:
+        table = backend_store.load_table(filename)
+    else:
+        table = get_cache_entry(filename)['frame']
+    if columns is None and start_date is None and end_date is None:
+        return table.copy()
+    return select_rows(table, columns, start_date, end_date)
+
+def select_rows(table, columns=None, start_date=None, end_date=None):
+    # Pick some columns and a 'date' range from a loaded table
+    # (for backends that cannot do this while reading)
+    # Returns: pandas DataFrame (a new copy)
+    if start_date is not None or end_date is not None:
+        dates = pd.to_datetime(table['date'], errors='coerce')
+        in_range = dates.notna()
+        if start_date is not None:
+            in_range = in_range & (dates >= pd.Timestamp(start_date))
+        if end_date is not None:
+            in_range = in_range & (dates <= pd.Timestamp(end_date))
+        table = table[in_range.to_numpy()]
+    if columns is not None:
+        table = table[list(columns)]
+    return table.reset_index(drop=True)
+
+def save_table(filename, df):
+    # Save a DataFrame as a CSV table in the data directory
+    # The table is written to a temporary file first and then renamed,
+    # so a crash while saving can never leave a half-written table.
+    # The cached copy is dropped, so the next load_table() reads the new file
+    #
+    # Args:
+    #     filename (str) - name of the CSV file
+    #     df (pandas DataFrame) - data to save
+    backend_store = get_backend_store(filename)
+    if backend_store is not None:
+        backend_store.save_table(filename, df)
+        return
+
+    file_path = get_data_file_path(filename)
+    with _write_lock:
+        temp_file = file_path + ".tmp"
+        df.to_csv(temp_file, index=False)
+        os.replace(temp_file, file_path)
+
+        # The saved table is complete, so old tombstones are not needed
+        tombstone_path = get_tombstone_file_path(filename)
+        if os.path.exists(tombstone_path):
+            os.remove(tombstone_path)
+
+        invalidate_table(filename)
+
+def read_header(file_path):
+    # Read only the first line (column names) of a CSV file
+    with open(file_path, "r", newline="", encoding="utf-8") as csv_file:
+        reader = csv.reader(csv_file)
+        for header in reader:
+            return header
+    return []
+
+def ends_with_newline(file_path):
+    # Check if the last byte of a file is a newline
+    # (so an appended row starts on its own line)
+    with open(file_path, "rb") as binary_file:
+        binary_file.seek(-1, os.SEEK_END)
+        last_byte = binary_file.read(1)
+    return last_byte == b"\n"
+
+def append_row(filename, row):
+    # Append one row to the end of a CSV table
+    # Only the new line is written - the rest of the file is not touched.
+    # If the table is cached, the row is also added to the cached copy,
+    # so the next load_table() does not need to parse the file again.
+    #
+    # Args:
+    #     filename (str) - name of the CSV file
+    #     row (dict) - column name -> value for the new row
+    #                  (the key order is used as header for a new file)
+    with _write_lock:
+        old_version = get_version_for_listeners(filename)
+        write_appended_row(filename, row)
+        notify_listeners(filename, 'append', {'row': row}, old_version)
+
+def write_appended_row(filename, row):
+    # Write one new row with the current storage backend (see append_row)
+    backend_store = get_backend_store(filename)
+    if backend_store is not None:
+        backend_store.append_row(filename, row)
+        return
+
+    file_path = get_data_file_path(filename)
+    old_signature = get_table_signature(filename)
+
+    # New (or empty) file - write the header together with the row
+    if old_signature is None or old_signature[0][1] == 0:
+        save_table(filename, pd.DataFrame([row]))
+        return
+
+    cached = _table_cache.get(file_path)
+    cache_is_valid = cached is not None and cached['signature'] == old_signature
+
+    if cache_is_valid:
+        columns = list(cached['frame'].columns)
+    else:
+        columns = read_header(file_path)
+
+    # Put the values in the same order as the columns in the file
+    values = []
+    for column in columns:
+        values.append(row.get(column, ""))
+
+    needs_newline = not ends_with_newline(file_path)
+    with open(file_path, "a", newline="", encoding="utf-8") as csv_file:
+        if needs_newline:
+            csv_file.write("\n")
+        writer = csv.writer(csv_file)
+        writer.writerow(values)
+
+    if cache_is_valid:
+        # Keep the cache in step with the file we just wrote
+        cached['signature'] = get_table_signature(filename)
+        cached['pending_rows'].append(dict(zip(columns, values)))
+        for id_column in cached['max_ids']:
+            new_value = row.get(id_column)
+            if new_value is not None and new_value > cached['max_ids'][id_column]:
+                cached['max_ids'][id_column] = new_value
+    else:
+        _table_cache.pop(file_path, None)
+
+def append_rows(filename, df):
+    # Append many rows to the end of a table in one write
+    # (one transaction for SQLite, one new file per month for Parquet)
+    # Like append_row(), the rest of the file is not touched and a cached
+    # copy of the table is kept in step.
+    #
+    # Args:
+    #     filename (str) - name of the CSV file
+    #     df (pandas DataFrame) - the new rows (with their IDs)
+    if len(df) == 0:
+        return
+    with _write_lock:
+        old_version = get_version_for_listeners(filename)
+        write_appended_rows(filename, df)
+        if filename in _table_listeners:
+            notify_listeners(filename, 'append_many', {'rows': df.to_dict('records')}, old_version)
+
+def write_appended_rows(filename, df):
+    # Write many new rows with the current storage backend (see append_rows)
+    backend_store = get_backend_store(filename)
+    if backend_store is not None:
+        backend_store.append_rows(filename, df)
+        return
+
+    file_path = get_data_file_path(filename)
+    old_signature = get_table_signature(filename)
+
+    # New (or empty) file - write the header together with the rows
+    if old_signature is None or old_signature[0][1] == 0:
+        save_table(filename, df)
+        return
+
+    cached = _table_cache.get(file_path)
+    cache_is_valid = cached is not None and cached['signature'] == old_signature
+
+    if cache_is_valid:
+        columns = list(cached['frame'].columns)
+    else:
+        columns = read_header(file_path)
+
+    # Same column order as the file (missing columns are left empty)
+    new_rows = df.reindex(columns=columns)
+
+    needs_newline = not ends_with_newline(file_path)
+    with open(file_path, "a", newline="", encoding="utf-8") as csv_file:
+        if needs_newline:
+            csv_file.write("\n")
+        new_rows.to_csv(csv_file, header=False, index=False)
+
+    if cache_is_valid:
+        # Keep the cache in step with the file we just wrote
+        cached['signature'] = get_table_signature(filename)
+        cached['pending_rows'].extend(new_rows.to_dict('records'))
+        for id_column in cached['max_ids']:
+            if id_column in df.columns:
+                new_max = int(df[id_column].max())
+                if new_max > cached['max_ids'][id_column]:
+                    cached['max_ids'][id_column] = new_max
+    else:
+        _table_cache.pop(file_path, None)
+
+def next_id(filename, id_column="id"):
+    # Get the next free ID for a table (highest ID + 1)
+    # The highest ID is remembered in the cache, so the table is not
+    # scanned again for every new row.
+    #
+    # Args:
+    #     filename (str) - name of the CSV file
+    #     id_column (str) - name of the ID column
+    # Returns: int - the new ID (1 for a new or empty table)
+    backend_store = get_backend_store(filename)
+    if backend_store is not None:
+        return backend_store.next_id(filename, id_column)
+
+    file_path = get_data_file_path(filename)
+    cached = _table_cache.get(file_path)
+
+    # Only look at the table again if the file changed or the ID is unknown
+    if cached is None or cached['signature'] != get_table_signature(filename) or id_column not in cached['max_ids']:
+        try:
+            cached = get_cache_entry(filename)
+        except FileNotFoundError:
+            return 1
+        table = cached['frame']
+        max_id = 0
+        if len(table) > 0:
+            max_id = int(table[id_column].max())
+        # IDs in the tombstone log are not handed out again, otherwise a new
+        # row could get the ID of a deleted row and be hidden by its tombstone
+        deleted_ids = cached['deleted_ids'].get(id_column)
+        if deleted_ids:
+            max_id = max(max_id, int(max(deleted_ids)))
+        cached['max_ids'][id_column] = max_id
+
+    return cached['max_ids'][id_column] + 1
+
+def update_row(filename, id_column, id_value, values):
+    # Change some columns of the row with the given ID
+    # With SQLite this is a single indexed UPDATE. With CSV files the
+    # table has to be written again.
+    #
+    # Args:
+    #     filename (str) - name of the table file
+    #     id_column (str) - name of the ID column
+    #     id_value - ID of the row to change
+    #     values (dict) - column name -> new value
+    # Returns: True if the row was found and updated
+    with _write_lock:
+        old_version = get_version_for_listeners(filename)
+
+        backend_store = get_backend_store(filename)
+        if backend_store is not None:
+            updated = backend_store.update_row(filename, id_column, id_value, values)
+        elif not has_id(filename, id_value, id_column):
+            updated = False
+        else:
+            table = load_table(filename)
+            matching_rows = table[id_column] == id_value
+            updated = bool(matching_rows.any())
+            if updated:
+                for column in values:
+                    set_typed_value(table, matching_rows, column, values[column])
+                save_table(filename, table)
+
+        if updated:
+            details = {'id_column': id_column, 'id_value': id_value, 'values': values}
+            notify_listeners(filename, 'update', details, old_version)
+    return updated
+
+def delete_row(filename, id_column, id_value):
+    # Delete the row with the given ID
+    # With SQLite this is a single indexed DELETE. With CSV files the
+    # table has to be written again.
+    #
+    # Returns: True if the row was found and deleted
+    with _write_lock:
+        old_version = get_version_for_listeners(filename)
+
+        backend_store = get_backend_store(filename)
+        if backend_store is not None:
+            deleted = backend_store.delete_row(filename, id_column, id_value)
+        elif not has_id(filename, id_value, id_column):
+            deleted = False
+        else:
+            table = load_table(filename)
+            matching_rows = table[id_column] == id_value
+            deleted = bool(matching_rows.any())
+            if deleted:
+                save_table(filename, table[~matching_rows])
+
+        if deleted:
+            details = {'id_column': id_column, 'id_value': id_value}
+            notify_listeners(filename, 'delete', details, old_version)
+    return deleted
+
+def delete_rows(filename, id_column, id_values):
+    # Delete many rows at once by their IDs
+    # With SQLite all rows are deleted in one transaction. With CSV files
+    # only the IDs are appended to the tombstone log (see the top of this
+    # file) - the table file is not rewritten, so the work grows with the
+    # number of deleted rows, not the size of the table. The table is then
+    # compacted in the background once the log gets long enough.
+    #
+    # Args:
+    #     filename (str) - name of the table file
+    #     id_column (str) - name of the ID column
+    #     id_values (list) - IDs of the rows to delete
+    # Returns: int - number of rows that were found and deleted
+    with _write_lock:
+        old_version = get_version_for_listeners(filename)
+
+        backend_store = get_backend_store(filename)
+        if backend_store is not None:
+            deleted_ids = backend_store.delete_rows(filename, id_column, id_values)
+        else:
+            deleted_ids = write_tombstones(filename, id_column, id_values)
+
+        if deleted_ids:
+            details = {'id_column': id_column, 'id_values': deleted_ids}
+            notify_listeners(filename, 'delete_many', details, old_version)
+
+        if backend_store is None and deleted_ids and needs_compaction(filename):
+            compact_in_background(filename)
+    return len(deleted_ids)
+
+def write_tombstones(filename, id_column, id_values):
+    # Append tombstones for the rows with the given IDs (CSV backend)
+    # Returns: list of the IDs that were found in the table
+    cached = get_cache_entry(filename)
+    table = cached['frame']
+
+    # Only IDs that are really in the table get a tombstone (O(1) lookups)
+    positions = get_id_positions(cached, id_column)
+    found_ids = []
+    for id_value in dict.fromkeys(id_values):
+        if id_value in positions:
+            found_ids.append(id_value)
+    if not found_ids:
+        return []
+    is_found = table[id_column].isin(found_ids)
+
+    # Append the IDs to the log and make sure they are really on disk
+    tombstone_path = get_tombstone_file_path(filename)
+    is_new_log = get_file_signature(tombstone_path) is None
+    with open(tombstone_path, "a", newline="", encoding="utf-8") as log_file:
+        writer = csv.writer(log_file)
+        if is_new_log:
+            writer.writerow(['id_column', 'id_value'])
+        for id_value in found_ids:
+            writer.writerow([id_column, id_value])
+        log_file.flush()
+        os.fsync(log_file.fileno())
+
+    # Keep the cached copy in step without parsing the table again
+    # (row positions move, so the ID dictionaries are built again when needed)
+    cached['frame'] = table[~is_found].reset_index(drop=True)
+    cached['id_positions'] = {}
+    cached['deleted_ids'].setdefault(id_column, set()).update(found_ids)
+    cached['signature'] = get_table_signature(filename)
+    return found_ids
+
+def needs_compaction(filename):
+    # Check if the tombstone log lists enough rows to be worth compacting
+    cached = _table_cache.get(get_data_file_path(filename))
+    if cached is None:
+        return False
+    tombstone_count = 0
+    for id_column in cached['deleted_ids']:
+        tombstone_count = tombstone_count + len(cached['deleted_ids'][id_column])
+    return tombstone_count >= COMPACT_RATIO * (len(cached['frame']) + tombstone_count)
+
+def compact_table(filename):
+    # Write the table again without the rows listed in its tombstone log
+    # The new table goes to a temporary file that replaces the old file in
+    # one step; only then is the log removed. If the program stops at any
+    # point, either the old file and log or the new file remain - both
+    # give the same table when loaded.
+    #
+    # Returns: True if the table was compacted
+    file_path = get_data_file_path(filename)
+    tombstone_path = get_tombstone_file_path(filename)
+
+    with _write_lock:
+        if get_file_signature(tombstone_path) is None or get_file_signature(file_path) is None:
+            return False
+
+        old_signature = get_table_signature(filename)
+        deleted_ids = read_tombstones(filename)
+        table = remove_deleted_rows(pd.read_csv(file_path), deleted_ids)
+
+        temp_file = file_path + ".tmp"
+        table.to_csv(temp_file, index=False)
+        os.replace(temp_file, file_path)
+        os.remove(tombstone_path)
+
+        # The table content did not change, so a cached copy stays valid.
+        # The deleted IDs are remembered so next_id() does not reuse them
+        # while this program runs.
+        cached = _table_cache.get(file_path)
+        if cached is not None and cached['signature'] == old_signature:
+            cached['signature'] = get_table_signature(filename)
+    return True
+
+def compact_in_background(filename):
+    # Start compact_table() in a separate thread, so the user does not wait
+    # The thread is not a daemon thread: Python waits for it before exiting
+    def run_compaction():
+        try:
+            compact_table(filename)
+        except Exception as e:
+            print(f" WARNING: Could not compact {filename}: {e}")
+
+    compaction_thread = threading.Thread(target=run_compaction, name=f"compact-{filename}")
+    compaction_thread.start()
+    return compaction_thread
+
+def invalidate_table(filename):
+    # Forget the cached copy of a table (e.g. after writing the file directly)
+    file_path = get_data_file_path(filename)
+    _table_cache.pop(file_path, None)
+
+def clear_cache():
+    # Forget all cached tables
+    _table_cache.clear()
+
+def get_memory_report():
+    # Measure the memory used by each typed table when it is loaded
+    # Returns: list of dictionaries with 'table', 'rows', 'bytes' (with
+    #          the compact types) and 'default_bytes' (with pandas' default
+    #          types), for the tables that exist
+    report = []
+    for filename in COLUMN_TYPES:
+        try:
+            table = load_table(filename)
+        except FileNotFoundError:
+            continue
+        entry = {'table': filename, 'rows': len(table)}
+        entry['bytes'] = get_memory_usage(table)
+        entry['default_bytes'] = get_memory_usage(get_default_types_copy(table))
+        report.append(entry)
+    return report
+
+def print_memory_report():
+    # Print how much memory each table uses with the compact types
+    print("\n=== Table Memory Report ===")
+    print(f"{'Table':<16} {'Rows':>10} {'Memory':>12} {'Default types':>14} {'Saved':>7}")
+    print("-" * 63)
+    for entry in get_memory_report():
+        saved = "-"  # Nothing to compare for an empty table
+        if entry['rows'] > 0:
+            saved = f"{(1 - entry['bytes'] / entry['default_bytes']) * 100:.0f}%"
+        print(f"{entry['table']:<16} {entry['rows']:>10} {entry['bytes'] / 1024:>9.1f} KB "
+              f"{entry['default_bytes'] / 1024:>11.1f} KB {saved:>7}")
+    print("-" * 63)
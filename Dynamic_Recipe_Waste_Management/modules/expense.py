@@ -6,6 +6,10 @@
 # - View ingredient-wise expenses
 # - Simple expense management
 #
+# record_expense() adds an expense without asking any questions, so the
+# command-line interface (cli.py) and scripts can use it too. The values are
+# checked by schema.py, the same way as in a bulk import.
+#
 # Uses concepts from syllabus:
 # - Pandas for CSV operations
 # - Mathematical operations for cost calculation
@@ -14,28 +18,16 @@
 
 # Import required libraries (all from syllabus)
 import pandas as pd  # For CSV operations and data manipulation
-import os  # For file path operations
-
-def get_data_file_path(filename):
-    # Get the correct path to data files
-    current_dir = os.path.dirname(os.path.abspath(__file__))
-    parent_dir = os.path.dirname(current_dir)
-    data_path = os.path.join(parent_dir, "data", filename)
-
-    # If data directory doesn't exist, create it
-    data_dir = os.path.dirname(data_path)
-    if not os.path.exists(data_dir):
-        os.makedirs(data_dir)
-
-    return data_path
+from .data_store import get_data_file_path, load_table, save_table, append_row, next_id, delete_row, has_id, get_row  # Shared cached access to CSV files
+from .rollups import get_table_totals, get_group_totals  # Ready-made expense totals
+from .schema import validate_record, ask_value  # Shared validation rules
 
 def load_expenses():
     # Load expenses from CSV file
     # Returns: pandas DataFrame with expense data
     try:
-        # Read expenses CSV file using correct path
-        expenses_file = get_data_file_path("expenses.csv")
-        expenses_df = pd.read_csv(expenses_file)
+        # Read expenses CSV file (cached by the data store)
+        expenses_df = load_table("expenses.csv")
         return expenses_df
     except FileNotFoundError:
         # If file doesn't exist, create empty DataFrame with required columns
@@ -44,8 +36,8 @@ def load_expenses():
         expenses_df = pd.DataFrame(columns=columns)
 
         # Save the empty DataFrame to create the file
+        save_table("expenses.csv", expenses_df)
         expenses_file = get_data_file_path("expenses.csv")
-        expenses_df.to_csv(expenses_file, index=False)
         print(f" Created new expenses database at: {expenses_file}")
 
         return expenses_df
@@ -54,65 +46,46 @@ def save_expenses(df):
     # Save expenses DataFrame to CSV file
     # Args: df (pandas DataFrame) - expense data to save
     try:
-        expenses_file = get_data_file_path("expenses.csv")
-        df.to_csv(expenses_file, index=False)
+        save_table("expenses.csv", df)
     except Exception as e:
         print(f" Error saving expenses: {e}")
 
+def record_expense(name, cost):
+    # Check the values of a new expense and append it to expenses.csv
+    # Only the new row is written (no full rewrite of the file).
+    #
+    # Returns: dictionary with the saved row (including its new ID)
+    # Raises: ValueError if a value is not valid
+    checked = validate_record("expenses.csv", {'name': name, 'cost': cost})
+
+    # The new ID comes from the highest ID remembered by the data store
+    new_expense = {'id': next_id("expenses.csv", 'id')}
+    new_expense.update(checked)
+
+    append_row("expenses.csv", new_expense)
+    return new_expense
+
 def add_expense():
     # Add a new expense entry to the database
     # This function demonstrates user input and data processing
     # 
     # Uses syllabus concepts:
     # - input() function for user interaction
-    # - String methods: strip(), title()
-    # - Data type conversion with float()
-    # - Exception handling for input validation
-    # - Dictionary creation and DataFrame operations
+    # - Validation rules shared with the bulk import (schema.py)
+    # - Exception handling
     
     print("\n===  Add Expense ===")
-    
-    # Load current expenses
-    expenses = load_expenses()
-    
-    # Get ingredient name from user - break down chained operations
-    user_input = input("Enter ingredient name: ")
-    clean_input = user_input.strip()
-    name = clean_input.title()
 
-    # Get cost with validation
-    cost = 0
-    while True:
-        try:
-            user_cost = input("Enter cost: ")
-            cost = float(user_cost)
-            if cost < 0:
-                print(" Cost cannot be negative. Please try again.")
-            else:
-                break  # Exit loop if cost is valid
-        except ValueError:
-            print(" Please enter a valid number for cost.")
+    # Ask for each value until it is valid (checked by schema.py)
+    name = ask_value("expenses.csv", "name", "Enter ingredient name: ")
+    cost = ask_value("expenses.csv", "cost", "Enter cost: ")
 
-    # Generate new ID - break down the logic
-    expenses_count = len(expenses)
-    if expenses_count == 0:
-        new_id = 1
-    else:
-        max_id = expenses['id'].max()
-        new_id = max_id + 1
-
-    # Create new expense dictionary - use separate lines for clarity
-    new_expense = {}
-    new_expense['id'] = new_id
-    new_expense['name'] = name
-    new_expense['cost'] = cost
-
-    # Add to DataFrame - create new row first, then add
-    new_row_df = pd.DataFrame([new_expense])
-    expenses = pd.concat([expenses, new_row_df], ignore_index=True)
-    
-    # Save to file
-    save_expenses(expenses)
+    # Save the new expense (appends just the new row to the file)
+    try:
+        record_expense(name, cost)
+    except Exception as e:
+        print(f" Error saving expenses: {e}")
+        return
     
     print(f" Expense for '{name}' recorded successfully!")
     print(f" Cost: ₹{cost:.2f}")
@@ -128,23 +101,22 @@ def view_total_expenses():
     
     print("\n===  Total Expenses ===")
     
-    # Load expenses
-    expenses = load_expenses()
+    # Get the ready-made totals (kept up to date by the rollups)
+    expense_totals = get_table_totals("expenses.csv")
     
-    if len(expenses) == 0:
+    if expense_totals['count'] == 0:
         print(" No expense records found.")
         return
     
-    # Calculate total expenses using sum() function
-    total_cost = expenses['cost'].sum()
+    total_cost = expense_totals['cost']
     
     # Show total
     print(f"\n Total Expenses: ₹{total_cost:.2f}")
-    print(f" Number of expense entries: {len(expenses)}")
+    print(f" Number of expense entries: {expense_totals['count']}")
 
     # Calculate average cost per ingredient
-    if len(expenses) > 0:
-        average_cost = total_cost / len(expenses)
+    if expense_totals['count'] > 0:
+        average_cost = total_cost / expense_totals['count']
         print(f" Average cost per entry: ₹{average_cost:.2f}")
 
 def view_ingredient_wise_expenses():
@@ -158,16 +130,13 @@ def view_ingredient_wise_expenses():
     
     print("\n===  Ingredient-wise Expenses ===")
     
-    # Load expenses
-    expenses = load_expenses()
-    
-    if len(expenses) == 0:
+    # Get the ready-made totals (kept up to date by the rollups)
+    if get_table_totals("expenses.csv")['count'] == 0:
         print(" No expense records found.")
         return
     
-    # Group by ingredient name and sum the costs - break down operations
-    grouped_expenses = expenses.groupby('name')
-    ingredient_wise = grouped_expenses['cost'].sum()
+    # Total cost per ingredient name
+    ingredient_wise = get_group_totals("expenses.csv", "name")['cost']
 
     # Sort by cost (highest first)
     ingredient_wise_sorted = ingredient_wise.sort_values(ascending=False)
@@ -244,8 +213,8 @@ def delete_expense():
     while True:
         try:
             expense_id = int(input("\nEnter expense ID to delete: "))
-            # Check if ID exists using membership operator
-            if expense_id in expenses['id'].values:
+            # Check if ID exists (O(1) lookup in the data store's ID index)
+            if has_id("expenses.csv", expense_id):
                 break
             else:
                 print(" Expense ID not found. Please try again.")
@@ -253,7 +222,7 @@ def delete_expense():
             print(" Please enter a valid number for ID.")
     
     # Get expense info for confirmation
-    expense_to_delete = expenses[expenses['id'] == expense_id].iloc[0]
+    expense_to_delete = get_row("expenses.csv", expense_id)
     
     # Confirm deletion
     print(f"\nAre you sure you want to delete this expense record?")
@@ -264,11 +233,8 @@ def delete_expense():
     confirmation = input("\nType 'yes' to confirm deletion: ").strip().lower()
     
     if confirmation == 'yes':
-        # Remove the expense record (keep all rows except the one with matching ID)
-        expenses = expenses[expenses['id'] != expense_id]
-        
-        # Save changes
-        save_expenses(expenses)
+        # Remove only the row with matching ID (no full rewrite with SQLite)
+        delete_row("expenses.csv", 'id', expense_id)
         
         print(f" Expense record for {expense_to_delete['name']} deleted successfully.")
     else:
@@ -309,7 +275,7 @@ def expense_summary():
     print(f" Different Ingredients: {num_ingredients}")
 
     # Find most and least expensive ingredients
-    ingredient_totals = expenses.groupby('name')['cost'].sum().sort_values(ascending=False)
+    ingredient_totals = expenses.groupby('name', observed=True)['cost'].sum().sort_values(ascending=False)
 
     if len(ingredient_totals) > 0:
         most_expensive = ingredient_totals.index[0]
@@ -6,37 +6,31 @@
 # - Show expiry status of all ingredients
 # - Simple date comparison (no ML)
 #
+# All ingredients are classified at once by classify_expiry() with NumPy
+# arrays (no loop over rows). Printing the results is a separate step.
+# Questions about a date range ("what has expired?", "what expires in the
+# next N days?") are answered by the sorted expiry index (expiry_index.py).
+#
 # Uses concepts from syllabus:
 # - Pandas for CSV operations
+# - NumPy arrays for fast date calculations
 # - Datetime for date handling and comparison
 # - Boolean indexing for filtering
 # - Conditional statements
 
 # Import required libraries (all from syllabus)
 import pandas as pd  # For CSV operations and data manipulation
+import numpy as np  # For calculations on whole columns at once
 from datetime import datetime  # For date handling and comparison
-import os  # For file path operations
-
-def get_data_file_path(filename):
-    # Get the correct path to data files
-    current_dir = os.path.dirname(os.path.abspath(__file__))
-    parent_dir = os.path.dirname(current_dir)
-    data_path = os.path.join(parent_dir, "data", filename)
-
-    # If data directory doesn't exist, create it
-    data_dir = os.path.dirname(data_path)
-    if not os.path.exists(data_dir):
-        os.makedirs(data_dir)
-
-    return data_path
+from .data_store import load_table, save_table, delete_rows, get_rows  # Shared cached access to CSV files
+from .expiry_index import find_expired_ids, find_expiring_ids  # Sorted expiry date index
 
 def load_ingredients():
     # Load ingredients from CSV file
     # Returns: pandas DataFrame with ingredients data
     try:
-        # Read ingredients CSV file using correct path
-        ingredients_file = get_data_file_path("ingredients.csv")
-        ingredients_df = pd.read_csv(ingredients_file)
+        # Read ingredients CSV file (cached by the data store)
+        ingredients_df = load_table("ingredients.csv")
         return ingredients_df
     except FileNotFoundError:
         print(" Ingredients file not found.")
@@ -46,14 +40,84 @@ def save_ingredients(df):
     # Save ingredients DataFrame to CSV file
     # Args: df (pandas DataFrame) - ingredients data to save
     try:
-        ingredients_file = get_data_file_path("ingredients.csv")
-        df.to_csv(ingredients_file, index=False)
+        save_table("ingredients.csv", df)
     except Exception as e:
         print(f" Error saving ingredients: {e}")
 
-def check_expiry_simple():
+# Expiry status buckets, from most to least urgent
+# ('unknown' is used for ingredients without a valid expiry date)
+EXPIRY_STATUSES = ['expired', 'today', 'soon', 'good', 'fresh', 'unknown']
+
+# Ingredients expiring within this many days count as "soon"
+SOON_DAYS = 2
+
+# Ingredients expiring within this many days (but not soon) count as "good"
+GOOD_DAYS = 7
+
+def classify_expiry(ingredients, today=None):
+    # Classify the expiry status of all ingredients in one pass
+    # Days until expiry and status are worked out for the whole column at
+    # once with NumPy, so even very large inventories are quick to check.
+    #
+    # Args:
+    #     ingredients (pandas DataFrame) - must have an 'expiry_date' column
+    #     today (date) - date to compare with (default: today)
+    #
+    # Returns: copy of the DataFrame with
+    #     'expiry_date'       - as datetime64 (not Python date objects)
+    #     'days_until_expiry' - int32, negative if already expired
+    #     'status'            - category, one of EXPIRY_STATUSES
+    if today is None:
+        today = datetime.today().date()
+
+    result = ingredients.copy()
+    result['expiry_date'] = pd.to_datetime(result['expiry_date'])
+
+    # Whole days between today and each expiry date
+    expiry_days = result['expiry_date'].to_numpy().astype('datetime64[D]')
+    has_date = ~np.isnat(expiry_days)
+    days_left = (expiry_days - np.datetime64(today, 'D')).astype(np.int64)
+    days_left = np.where(has_date, days_left, 0).astype(np.int32)
+
+    # Pick a status number for every row (first matching condition wins)
+    # The number is the position of the status in EXPIRY_STATUSES
+    conditions = [
+        days_left < 0,
+        days_left == 0,
+        days_left <= SOON_DAYS,
+        days_left <= GOOD_DAYS
+    ]
+    status_codes = np.select(conditions, [0, 1, 2, 3], default=4).astype(np.int8)
+    status_codes[~has_date] = 5
+
+    result['days_until_expiry'] = days_left
+    result['status'] = pd.Categorical.from_codes(status_codes, categories=EXPIRY_STATUSES, ordered=True)
+    return result
+
+def format_expiry_dates(expiry_dates):
+    # Turn a datetime64 column into YYYY-MM-DD text for printing
+    return expiry_dates.dt.strftime('%Y-%m-%d').fillna('unknown')
+
+def print_expiry_check(classified):
+    # Print the safe / expired line of every ingredient
+    # Args: classified (DataFrame) - result of classify_expiry()
+    expiry_texts = format_expiry_dates(classified['expiry_date'])
+    for name, quantity, unit, expiry_text, days_left, status in zip(
+            classified['name'], classified['quantity'], classified['unit'],
+            expiry_texts, classified['days_until_expiry'], classified['status']):
+        if status == 'expired':
+            print(f" {name} ({quantity} {unit}) - EXPIRED on {expiry_text}")
+        elif status == 'unknown':
+            print(f" {name} ({quantity} {unit}) - No valid expiry date")
+        else:
+            print(f" {name} ({quantity} {unit}) - Safe (expires in {days_left} days)")
+
+def check_expiry_simple(ask_to_remove=True):
     # Check expiry status of all ingredients using simple date comparison
     # This function demonstrates date operations and conditional logic
+    #
+    # Args: ask_to_remove (bool) - offer to remove the expired ingredients
+    #       (the command-line interface turns this off)
     # 
     # Uses syllabus concepts:
     # - Pandas read_csv() and DataFrame operations
@@ -74,42 +138,23 @@ def check_expiry_simple():
     today = datetime.today().date()
     print(f"Today's date: {today}")
     
-    # Convert expiry_date column to date format - break down the operation
-    expiry_datetime = pd.to_datetime(ingredients['expiry_date'])
-    ingredients['expiry_date'] = expiry_datetime.dt.date
-    
     print(f"\n Checking {len(ingredients)} ingredients...")
-    
-    # Check each ingredient and show status
-    safe_items = []
-    expired_items = []
-    
-    for i, row in ingredients.iterrows():
-        ingredient_name = row['name']
-        expiry_date = row['expiry_date']
-        quantity = row['quantity']
-        unit = row['unit']
-        
-        # Compare today's date with expiry date
-        if today > expiry_date:
-            # Ingredient has expired
-            expired_items.append(row)
-            print(f" {ingredient_name} ({quantity} {unit}) - EXPIRED on {expiry_date}")
-        else:
-            # Ingredient is still safe - calculate days left
-            safe_items.append(row)
-            date_difference = expiry_date - today
-            days_left = date_difference.days
-            print(f" {ingredient_name} ({quantity} {unit}) - Safe (expires in {days_left} days)")
-    
+
+    # Classify all ingredients at once, then print the results
+    classified = classify_expiry(ingredients, today)
+    print_expiry_check(classified)
+
+    expired_count = int(np.count_nonzero(classified['status'] == 'expired'))
+    safe_count = len(classified) - expired_count
+
     # Show summary
     print(f"\n Summary:")
-    print(f" Safe ingredients: {len(safe_items)}")
-    print(f" Expired ingredients: {len(expired_items)}")
-    
+    print(f" Safe ingredients: {safe_count}")
+    print(f" Expired ingredients: {expired_count}")
+
     # Ask user if they want to remove expired items
-    if expired_items:
-        print(f"\n Found {len(expired_items)} expired ingredient(s).")
+    if expired_count > 0 and ask_to_remove:
+        print(f"\n Found {expired_count} expired ingredient(s).")
         choice = input("Do you want to remove expired ingredients? (yes/no): ").strip().lower()
         
         if choice == 'yes':
@@ -121,10 +166,17 @@ def remove_expired_ingredients():
     # Remove expired ingredients from the database automatically
     # This function demonstrates DataFrame filtering and file operations
     # 
+    # Only the expired rows are deleted (delete_rows in the data store):
+    # the rest of the table is not written again, so this stays quick and
+    # crash-safe even for very large inventories.
+    #
     # Uses syllabus concepts:
     # - Boolean indexing for filtering DataFrames
     # - Date comparison operations
-    # - File writing with pandas to_csv()
+    # - File handling through the data store
+    #
+    # Returns: number of ingredients that were removed
+    #          (None if the removal failed)
     
     print("\n===  Removing Expired Ingredients ===")
     
@@ -133,33 +185,37 @@ def remove_expired_ingredients():
     
     if len(ingredients) == 0:
         print(" No ingredients found.")
-        return
+        return 0
     
     # Get today's date
     today = datetime.today().date()
     
-    # Convert expiry_date to date format
-    ingredients['expiry_date'] = pd.to_datetime(ingredients['expiry_date']).dt.date
-    
-    # Find expired items using boolean indexing
-    expired_items = ingredients[ingredients['expiry_date'] < today]
-    
-    # Keep only safe items (not expired)
-    safe_ingredients = ingredients[ingredients['expiry_date'] >= today]
-    
+    # Look up the expired ingredients in the sorted expiry index
+    # and fetch just those rows by ID
+    expired_ids = find_expired_ids(today)
+    expired_items = classify_expiry(get_rows("ingredients.csv", expired_ids), today)
+
     # Show what will be removed
     if not expired_items.empty:
         print("\n Removing expired items:")
-        for i, row in expired_items.iterrows():
-            print(f"- {row['name']} {row['quantity']}{row['unit']} (Expired on {row['expiry_date']})")
+        expiry_texts = format_expiry_dates(expired_items['expiry_date'])
+        for name, quantity, unit, expiry_text in zip(expired_items['name'], expired_items['quantity'],
+                                                     expired_items['unit'], expiry_texts):
+            print(f"- {name} {quantity}{unit} (Expired on {expiry_text})")
         
-        # Save updated ingredients (without expired items)
-        save_ingredients(safe_ingredients)
+        # Delete just the expired rows (batched, no full rewrite)
+        try:
+            removed_count = delete_rows("ingredients.csv", 'id', expired_items['id'].tolist())
+        except Exception as e:
+            print(f" Error removing expired ingredients: {e}")
+            return None
         
-        print(f"\n Removed {len(expired_items)} expired ingredient(s).")
-        print(f" {len(safe_ingredients)} ingredients remaining in stock.")
+        print(f"\n Removed {removed_count} expired ingredient(s).")
+        print(f" {len(ingredients) - removed_count} ingredients remaining in stock.")
+        return removed_count
     else:
         print("\n No expired items found today.")
+        return 0
 
 def show_expiry_status():
     # Show detailed expiry status of all ingredients
@@ -182,60 +238,110 @@ def show_expiry_status():
     # Get today's date
     today = datetime.today().date()
     
-    # Convert expiry_date to date format
-    ingredients['expiry_date'] = pd.to_datetime(ingredients['expiry_date']).dt.date
-    
-    # Calculate days until expiry for each ingredient (no .dt needed since we're working with date objects)
-    ingredients['days_until_expiry'] = (ingredients['expiry_date'] - today).apply(lambda x: x.days)
-    
+    # Classify all ingredients at once (days until expiry and status)
+    classified = classify_expiry(ingredients, today)
+
     # Sort by days until expiry (most urgent first)
-    ingredients_sorted = ingredients.sort_values('days_until_expiry')
-    
+    classified_sorted = classified.sort_values('days_until_expiry', kind='stable')
+
     print(f"\n Expiry Status (sorted by urgency):")
     print("-" * 80)
-    
-    for i, row in ingredients_sorted.iterrows():
-        name = row['name']
-        quantity = row['quantity']
-        unit = row['unit']
-        expiry_date = row['expiry_date']
-        days_left = row['days_until_expiry']
-        
-        # Determine status and color
-        if days_left < 0:
-            status = " EXPIRED"
+    print_expiry_status(classified_sorted)
+    print("-" * 80)
+
+    # Show category summary (count of each status)
+    status_counts = classified['status'].value_counts()
+
+    print(f"\n Summary:")
+    print(f" Expired: {status_counts['expired']}")
+    print(f" Expires today: {status_counts['today']}")
+    print(f" Expires soon (1-{SOON_DAYS} days): {status_counts['soon']}")
+    print(f" Total ingredients: {len(classified)}")
+
+def print_expiry_status(classified):
+    # Print one detailed status line per ingredient
+    # Args: classified (DataFrame) - result of classify_expiry()
+    expiry_texts = format_expiry_dates(classified['expiry_date'])
+    for name, quantity, unit, expiry_text, days_left, status in zip(
+            classified['name'], classified['quantity'], classified['unit'],
+            expiry_texts, classified['days_until_expiry'], classified['status']):
+        # Determine status text and urgency message
+        if status == 'expired':
+            status_text = " EXPIRED"
             urgency = f"(expired {abs(days_left)} days ago)"
-        elif days_left == 0:
-            status = " EXPIRES TODAY"
+        elif status == 'today':
+            status_text = " EXPIRES TODAY"
             urgency = "(use immediately!)"
-        elif days_left <= 2:
-            status = " EXPIRES SOON"
+        elif status == 'soon':
+            status_text = " EXPIRES SOON"
             urgency = f"(expires in {days_left} day(s))"
-        elif days_left <= 7:
-            status = " GOOD"
+        elif status == 'good':
+            status_text = " GOOD"
             urgency = f"(expires in {days_left} days)"
-        else:
-            status = " FRESH"
+        elif status == 'fresh':
+            status_text = " FRESH"
             urgency = f"(expires in {days_left} days)"
-        
-        print(f"{name:<15} {quantity:>6} {unit:<8} {expiry_date} {status} {urgency}")
-    
+        else:
+            status_text = " UNKNOWN"
+            urgency = "(no valid expiry date)"
+
+        print(f"{name:<15} {quantity:>6} {unit:<8} {expiry_text} {status_text} {urgency}")
+
+def show_expiring_soon(days=None):
+    # Show the ingredients that expire within the next few days
+    # The sorted expiry index finds them without checking every ingredient
+    #
+    # Args: days (int) - how many days ahead to look (None = ask the user)
+    #
+    # Uses syllabus concepts:
+    # - User input with input() function
+    # - Binary search (bisect) through the expiry index
+    # - Boolean indexing for filtering
+
+    print("\n===  Ingredients Expiring Soon ===")
+
+    # Load ingredients
+    ingredients = load_ingredients()
+
+    if len(ingredients) == 0:
+        print(" No ingredients found.")
+        return
+
+    if days is None:
+        user_days = input(f"Show ingredients expiring within how many days? (default {SOON_DAYS}): ").strip()
+        days = SOON_DAYS
+        if user_days:
+            try:
+                days = int(user_days)
+            except ValueError:
+                print(f" Invalid number. Using {SOON_DAYS} days.")
+            if days < 0:
+                days = SOON_DAYS
+
+    # Get today's date
+    today = datetime.today().date()
+
+    # Range query on the expiry index (earliest expiry first)
+    expiring_ids = find_expiring_ids(days, today)
+
+    if not expiring_ids:
+        print(f"\n Nothing expires in the next {days} day(s).")
+        return
+
+    # Fetch just those rows by ID (already in expiry date order)
+    expiring = get_rows("ingredients.csv", expiring_ids)
+    classified = classify_expiry(expiring, today)
+
+    print(f"\n {len(classified)} ingredient(s) expire in the next {days} day(s):")
+    print("-" * 80)
+    print_expiry_status(classified)
     print("-" * 80)
-    
-    # Show category summary
-    expired_count = len(ingredients[ingredients['days_until_expiry'] < 0])
-    expires_today = len(ingredients[ingredients['days_until_expiry'] == 0])
-    expires_soon = len(ingredients[(ingredients['days_until_expiry'] > 0) & (ingredients['days_until_expiry'] <= 2)])
-    
-    print(f"\n Summary:")
-    print(f" Expired: {expired_count}")
-    print(f" Expires today: {expires_today}")
-    print(f" Expires soon (1-2 days): {expires_soon}")
-    print(f" Total ingredients: {len(ingredients)}")
 
-def check_specific_ingredient():
+def check_specific_ingredient(ingredient_name=None):
     # Check expiry status of a specific ingredient
     # This function demonstrates user input and data filtering
+    #
+    # Args: ingredient_name (str) - ingredient to check (None = ask the user)
     # 
     # Uses syllabus concepts:
     # - User input with input() function
@@ -251,13 +357,15 @@ def check_specific_ingredient():
         print(" No ingredients found.")
         return
     
-    # Show available ingredients
-    print("\nAvailable ingredients:")
-    for name in ingredients['name'].unique():
-        print(f"- {name}")
-    
-    # Get user input
-    ingredient_name = input("\nEnter ingredient name to check: ").strip().title()
+    if ingredient_name is None:
+        # Show available ingredients
+        print("\nAvailable ingredients:")
+        for name in ingredients['name'].unique():
+            print(f"- {name}")
+        
+        # Get user input
+        ingredient_name = input("\nEnter ingredient name to check: ")
+    ingredient_name = ingredient_name.strip().title()
     
     # Find the ingredient using boolean indexing
     ingredient_data = ingredients[ingredients['name'] == ingredient_name]
@@ -316,10 +424,11 @@ def expiry_check_menu():
         print("2. Remove Expired Ingredients")
         print("3. Show Detailed Expiry Status")
         print("4. Check Specific Ingredient")
-        print("5. Back to Main Menu")
+        print("5. Show Ingredients Expiring Soon")
+        print("6. Back to Main Menu")
         print("="*50)
         
-        choice = input(" Enter your choice (1-5): ").strip()
+        choice = input(" Enter your choice (1-6): ").strip()
         
         if choice == "1":
             check_expiry_simple()
@@ -330,10 +439,12 @@ def expiry_check_menu():
         elif choice == "4":
             check_specific_ingredient()
         elif choice == "5":
+            show_expiring_soon()
+        elif choice == "6":
             print(" Returning to main menu...")
             break
         else:
-            print(" Invalid choice! Please enter a number between 1-5.")
+            print(" Invalid choice! Please enter a number between 1-6.")
 
 # Test function for development
 if __name__ == "__main__":
@@ -0,0 +1,180 @@
+# Expiry Date Index
+#
+# This module keeps the ingredients sorted by expiry date, so questions like
+# "what has expired?" or "what expires in the next 2 days?" don't need a
+# scan and sort of the whole ingredients table:
+# - Two lists in expiry date order: the dates (as YYYY-MM-DD text, which
+#   sorts the same way as the dates) and the ingredient IDs
+# - A range query is two binary searches (bisect) on the sorted dates,
+#   so it takes O(log n) time plus the number of results
+# - A new, changed or removed ingredient only inserts or removes its own
+#   entry with bisect; rows added by a bulk import are merged in with one sort
+#
+# Changes reach this module through a table listener (add_table_listener()
+# in data_store.py). Saving the whole table is not reported as a change, so
+# the sorted lists are made again from ingredients.csv on their next use.
+#
+# Uses concepts from syllabus:
+# - Lists and dictionaries
+# - Binary search with the bisect module
+# - Datetime for date handling
+# - Functions and modular programming
+
+# Import required libraries
+import bisect  # Binary search in sorted lists
+import numpy as np  # For sorting the dates when building the index
+import pandas as pd  # For reading dates
+from datetime import datetime, timedelta  # For date handling
+from .data_store import load_table, get_table_version, add_table_listener  # Shared table access
+
+# The index that was built last, and the ingredients table version it matches
+_index_cache = {}
+
+def to_date_key(value):
+    # Turn an expiry date (text, date or Timestamp) into 'YYYY-MM-DD' text
+    # Returns: text, or None if the value is not a valid date
+    try:
+        timestamp = pd.Timestamp(value)
+    except (ValueError, TypeError):
+        return None
+    if pd.isna(timestamp):
+        return None
+    return timestamp.strftime('%Y-%m-%d')
+
+def build_expiry_index(ingredients_df):
+    # Build the expiry index for an ingredients DataFrame
+    #
+    # Returns: dictionary with
+    #   'dates'   - expiry dates in sorted order (list of 'YYYY-MM-DD')
+    #   'ids'     - ingredient ID of each date (list, same order)
+    #   'date_of' - ingredient ID -> its expiry date
+    # Ingredients without a valid expiry date are left out.
+    expiry = pd.to_datetime(ingredients_df['expiry_date'], errors='coerce')
+    has_date = expiry.notna().to_numpy()
+    date_keys = expiry[has_date].dt.strftime('%Y-%m-%d').to_numpy()
+    ids = ingredients_df['id'].to_numpy()[has_date]
+
+    # Stable sort keeps ingredients with the same date in file order
+    order = np.argsort(date_keys, kind='stable')
+
+    index = {}
+    index['dates'] = date_keys[order].tolist()
+    index['ids'] = ids[order].tolist()
+    index['date_of'] = dict(zip(ids.tolist(), date_keys.tolist()))
+    return index
+
+def get_expiry_index():
+    # Get the expiry index, building it again only if the table changed
+    # Raises: FileNotFoundError if there is no ingredients table
+    version = get_table_version("ingredients.csv")
+    if version is None:
+        raise FileNotFoundError("ingredients.csv")
+
+    if _index_cache.get('version') != version:
+        ingredients_df = load_table("ingredients.csv")
+        _index_cache['index'] = build_expiry_index(ingredients_df)
+        _index_cache['version'] = version
+
+    return _index_cache['index']
+
+def add_to_index(index, ingredient_id, expiry_date):
+    # Insert one ingredient at its sorted position
+    date_key = to_date_key(expiry_date)
+    if date_key is None:
+        return
+    position = bisect.bisect_right(index['dates'], date_key)
+    index['dates'].insert(position, date_key)
+    index['ids'].insert(position, ingredient_id)
+    index['date_of'][ingredient_id] = date_key
+
+def add_many_to_index(index, rows):
+    # Insert many ingredients (e.g. from a bulk import) with one sort
+    # instead of moving the lists once per ingredient
+    new_dates = []
+    new_ids = []
+    for row in rows:
+        remove_from_index(index, row.get('id'))
+        date_key = to_date_key(row.get('expiry_date'))
+        if date_key is not None:
+            new_dates.append(date_key)
+            new_ids.append(row.get('id'))
+            index['date_of'][row.get('id')] = date_key
+
+    # Stable sort: new ingredients go after older ones with the same date
+    dates = index['dates'] + new_dates
+    ids = index['ids'] + new_ids
+    order = sorted(range(len(dates)), key=dates.__getitem__)
+    index['dates'] = [dates[position] for position in order]
+    index['ids'] = [ids[position] for position in order]
+
+def remove_from_index(index, ingredient_id):
+    # Remove one ingredient from the index (if it is in there)
+    date_key = index['date_of'].pop(ingredient_id, None)
+    if date_key is None:
+        return
+    # Only the entries with the same date need to be searched
+    start = bisect.bisect_left(index['dates'], date_key)
+    end = bisect.bisect_right(index['dates'], date_key)
+    for position in range(start, end):
+        if index['ids'][position] == ingredient_id:
+            del index['dates'][position]
+            del index['ids'][position]
+            return
+
+def update_index_after_change(change, details, old_version, new_version):
+    # Keep the index up to date when one ingredient row changes
+    # (called by the data store after append_row(s)/update_row/delete_row(s))
+    if 'index' not in _index_cache or _index_cache.get('version') != old_version:
+        return  # No index yet, or it was already out of date - rebuilt on next use
+    index = _index_cache['index']
+
+    if change == 'append':
+        row = details['row']
+        remove_from_index(index, row.get('id'))
+        add_to_index(index, row.get('id'), row.get('expiry_date'))
+    elif change == 'append_many':
+        add_many_to_index(index, details['rows'])
+    elif change == 'update':
+        if 'expiry_date' in details['values']:
+            remove_from_index(index, details['id_value'])
+            add_to_index(index, details['id_value'], details['values']['expiry_date'])
+    elif change == 'delete':
+        remove_from_index(index, details['id_value'])
+    elif change == 'delete_many':
+        for id_value in details['id_values']:
+            remove_from_index(index, id_value)
+
+    _index_cache['version'] = new_version
+
+def find_ids_between(start_date=None, end_date=None):
+    # Find ingredients with start_date <= expiry date < end_date
+    # Either limit can be None (no limit on that side)
+    #
+    # Returns: list of ingredient IDs, earliest expiry first
+    index = get_expiry_index()
+    dates = index['dates']
+
+    start = 0
+    if start_date is not None:
+        start = bisect.bisect_left(dates, to_date_key(start_date))
+    end = len(dates)
+    if end_date is not None:
+        end = bisect.bisect_left(dates, to_date_key(end_date))
+
+    return index['ids'][start:end]
+
+def find_expired_ids(today=None):
+    # Find ingredients that expired before today
+    if today is None:
+        today = datetime.today().date()
+    return find_ids_between(end_date=today)
+
+def find_expiring_ids(days, today=None):
+    # Find ingredients expiring from today up to and including today + days
+    # (e.g. days=2 means today, tomorrow and the day after)
+    if today is None:
+        today = datetime.today().date()
+    return find_ids_between(today, today + timedelta(days=days + 1))
+
+# Keep the expiry order up to date when ingredients.csv changes
+add_table_listener("ingredients.csv", update_index_after_change)
@@ -4,6 +4,14 @@
 # This module uses Decision Tree Classifier to predict ingredient expiry status
 # based on ingredient type, days since purchase, and storage type.
 #
+# The trained model is kept as numbered versions in data/models/expiry_model/
+# (see model_store.py), together with everything needed to use it: the
+# encoding maps, the name -> type map and the list of features. The model is
+# only trained again when expiry_dataset.csv changes. get_expiry_predictor()
+# returns the "predictor" (model + maps) and keeps it in memory, so the menu,
+# the command-line interface (python main.py expiry predict/check) and batch
+# files all share one loaded model instead of training a new one each time.
+#
 # Uses concepts from syllabus:
 # - Machine Learning with sklearn
 # - Decision Tree Classifier
@@ -13,23 +21,48 @@
 
 # Import required libraries (all from syllabus)
 import pandas as pd  # For CSV operations and data manipulation
+import numpy as np  # For choosing texts for whole columns at once
 from sklearn.tree import DecisionTreeClassifier  # Machine Learning algorithm
 from sklearn.metrics import accuracy_score  # Model evaluation
 from datetime import datetime  # For date calculations
-import os  # For file path operations
+from .data_store import get_data_file_path, load_table  # Shared cached access to CSV files
+from . import model_store  # For saving and reloading trained models
+from .schema import DATE_FORMAT  # Date format used in all tables
+
+# Encoding maps used for training and prediction (must stay the same for both)
+INGREDIENT_TYPE_MAPPING = {'Vegetables': 1, 'Dairy': 2, 'Grains': 3}
+STORAGE_TYPE_MAPPING = {'fridge': 1, 'freezer': 2, 'pantry': 3}
+
+# Feature columns the model is trained on (in this order)
+FEATURE_NAMES = ['ingredient_type_encoded', 'days_since_purchase', 'storage_type_encoded']
 
-def get_data_file_path(filename):
-    # Get the correct path to data files
-    current_dir = os.path.dirname(os.path.abspath(__file__))
-    parent_dir = os.path.dirname(current_dir)
-    data_path = os.path.join(parent_dir, "data", filename)
+# Name of the versioned expiry model in data/models/
+EXPIRY_MODEL_NAME = "expiry_model"
 
-    # If data directory doesn't exist, create it
-    data_dir = os.path.dirname(data_path)
-    if not os.path.exists(data_dir):
-        os.makedirs(data_dir)
+# Layout of the saved predictor - a saved version with another number is not
+# used (a new one is trained), e.g. after the features were changed
+EXPIRY_MODEL_FORMAT = 1
 
-    return data_path
+# Predictor kept in memory after the first load, so repeated predictions in
+# the same run (menu, commands of a batch file) don't read the model again
+# Keys: 'data_hash' and 'predictor'
+_expiry_predictor = {}
+
+# Why a row could not be encoded: feature column -> text shown for that row
+FEATURE_PROBLEMS = {
+    'ingredient_type_encoded': "unknown ingredient type",
+    'days_since_purchase': "no valid purchase date",
+    'storage_type_encoded': "unknown storage type",
+}
+
+# Map ingredient names to types (simplified mapping)
+# Ingredients not listed here are treated as Vegetables
+NAME_TO_TYPE = {
+    'Tomato': 'Vegetables', 'Onion': 'Vegetables', 'Garlic': 'Vegetables', 'Lemon': 'Vegetables',
+    'Potato': 'Vegetables', 'Carrot': 'Vegetables', 'Spinach': 'Vegetables',
+    'Cheese': 'Dairy', 'Milk': 'Dairy', 'Butter': 'Dairy',
+    'Rice': 'Grains', 'Bread': 'Grains'
+}
 
 def load_expiry_dataset():
     # Load the expiry prediction dataset for training
@@ -42,9 +75,8 @@ def load_expiry_dataset():
     # - DataFrame operations
     # - Exception handling with try-except
     try:
-        # Read expiry dataset CSV file using correct path
-        expiry_file = get_data_file_path("expiry_dataset.csv")
-        expiry_df = pd.read_csv(expiry_file)
+        # Read expiry dataset CSV file (cached by the data store)
+        expiry_df = load_table("expiry_dataset.csv")
         
         # Features (X) are ingredient_type, days_since_purchase, storage_type
         # We need to encode categorical variables to numbers for ML
@@ -52,34 +84,20 @@ def load_expiry_dataset():
         # Create a copy for processing
         processed_df = expiry_df.copy()
         
-        # Encode ingredient_type to numbers - use simple approach
-        ingredient_mapping = {}
-        ingredient_mapping['Vegetables'] = 1
-        ingredient_mapping['Dairy'] = 2
-        ingredient_mapping['Grains'] = 3
-
-        # Create new column with encoded values
-        encoded_ingredient_types = []
-        for ingredient_type in processed_df['ingredient_type']:
-            encoded_value = ingredient_mapping[ingredient_type]
-            encoded_ingredient_types.append(encoded_value)
-        processed_df['ingredient_type_encoded'] = encoded_ingredient_types
-
-        # Encode storage_type to numbers - use simple approach
-        storage_mapping = {}
-        storage_mapping['fridge'] = 1
-        storage_mapping['freezer'] = 2
-        storage_mapping['pantry'] = 3
-
-        # Create new column with encoded values
-        encoded_storage_types = []
-        for storage_type in processed_df['storage_type']:
-            encoded_value = storage_mapping[storage_type]
-            encoded_storage_types.append(encoded_value)
-        processed_df['storage_type_encoded'] = encoded_storage_types
+        # Encode ingredient_type and storage_type to numbers
+        # (whole columns at once with map(), same maps as for prediction)
+        processed_df['ingredient_type_encoded'] = processed_df['ingredient_type'].map(INGREDIENT_TYPE_MAPPING)
+        processed_df['storage_type_encoded'] = processed_df['storage_type'].map(STORAGE_TYPE_MAPPING)
+
+        # Rows with a type we have no number for cannot be used
+        unknown_rows = processed_df[FEATURE_NAMES].isna().any(axis=1)
+        if unknown_rows.any():
+            print(f" Skipped {int(unknown_rows.sum())} dataset row(s) with an unknown ingredient or storage type.")
+            processed_df = processed_df[~unknown_rows].copy()
+        processed_df[FEATURE_NAMES] = processed_df[FEATURE_NAMES].astype('int64')
         
         # Features (X) are the encoded columns and days_since_purchase
-        X = processed_df[['ingredient_type_encoded', 'days_since_purchase', 'storage_type_encoded']]
+        X = processed_df[FEATURE_NAMES]
         
         # Target (y) is the status column
         y = processed_df['status']
@@ -94,7 +112,7 @@ def train_expiry_model():
     # Train Decision Tree Classifier for expiry prediction
     # This function demonstrates machine learning model training
     # 
-    # Returns: trained model and feature names
+    # Returns: trained model, feature names and training accuracy
     # 
     # Uses syllabus concepts:
     # - Decision Tree Classifier from sklearn
@@ -105,9 +123,9 @@ def train_expiry_model():
     # Load expiry dataset
     X, y, processed_df = load_expiry_dataset()
     
-    if X is None:
+    if X is None or len(X) == 0:
         print(" No data available for training.")
-        return None, None
+        return None, None, None
     
     # Create Decision Tree Classifier
     model = DecisionTreeClassifier(
@@ -125,9 +143,104 @@ def train_expiry_model():
     
     print(f" Expiry prediction model trained! Training accuracy: {accuracy:.2%}")
     
-    # Return model and feature names
-    feature_names = ['ingredient_type_encoded', 'days_since_purchase', 'storage_type_encoded']
-    return model, feature_names
+    # Return model, feature names and accuracy
+    feature_names = list(FEATURE_NAMES)
+    return model, feature_names, accuracy
+
+def get_expiry_predictor():
+    # Get the expiry predictor, training a new model only when needed
+    # 1. Predictor already in memory and expiry_dataset.csv unchanged
+    # 2. A saved version was trained on the same data (warm start)
+    # 3. Otherwise train a new model and save it as a new version
+    #
+    # Returns: predictor dictionary with 'model', 'version', 'feature_names',
+    #          'ingredient_type_mapping', 'storage_type_mapping' and
+    #          'name_to_type', or None if no model could be trained
+    dataset_file = get_data_file_path("expiry_dataset.csv")
+    data_hash = model_store.compute_data_hash([dataset_file])
+
+    # 1. In memory
+    if _expiry_predictor.get('data_hash') == data_hash:
+        return _expiry_predictor['predictor']
+
+    # 2. Saved version (its maps are used, not the ones in this file)
+    artifact = model_store.load_model_version(EXPIRY_MODEL_NAME, data_hash)
+    if artifact is not None and artifact['extra'].get('format') == EXPIRY_MODEL_FORMAT:
+        model = artifact['model']
+        extra = artifact['extra']
+        version = artifact['version']
+        print(f" Loaded saved expiry model (version {version}).")
+    else:
+        # 3. Train and save a new version
+        model, feature_names, accuracy = train_expiry_model()
+        if model is None:
+            return None
+        extra = {}
+        extra['format'] = EXPIRY_MODEL_FORMAT
+        extra['feature_names'] = feature_names
+        extra['ingredient_type_mapping'] = dict(INGREDIENT_TYPE_MAPPING)
+        extra['storage_type_mapping'] = dict(STORAGE_TYPE_MAPPING)
+        extra['name_to_type'] = dict(NAME_TO_TYPE)
+        version = model_store.save_model_version(EXPIRY_MODEL_NAME, model, data_hash, extra,
+                                                 f"training accuracy {accuracy:.2%}")
+        if version is not None:
+            print(f" Saved as expiry model version {version}.")
+
+    predictor = {'model': model, 'version': version}
+    for key in ['feature_names', 'ingredient_type_mapping', 'storage_type_mapping', 'name_to_type']:
+        predictor[key] = extra[key]
+    _expiry_predictor['data_hash'] = data_hash
+    _expiry_predictor['predictor'] = predictor
+    return predictor
+
+def predict_expiry_status(predictor, ingredient_type, days_since, storage_type):
+    # Predict the status of one ingredient with a predictor
+    #
+    # Args:
+    #     predictor (dict) - from get_expiry_predictor()
+    #     ingredient_type (str) - e.g. 'Dairy'
+    #     days_since (int) - days since purchase
+    #     storage_type (str) - e.g. 'fridge'
+    # Returns: (predicted status, confidence in percent)
+    # Raises: ValueError for an unknown ingredient or storage type
+    if ingredient_type not in predictor['ingredient_type_mapping']:
+        raise ValueError(f"Unknown ingredient type: {ingredient_type} "
+                         f"(use {', '.join(predictor['ingredient_type_mapping'])})")
+    if storage_type not in predictor['storage_type_mapping']:
+        raise ValueError(f"Unknown storage type: {storage_type} "
+                         f"(use {', '.join(predictor['storage_type_mapping'])})")
+
+    # Input DataFrame with the feature names the model was trained on
+    input_values = {
+        'ingredient_type_encoded': [predictor['ingredient_type_mapping'][ingredient_type]],
+        'days_since_purchase': [days_since],
+        'storage_type_encoded': [predictor['storage_type_mapping'][storage_type]]
+    }
+    input_df = pd.DataFrame(input_values)[predictor['feature_names']]
+
+    # predict_proba() gives the status and the confidence in one call
+    probabilities = predictor['model'].predict_proba(input_df)[0]
+    best_class = probabilities.argmax()
+    return predictor['model'].classes_[best_class], probabilities[best_class] * 100
+
+def print_expiry_prediction(ingredient_type, days_since, storage_type, predicted_status, confidence):
+    # Print the result of a single prediction with a recommendation
+    print(f"\n Prediction Results:")
+    print(f"Ingredient: {ingredient_type}")
+    print(f"Days since purchase: {days_since}")
+    print(f"Storage: {storage_type}")
+    print(f"Predicted Status: {predicted_status}")
+    print(f"Confidence: {confidence:.1f}%")
+
+    # Provide recommendations based on prediction
+    if predicted_status == 'Safe':
+        print(" This ingredient is safe to use!")
+    elif predicted_status == 'Expire Soon':
+        print(" This ingredient will expire soon. Use it quickly!")
+        print(" Consider using it in today's cooking.")
+    else:  # Expired
+        print(" This ingredient has likely expired. Do not use!")
+        print(" Consider disposing of it safely.")
 
 def predict_ingredient_expiry():
     # Main function to predict expiry status of an ingredient
@@ -141,10 +254,10 @@ def predict_ingredient_expiry():
     
     print("\n===  Predict Ingredient Expiry ===")
     
-    # Train model
-    model, feature_names = train_expiry_model()
+    # Get the trained model (loaded once, trained only if the data changed)
+    predictor = get_expiry_predictor()
     
-    if model is None:
+    if predictor is None:
         print(" Could not train model.")
         return
     
@@ -152,7 +265,7 @@ def predict_ingredient_expiry():
     print("\nEnter ingredient details for expiry prediction:")
     
     # Get ingredient type with validation - use simple loops
-    ingredient_types = ['Vegetables', 'Dairy', 'Grains']
+    ingredient_types = list(predictor['ingredient_type_mapping'])
 
     # Create types text using simple loop
     types_text = ""
@@ -193,7 +306,7 @@ def predict_ingredient_expiry():
             print(" Please enter a valid number for days.")
 
     # Get storage type with validation - use simple loops
-    storage_types = ['fridge', 'freezer', 'pantry']
+    storage_types = list(predictor['storage_type_mapping'])
 
     # Create storage types text using simple loop
     storage_text = ""
@@ -220,62 +333,72 @@ def predict_ingredient_expiry():
         else:
             print(f" Please enter a valid storage type: {storage_text}")
     
-    # Encode the inputs for prediction (same mapping as training)
-    ingredient_mapping = {
-        'Vegetables': 1,
-        'Dairy': 2,
-        'Grains': 3
-    }
-    
-    storage_mapping = {
-        'fridge': 1,
-        'freezer': 2,
-        'pantry': 3
-    }
-    
-    # Create input vector for prediction
-    ingredient_encoded = ingredient_mapping[ingredient_type]
-    storage_encoded = storage_mapping[storage_type]
-    
-    # Create input DataFrame with proper feature names to avoid warnings
-    input_data = {
-        'ingredient_type_encoded': [ingredient_encoded],
-        'days_since_purchase': [days_since],
-        'storage_type_encoded': [storage_encoded]
-    }
-    input_df = pd.DataFrame(input_data)
-
-    # Make prediction
+    # Make prediction (encoded with the maps saved with the model)
     try:
-        prediction = model.predict(input_df)
-        predicted_status = prediction[0]
-
-        # Get prediction probabilities for confidence
-        probabilities = model.predict_proba(input_df)
-        max_prob = max(probabilities[0])
-        confidence = max_prob * 100
-        
-        # Display results
-        print(f"\n Prediction Results:")
-        print(f"Ingredient: {ingredient_type}")
-        print(f"Days since purchase: {days_since}")
-        print(f"Storage: {storage_type}")
-        print(f"Predicted Status: {predicted_status}")
-        print(f"Confidence: {confidence:.1f}%")
-        
-        # Provide recommendations based on prediction
-        if predicted_status == 'Safe':
-            print(" This ingredient is safe to use!")
-        elif predicted_status == 'Expire Soon':
-            print(" This ingredient will expire soon. Use it quickly!")
-            print(" Consider using it in today's cooking.")
-        else:  # Expired
-            print(" This ingredient has likely expired. Do not use!")
-            print(" Consider disposing of it safely.")
-        
+        predicted_status, confidence = predict_expiry_status(predictor, ingredient_type, days_since, storage_type)
+        print_expiry_prediction(ingredient_type, days_since, storage_type, predicted_status, confidence)
     except Exception as e:
         print(f" Error in prediction: {e}")
 
+def predict_expiry_batch(ingredients_df, predictor=None):
+    # Predict the expiry status of many ingredients with one model call
+    # Instead of predicting one row at a time, the whole table is encoded
+    # as columns with map() and passed to predict()/predict_proba() once.
+    #
+    # Args:
+    #     ingredients_df (DataFrame) - needs 'name', 'storage_type' and either
+    #                                  'days_since_purchase' or 'date_added'
+    #     predictor (dict) - from get_expiry_predictor() (loaded here if not given)
+    #
+    # Returns: copy of ingredients_df with 'ingredient_type',
+    #          'days_since_purchase', 'predicted_status', 'confidence' and
+    #          'problem' columns. Rows that cannot be encoded (unknown storage
+    #          type, missing or invalid date_added, ...) get the status
+    #          'Unknown' and say why in 'problem' (empty for the other rows).
+    if predictor is None:
+        predictor = get_expiry_predictor()
+        if predictor is None:
+            return None
+    model = predictor['model']
+
+    results_df = ingredients_df.copy()
+
+    # Days since purchase for all rows at once
+    if 'days_since_purchase' not in results_df.columns:
+        today = pd.Timestamp(datetime.today().date())
+        date_added = pd.to_datetime(results_df['date_added'], format=DATE_FORMAT, errors='coerce')  # Bad dates -> NaT
+        results_df['days_since_purchase'] = (today - date_added).dt.days
+
+    # Encode whole columns with map() instead of looping over rows
+    # (as plain text first - a category column would only allow its own values)
+    names = results_df['name'].astype(object)
+    results_df['ingredient_type'] = names.map(predictor['name_to_type']).fillna('Vegetables')
+    features = pd.DataFrame({
+        'ingredient_type_encoded': results_df['ingredient_type'].map(predictor['ingredient_type_mapping']),
+        'days_since_purchase': results_df['days_since_purchase'],
+        'storage_type_encoded': results_df['storage_type'].astype(object).map(predictor['storage_type_mapping'])
+    }, index=results_df.index)[predictor['feature_names']]
+
+    # Rows we cannot encode are not predicted - name the feature(s) that failed
+    missing = features.isna()
+    valid_rows = ~missing.any(axis=1)
+    problems = pd.Series("", index=results_df.index, dtype=object)
+    for feature in predictor['feature_names']:
+        problem = "; " + FEATURE_PROBLEMS.get(feature, f"no value for {feature}")
+        problems = problems + np.where(missing[feature], problem, "")
+    results_df['problem'] = problems.str[2:]  # Without the first "; "
+    results_df['predicted_status'] = 'Unknown'
+    results_df['confidence'] = 0.0
+
+    if valid_rows.any():
+        valid_features = features[valid_rows].astype('int64')
+        probabilities = model.predict_proba(valid_features)
+        best_class = probabilities.argmax(axis=1)
+        results_df.loc[valid_rows, 'predicted_status'] = model.classes_[best_class]
+        results_df.loc[valid_rows, 'confidence'] = probabilities.max(axis=1) * 100
+
+    return results_df
+
 def check_current_ingredients_expiry():
     # Check expiry status of all current ingredients in stock
     # This function demonstrates batch prediction and data analysis
@@ -288,80 +411,43 @@ def check_current_ingredients_expiry():
     
     print("\n===  Check All Ingredients Expiry ===")
     
-    # Train model
-    model, feature_names = train_expiry_model()
+    # Get the trained model (loaded once, trained only if the data changed)
+    predictor = get_expiry_predictor()
     
-    if model is None:
+    if predictor is None:
         print(" Could not train model.")
         return
     
     try:
-        # Load current ingredients using correct path
-        ingredients_file = get_data_file_path("ingredients.csv")
-        ingredients_df = pd.read_csv(ingredients_file)
+        # Load current ingredients (cached by the data store)
+        ingredients_df = load_table("ingredients.csv")
         
         if len(ingredients_df) == 0:
             print(" No ingredients found in stock.")
             return
         
-        # Calculate days since purchase for each ingredient
-        today = datetime.today().date()
-
-        # Convert date_added to datetime for calculation
-        ingredients_df['date_added'] = pd.to_datetime(ingredients_df['date_added']).dt.date
+        # Predict the status of every ingredient in one batch
+        results_df = predict_expiry_batch(ingredients_df, predictor)
 
-        # Calculate days since purchase (no .dt needed since we're working with date objects)
-        ingredients_df['days_since_purchase'] = (today - ingredients_df['date_added']).apply(lambda x: x.days)
-        
-        # Map ingredient names to types (simplified mapping)
-        name_to_type = {
-            'Tomato': 'Vegetables', 'Onion': 'Vegetables', 'Garlic': 'Vegetables', 'Lemon': 'Vegetables',
-            'Potato': 'Vegetables', 'Carrot': 'Vegetables', 'Spinach': 'Vegetables',
-            'Cheese': 'Dairy', 'Milk': 'Dairy', 'Butter': 'Dairy',
-            'Rice': 'Grains', 'Bread': 'Grains'
-        }
-        
-        # Create predictions for each ingredient
+        # Convert result rows to dictionaries for display
         predictions = []
-        
-        for _, row in ingredients_df.iterrows():
-            ingredient_name = row['name']
-            days_since = row['days_since_purchase']
-            storage_type = row['storage_type']
-            
-            # Get ingredient type from mapping
-            ingredient_type = name_to_type.get(ingredient_name, 'Vegetables')  # Default to Vegetables
-            
-            # Encode for prediction
-            ingredient_mapping = {'Vegetables': 1, 'Dairy': 2, 'Grains': 3}
-            storage_mapping = {'fridge': 1, 'freezer': 2, 'pantry': 3}
-            
-            ingredient_encoded = ingredient_mapping[ingredient_type]
-            storage_encoded = storage_mapping[storage_type]
-            
-            # Make prediction with proper DataFrame to avoid warnings
-            input_data = {
-                'ingredient_type_encoded': [ingredient_encoded],
-                'days_since_purchase': [days_since],
-                'storage_type_encoded': [storage_encoded]
-            }
-            input_df = pd.DataFrame(input_data)
-            prediction = model.predict(input_df)[0]
-            
+        for record in results_df.to_dict('records'):
             predictions.append({
-                'name': ingredient_name,
-                'type': ingredient_type,
-                'days_since_purchase': days_since,
-                'storage': storage_type,
-                'predicted_status': prediction,
-                'quantity': row['quantity'],
-                'unit': row['unit']
+                'name': record['name'],
+                'type': record['ingredient_type'],
+                'days_since_purchase': record['days_since_purchase'],
+                'storage': record['storage_type'],
+                'problem': record['problem'],
+                'predicted_status': record['predicted_status'],
+                'quantity': record['quantity'],
+                'unit': record['unit']
             })
         
         # Display results grouped by status
         safe_items = [p for p in predictions if p['predicted_status'] == 'Safe']
         expire_soon_items = [p for p in predictions if p['predicted_status'] == 'Expire Soon']
         expired_items = [p for p in predictions if p['predicted_status'] == 'Expired']
+        unknown_items = [p for p in predictions if p['predicted_status'] == 'Unknown']
         
         print(f"\n Expiry Analysis Results:")
         print(f"Total ingredients analyzed: {len(predictions)}")
@@ -382,12 +468,30 @@ def check_current_ingredients_expiry():
             for item in expired_items:
                 print(f"  - {item['name']} ({item['quantity']} {item['unit']}) - {item['days_since_purchase']} days old")
             print(" Consider disposing of these items safely.")
+
+        if unknown_items:
+            print(f"\n Could not predict ({len(unknown_items)}):")
+            for item in unknown_items:
+                print(f"  - {item['name']} ({item['problem']})")
         
     except FileNotFoundError:
         print(" Ingredients file not found.")
     except Exception as e:
         print(f" Error in analysis: {e}")
 
+def show_model_versions():
+    # Show the saved versions of the expiry model
+    print("\n===  Saved Expiry Model Versions ===")
+    versions = model_store.list_model_versions(EXPIRY_MODEL_NAME)
+    if not versions:
+        print(" No saved versions yet (a model is trained on the first prediction).")
+        return
+    print(f"{'Version':>7}  {'Saved at':<19}  {'Data hash':<12}  {'File':<7}  Notes")
+    print("-" * 70)
+    for entry in versions:
+        file_state = "kept" if entry['available'] else "deleted"
+        print(f"{entry['version']:>7}  {entry['saved_at']:<19}  {entry['data_hash'][:12]:<12}  {file_state:<7}  {entry['notes']}")
+
 def expiry_prediction_menu():
     # Main menu for expiry prediction features
     # This function demonstrates menu-driven programming
@@ -404,10 +508,11 @@ def expiry_prediction_menu():
         print("1. Predict Single Ingredient Expiry")
         print("2. Check All Current Ingredients")
         print("3. View Expiry Dataset")
-        print("4. Back to Main Menu")
+        print("4. View Saved Model Versions")
+        print("5. Back to Main Menu")
         print("="*50)
         
-        choice = input(" Enter your choice (1-4): ").strip()
+        choice = input(" Enter your choice (1-5): ").strip()
         
         if choice == "1":
             predict_ingredient_expiry()
@@ -416,10 +521,12 @@ def expiry_prediction_menu():
         elif choice == "3":
             view_expiry_dataset()
         elif choice == "4":
+            show_model_versions()
+        elif choice == "5":
             print(" Returning to main menu...")
             break
         else:
-            print(" Invalid choice! Please enter a number between 1-4.")
+            print(" Invalid choice! Please enter a number between 1-5.")
 
 def view_expiry_dataset():
     # Display the expiry dataset used for training
@@ -428,9 +535,8 @@ def view_expiry_dataset():
     print("\n===  Expiry Dataset ===")
     
     try:
-        # Load and display the dataset using correct path
-        expiry_file = get_data_file_path("expiry_dataset.csv")
-        expiry_df = pd.read_csv(expiry_file)
+        # Load and display the dataset (cached by the data store)
+        expiry_df = load_table("expiry_dataset.csv")
         
         print("\nExpiry prediction dataset:")
         print(expiry_df.to_string(index=False))
@@ -7,6 +7,11 @@
 # - Update ingredient quantities when we use them
 # - Remove ingredients from our inventory
 #
+# record_ingredient() and set_ingredient_quantity() change the stock without
+# asking any questions, so the command-line interface (cli.py) and scripts
+# can use them too. New values are checked by schema.py, the same way as in a
+# bulk import.
+#
 # Uses concepts from syllabus:
 # - Pandas for CSV operations (reading and writing data files)
 # - Datetime for date handling (tracking when ingredients were added)
@@ -16,32 +21,9 @@
 
 # Import required libraries - these give us extra functionality
 import pandas as pd        # For working with CSV files and data tables
-from datetime import datetime  # For working with dates and times
-import os                 # For working with file paths and directories
-
-def get_data_file_path(filename):
-    # Get the correct path to data files
-    # This function helps us find the right location for our data files
-    # no matter where the program is run from
-
-    # Get the absolute path of this current file
-    current_file_path = __file__  # __file__ is the path to this Python file
-    absolute_current_path = os.path.abspath(current_file_path)  # Make it absolute
-    current_dir = os.path.dirname(absolute_current_path)  # Get just the directory part
-
-    # Go up one level to get the parent directory (project root)
-    parent_dir = os.path.dirname(current_dir)
-
-    # Create the path to the data file
-    data_path = os.path.join(parent_dir, "data", filename)  # Join paths together
-
-    # If data directory doesn't exist, create it
-    data_dir = os.path.dirname(data_path)  # Get the directory part of the data path
-    directory_exists = os.path.exists(data_dir)  # Check if directory exists
-    if not directory_exists:  # If directory doesn't exist
-        os.makedirs(data_dir)  # Create the directory
-
-    return data_path  # Return the complete path to the data file
+from .data_store import get_data_file_path, load_table, save_table, append_row, next_id, update_row, delete_row, has_id, get_row, get_rows  # Shared cached access to CSV files
+from .name_index import find_ids_containing  # Prebuilt index for searching by name
+from .schema import VALID_UNITS, VALID_STORAGE_TYPES, validate_record, ask_value  # Shared validation rules
 
 def load_ingredients():
     # Load ingredients from CSV file
@@ -50,11 +32,8 @@ def load_ingredients():
 
     # Use try-except to handle errors gracefully
     try:
-        # Get the correct file path for ingredients.csv
-        ingredients_file = get_data_file_path("ingredients.csv")
-
-        # Read CSV file using pandas - this creates a DataFrame (data table)
-        df = pd.read_csv(ingredients_file)
+        # Read the ingredients table (the data store only re-reads the file if it changed)
+        df = load_table("ingredients.csv")
         return df  # Return the DataFrame to whoever called this function
 
     except FileNotFoundError:
@@ -70,8 +49,8 @@ def load_ingredients():
         df = pd.DataFrame(columns=columns)
 
         # Save the empty DataFrame to create the file
-        ingredients_file = get_data_file_path("ingredients.csv")  # Get file path again
-        df.to_csv(ingredients_file, index=False)  # Save to CSV without row numbers
+        save_table("ingredients.csv", df)
+        ingredients_file = get_data_file_path("ingredients.csv")
 
         # Tell the user where we created the file
         success_message = f" Created new ingredients database at: {ingredients_file}"
@@ -83,15 +62,34 @@ def save_ingredients(df):
     # Save ingredients DataFrame to CSV file
     # Args: df (pandas DataFrame) - ingredients data
     try:
-        # Get correct file path
-        ingredients_file = get_data_file_path("ingredients.csv")
-
         # Save to CSV without index
-        df.to_csv(ingredients_file, index=False)
+        save_table("ingredients.csv", df)
     except Exception as e:
         print(f" Error saving ingredients data: {e}")
         print(" Please check file permissions and try again.")
 
+def record_ingredient(name, quantity, unit, expiry_date, storage_type, cost):
+    # Check the values of a new ingredient and append it to ingredients.csv
+    # Only the new row is written (no full rewrite of the file).
+    #
+    # Returns: dictionary with the saved row (including its new ID)
+    # Raises: ValueError if a value is not valid
+    record = {}
+    record['name'] = name
+    record['quantity'] = quantity
+    record['unit'] = unit
+    record['expiry_date'] = expiry_date
+    record['storage_type'] = storage_type
+    record['cost'] = cost
+    checked = validate_record("ingredients.csv", record)  # date_added = today
+
+    # The new ID comes from the highest ID remembered by the data store
+    new_ingredient = {'id': next_id("ingredients.csv", 'id')}
+    new_ingredient.update(checked)
+
+    append_row("ingredients.csv", new_ingredient)
+    return new_ingredient
+
 def add_ingredient():
     # Add a new ingredient to the database
     #
@@ -100,150 +98,25 @@ def add_ingredient():
     # expiry date, storage type, and cost) and saves it to our CSV file.
     # It includes validation to make sure the user enters correct information.
     #
-    # Uses: input(), dictionaries, datetime, pandas operations
+    # Uses: input(), dictionaries, validation rules from schema.py
     print("\n===  Add New Ingredient ===")
 
-    # Load current ingredients from our CSV file
-    ingredients = load_ingredients()
-    
-    # Step 1: Get ingredient name from user
-    # We break down the operations to make it easier to understand
-    user_input = input("Enter ingredient name: ")  # Get input from user
-    clean_input = user_input.strip()  # Remove extra spaces
-    name = clean_input.title()  # Make first letter of each word uppercase
-
-    # Step 2: Get quantity with validation
-    # We use a while loop to keep asking until we get a valid number
-    quantity = 0  # Initialize quantity variable
-    while True:  # Keep looping until we get valid input
-        try:
-            user_quantity = input("Enter quantity: ")  # Ask for quantity
-            quantity = float(user_quantity)  # Try to convert to number
-            if quantity <= 0:  # Check if quantity is positive
-                print(" Quantity must be positive. Please try again.")
-            else:
-                break  # Exit loop if quantity is valid
-        except ValueError:  # This runs if conversion to float fails
-            print(" Please enter a valid number for quantity.")
-
-    # Get unit with validation - use simple loops instead of join()
-    valid_units = ['g', 'kg', 'ml', 'l', 'pieces', 'slices']
-
-    # Create unit options string using simple loop
-    unit_options = ""
-    for unit_option in valid_units:
-        unit_options = unit_options + unit_option + "/"
-    unit_options = unit_options[:-1]  # Remove last slash
-
-    unit = ""
-    while True:
-        user_unit = input(f"Enter unit ({unit_options}): ")
-        clean_unit = user_unit.strip()
-        unit = clean_unit.lower()
-
-        # Check if unit is valid using simple loop
-        unit_found = False
-        for valid_unit in valid_units:
-            if unit == valid_unit:
-                unit_found = True
-                break
-
-        if unit_found:
-            break
-        else:
-            # Create error message using simple loop
-            valid_units_text = ""
-            for valid_unit in valid_units:
-                valid_units_text = valid_units_text + valid_unit + ", "
-            valid_units_text = valid_units_text[:-2]  # Remove last comma and space
-            print(f" Please enter a valid unit: {valid_units_text}")
-    
-    # Get expiry date with validation
-    expiry_date = ""
-    while True:
-        user_date = input("Enter expiry date (YYYY-MM-DD): ")
-        expiry_date = user_date.strip()
-        try:
-            # Validate date format
-            datetime.strptime(expiry_date, "%Y-%m-%d")
-            break  # Exit loop if date is valid
-        except ValueError:
-            print(" Please enter date in YYYY-MM-DD format (e.g., 2025-08-25)")
-
-    # Get storage type with validation - use simple loops
-    valid_storage = ['fridge', 'pantry', 'freezer']
-
-    # Create storage options string using simple loop
-    storage_options = ""
-    for storage_option in valid_storage:
-        storage_options = storage_options + storage_option + "/"
-    storage_options = storage_options[:-1]  # Remove last slash
-
-    storage_type = ""
-    while True:
-        user_storage = input(f"Enter storage type ({storage_options}): ")
-        clean_storage = user_storage.strip()
-        storage_type = clean_storage.lower()
-
-        # Check if storage type is valid using simple loop
-        storage_found = False
-        for valid_type in valid_storage:
-            if storage_type == valid_type:
-                storage_found = True
-                break
-
-        if storage_found:
-            break
-        else:
-            # Create error message using simple loop
-            valid_storage_text = ""
-            for valid_type in valid_storage:
-                valid_storage_text = valid_storage_text + valid_type + ", "
-            valid_storage_text = valid_storage_text[:-2]  # Remove last comma and space
-            print(f" Please enter a valid storage type: {valid_storage_text}")
-    
-    # Get cost with validation
-    cost = 0
-    while True:
-        try:
-            user_cost = input("Enter cost: ")
-            cost = float(user_cost)
-            if cost < 0:
-                print(" Cost cannot be negative. Please try again.")
-            else:
-                break  # Exit loop if cost is valid
-        except ValueError:
-            print(" Please enter a valid number for cost.")
+    # Ask for each value until it is valid (checked by schema.py)
+    name = ask_value("ingredients.csv", "name", "Enter ingredient name: ")
+    quantity = ask_value("ingredients.csv", "quantity", "Enter quantity: ")
+    unit = ask_value("ingredients.csv", "unit", f"Enter unit ({'/'.join(VALID_UNITS)}): ")
+    expiry_date = ask_value("ingredients.csv", "expiry_date", "Enter expiry date (YYYY-MM-DD): ")
+    storage_type = ask_value("ingredients.csv", "storage_type",
+                             f"Enter storage type ({'/'.join(VALID_STORAGE_TYPES)}): ")
+    cost = ask_value("ingredients.csv", "cost", "Enter cost: ")
 
-    # Generate new ID - break down the logic
-    ingredients_count = len(ingredients)
-    if ingredients_count == 0:
-        new_id = 1
-    else:
-        max_id = ingredients['id'].max()
-        new_id = max_id + 1
-
-    # Get current date - break down chained operations
-    current_date = datetime.today()
-    today = current_date.strftime("%Y-%m-%d")
-
-    # Create new ingredient dictionary - use separate lines for clarity
-    new_ingredient = {}
-    new_ingredient['id'] = new_id
-    new_ingredient['name'] = name
-    new_ingredient['quantity'] = quantity
-    new_ingredient['unit'] = unit
-    new_ingredient['expiry_date'] = expiry_date
-    new_ingredient['storage_type'] = storage_type
-    new_ingredient['date_added'] = today
-    new_ingredient['cost'] = cost
-
-    # Add to DataFrame - create new row first, then add
-    new_row_df = pd.DataFrame([new_ingredient])
-    ingredients = pd.concat([ingredients, new_row_df], ignore_index=True)
-    
-    # Save to file
-    save_ingredients(ingredients)
+    # Save the new ingredient (appends just the new row to the file)
+    try:
+        record_ingredient(name, quantity, unit, expiry_date, storage_type, cost)
+    except Exception as e:
+        print(f" Error saving ingredients data: {e}")
+        print(" Please check file permissions and try again.")
+        return
     
     print(f" Ingredient '{name}' added successfully!")
 
@@ -291,8 +164,9 @@ def view_ingredients():
     elif choice == "4":
         # Search by name
         search_name = input("Enter ingredient name to search: ").strip().lower()
-        # Use string contains for partial matching
-        filtered = ingredients[ingredients['name'].str.lower().str.contains(search_name)]
+        # Partial matching with the name index (no scan of every name)
+        matching_ids = find_ids_containing(search_name)
+        filtered = get_rows("ingredients.csv", matching_ids)
         if len(filtered) == 0:
             print(f" No ingredients found matching '{search_name}'.")
         else:
@@ -334,8 +208,8 @@ def update_ingredient():
     while True:
         try:
             ingredient_id = int(input("\nEnter ingredient ID to update: "))
-            # Check if ID exists
-            if ingredient_id in ingredients['id'].values:
+            # Check if ID exists (O(1) lookup in the data store's ID index)
+            if has_id("ingredients.csv", ingredient_id):
                 break
             else:
                 print(" Ingredient ID not found. Please try again.")
@@ -343,7 +217,7 @@ def update_ingredient():
             print(" Please enter a valid number for ID.")
     
     # Get current ingredient info
-    current_ingredient = ingredients[ingredients['id'] == ingredient_id].iloc[0]
+    current_ingredient = get_row("ingredients.csv", ingredient_id)
     print(f"\nCurrent ingredient: {current_ingredient['name']}")
     print(f"Current quantity: {current_ingredient['quantity']} {current_ingredient['unit']}")
     
@@ -358,14 +232,25 @@ def update_ingredient():
         except ValueError:
             print(" Please enter a valid number for quantity.")
     
-    # Update the quantity
-    ingredients.loc[ingredients['id'] == ingredient_id, 'quantity'] = new_quantity
-    
-    # Save changes
-    save_ingredients(ingredients)
+    set_ingredient_quantity(ingredient_id, new_quantity)
     
     print(f" Updated {current_ingredient['name']} quantity to {new_quantity} {current_ingredient['unit']}")
 
+def set_ingredient_quantity(ingredient_id, new_quantity):
+    # Change the quantity of one ingredient
+    # The quantity is in the unit the ingredient is stored in.
+    #
+    # Returns: dictionary with the updated row
+    # Raises: ValueError if the ID is unknown or the quantity is negative
+    if not has_id("ingredients.csv", ingredient_id):
+        raise ValueError(f"No ingredient with id {ingredient_id}.")
+    if new_quantity < 0:
+        raise ValueError("Quantity cannot be negative.")
+
+    # Update only this ingredient's quantity (no full rewrite with SQLite)
+    update_row("ingredients.csv", 'id', ingredient_id, {'quantity': new_quantity})
+    return get_row("ingredients.csv", ingredient_id)
+
 def remove_ingredient():
     # Remove an ingredient from the database
     # Uses: pandas filtering, user confirmation
@@ -386,8 +271,8 @@ def remove_ingredient():
     while True:
         try:
             ingredient_id = int(input("\nEnter ingredient ID to remove: "))
-            # Check if ID exists
-            if ingredient_id in ingredients['id'].values:
+            # Check if ID exists (O(1) lookup in the data store's ID index)
+            if has_id("ingredients.csv", ingredient_id):
                 break
             else:
                 print(" Ingredient ID not found. Please try again.")
@@ -395,7 +280,7 @@ def remove_ingredient():
             print(" Please enter a valid number for ID.")
     
     # Get ingredient info for confirmation
-    ingredient_to_remove = ingredients[ingredients['id'] == ingredient_id].iloc[0]
+    ingredient_to_remove = get_row("ingredients.csv", ingredient_id)
     
     # Confirm removal
     print(f"\nAre you sure you want to remove:")
@@ -406,11 +291,8 @@ def remove_ingredient():
     confirmation = input("\nType 'yes' to confirm removal: ").strip().lower()
     
     if confirmation == 'yes':
-        # Remove the ingredient (keep all rows except the one with matching ID)
-        ingredients = ingredients[ingredients['id'] != ingredient_id]
-        
-        # Save changes
-        save_ingredients(ingredients)
+        # Remove only the row with matching ID (no full rewrite with SQLite)
+        delete_row("ingredients.csv", 'id', ingredient_id)
         
         print(f" Removed {ingredient_to_remove['name']} from inventory.")
     else:
@@ -10,15 +10,52 @@
 # - Import statements and module usage
 # - User input and validation
 
-# Import all feature modules from the same package
-# Since all modules are in the same directory, we can use relative imports
-from .ingredient import ingredient_management_menu
-from .recipe_ml import recipe_suggestion_menu
-from .waste import waste_management_menu
-from .expiry_ml import expiry_prediction_menu
-from .expiry import expiry_check_menu
-from .expense import expense_tracker_menu
-from .reports import reports_menu
+# Feature modules are NOT imported here at the top.
+# Some of them pull in big libraries (sklearn for the ML features,
+# matplotlib for the reports), which made the program slow to start.
+# Instead, each feature module is imported the first time its menu entry
+# is chosen (see open_feature() below).
+import importlib  # For importing a module by its name
+import sys  # For checking which modules are already loaded
+import time  # For measuring import times
+
+# Feature modules opened from the main menu (used for the startup profile)
+FEATURE_MODULES = ["ingredient", "recipe_ml", "waste", "expiry_ml", "expiry", "expense", "reports"]
+
+def load_feature_module(module_name):
+    # Import a feature module from this package (only once - Python
+    # keeps imported modules in sys.modules, so later calls are instant)
+    return importlib.import_module("." + module_name, __package__)
+
+def open_feature(module_name, function_name):
+    # Import a feature module on first use and run its menu function
+    feature_module = load_feature_module(module_name)
+    menu_function = getattr(feature_module, function_name)
+    menu_function()
+
+def profile_startup():
+    # Show how long it takes to import each feature module
+    # Modules are imported one after another, so a shared library (like
+    # pandas) is counted for the first module that needs it.
+    print("\n" + "=" * 50)
+    print("    STARTUP IMPORT PROFILE")
+    print("=" * 50)
+    print(f"{'Module':<15} {'Time (ms)':>10} {'New modules':>12}")
+    print("-" * 50)
+
+    total_time = 0.0
+    for module_name in FEATURE_MODULES:
+        modules_before = len(sys.modules)
+        start_time = time.perf_counter()
+        load_feature_module(module_name)
+        elapsed_ms = (time.perf_counter() - start_time) * 1000
+        new_modules = len(sys.modules) - modules_before
+        total_time = total_time + elapsed_ms
+        print(f"{module_name:<15} {elapsed_ms:>10.1f} {new_modules:>12}")
+
+    print("-" * 50)
+    print(f"{'Total':<15} {total_time:>10.1f}")
+    print("=" * 50)
 
 def show_welcome_message():
     # Simple welcome message
@@ -77,25 +114,25 @@ def main_menu():
 
             if choice == "1":
                 print("\nOpening Ingredients...")
-                ingredient_management_menu()
+                open_feature("ingredient", "ingredient_management_menu")
             elif choice == "2":
                 print("\nOpening Recipes...")
-                recipe_suggestion_menu()
+                open_feature("recipe_ml", "recipe_suggestion_menu")
             elif choice == "3":
                 print("\nOpening Waste Tracker...")
-                waste_management_menu()
+                open_feature("waste", "waste_management_menu")
             elif choice == "4":
                 print("\nOpening AI Expiry Check...")
-                expiry_prediction_menu()
+                open_feature("expiry_ml", "expiry_prediction_menu")
             elif choice == "5":
                 print("\nOpening Simple Expiry Check...")
-                expiry_check_menu()
+                open_feature("expiry", "expiry_check_menu")
             elif choice == "6":
                 print("\nOpening Expense Tracker...")
-                expense_tracker_menu()
+                open_feature("expense", "expense_tracker_menu")
             elif choice == "7":
                 print("\nOpening Reports...")
-                reports_menu()
+                open_feature("reports", "reports_menu")
             elif choice == "8":
                 show_help_information()
             elif choice == "9":
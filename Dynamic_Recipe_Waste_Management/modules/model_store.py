@@ -0,0 +1,227 @@
+# Model Artifact Store
+#
+# This module saves trained machine learning models to disk so that we do
+# not have to train them again every time a feature is used:
+# - Compute a content hash of the data files a model was trained on
+# - Save a fitted model together with that hash
+# - Load the saved model again on the next run (warm start)
+# - Tell the caller to retrain only when the data files have changed
+#
+# Models can also be kept as numbered versions (a small model registry):
+#     data/models/<model name>/v1.pkl, v2.pkl, ...
+#     data/models/<model name>/versions.csv  (one line per version: number,
+#                                             date, data hash, notes)
+# A new version is saved every time the model is trained on changed data.
+# The newest version that matches the current data is loaded, and only the
+# last MAX_SAVED_VERSIONS model files are kept.
+#
+# Uses concepts from syllabus:
+# - File handling (reading files in binary mode)
+# - Dictionaries for storing model information
+# - Exception handling with try-except
+# - Functions and modular programming
+
+# Import required libraries
+import csv  # For the list of saved model versions
+import hashlib  # For computing content hashes of data files
+import os  # For file path operations
+import pickle  # For saving Python objects (like models) to files
+from datetime import datetime  # For the date a version was saved
+from .data_store import get_data_file_path  # For finding the data directory
+
+# Number of model files kept per versioned model (older ones are deleted)
+MAX_SAVED_VERSIONS = 5
+
+# Columns of the versions.csv index of a versioned model
+VERSION_COLUMNS = ['version', 'saved_at', 'data_hash', 'notes']
+
+# Cache of file hashes so unchanged files are not read again
+# Key: file path, Value: (modification time, file size, hash)
+_file_hash_cache = {}
+
+def get_model_file_path(model_name):
+    # Get the path of the saved model file (stored in data/models/)
+    return get_data_file_path(os.path.join("models", model_name + ".pkl"))
+
+def compute_file_hash(file_path):
+    # Compute the SHA-256 hash of a file's content
+    # The hash is cached using the file's modification time and size,
+    # so an unchanged file is only read once per run
+    #
+    # Returns: hash string, or None if the file does not exist
+    try:
+        file_stat = os.stat(file_path)
+    except FileNotFoundError:
+        return None
+
+    cached = _file_hash_cache.get(file_path)
+    if cached is not None:
+        if cached[0] == file_stat.st_mtime_ns and cached[1] == file_stat.st_size:
+            return cached[2]
+
+    # Read the file in blocks so large files don't need to fit in memory
+    hasher = hashlib.sha256()
+    with open(file_path, "rb") as data_file:
+        while True:
+            block = data_file.read(1024 * 1024)
+            if not block:
+                break
+            hasher.update(block)
+    file_hash = hasher.hexdigest()
+
+    _file_hash_cache[file_path] = (file_stat.st_mtime_ns, file_stat.st_size, file_hash)
+    return file_hash
+
+def compute_data_hash(file_paths):
+    # Compute one combined hash for a list of data files
+    # If any of the files changes, the combined hash changes too
+    hasher = hashlib.sha256()
+    for file_path in file_paths:
+        file_hash = compute_file_hash(file_path)
+        hasher.update(os.path.basename(file_path).encode("utf-8"))
+        if file_hash is None:
+            hasher.update(b"missing")
+        else:
+            hasher.update(file_hash.encode("utf-8"))
+    return hasher.hexdigest()
+
+def write_artifact(file_path, artifact):
+    # Write an artifact dictionary to a pickle file
+    # Write to a temporary file first and then rename it,
+    # so a crash can never leave a half-written model behind
+    # Raises: OSError or pickle errors if the file cannot be written
+    model_dir = os.path.dirname(file_path)
+    if not os.path.exists(model_dir):
+        os.makedirs(model_dir)
+    temp_file = file_path + ".tmp"
+    with open(temp_file, "wb") as output_file:
+        pickle.dump(artifact, output_file)
+    os.replace(temp_file, file_path)
+
+def save_model(model_name, model, data_hash, extra=None):
+    # Save a trained model to disk together with the hash of its training data
+    #
+    # Args:
+    #     model_name (str) - name of the model file (without extension)
+    #     model - the trained model object
+    #     data_hash (str) - hash of the data the model was trained on
+    #     extra (dict) - any other information needed to use the model
+    artifact = {}
+    artifact['model'] = model
+    artifact['data_hash'] = data_hash
+    artifact['extra'] = extra if extra is not None else {}
+
+    try:
+        write_artifact(get_model_file_path(model_name), artifact)
+    except Exception as e:
+        print(f" Could not save model '{model_name}': {e}")
+
+def load_model(model_name, data_hash):
+    # Load a saved model if it was trained on the same data
+    #
+    # Returns: artifact dictionary with 'model' and 'extra' keys,
+    #          or None if there is no saved model or the data has changed
+    model_file = get_model_file_path(model_name)
+    if not os.path.exists(model_file):
+        return None
+
+    try:
+        with open(model_file, "rb") as input_file:
+            artifact = pickle.load(input_file)
+    except Exception as e:
+        print(f" Saved model '{model_name}' could not be loaded: {e}")
+        return None
+
+    # Only use the saved model if the training data has not changed
+    if artifact.get('data_hash') != data_hash:
+        return None
+
+    return artifact
+
+def get_version_dir(model_name):
+    # Get the folder of a versioned model (stored in data/models/<name>/)
+    return get_data_file_path(os.path.join("models", model_name))
+
+def get_version_file_path(model_name, version):
+    # Get the path of one saved version, e.g. data/models/expiry_model/v3.pkl
+    return os.path.join(get_version_dir(model_name), f"v{version}.pkl")
+
+def get_version_index_path(model_name):
+    # Get the path of the version list, e.g. data/models/expiry_model/versions.csv
+    return os.path.join(get_version_dir(model_name), "versions.csv")
+
+def list_model_versions(model_name):
+    # List the saved versions of a model (oldest first)
+    # Returns: list of dictionaries with the VERSION_COLUMNS ('version' as int)
+    #          and 'available' (False if the model file was already deleted)
+    index_file = get_version_index_path(model_name)
+    if not os.path.exists(index_file):
+        return []
+    versions = []
+    with open(index_file, newline="") as input_file:
+        for row in csv.DictReader(input_file):
+            row['version'] = int(row['version'])
+            row['available'] = os.path.exists(get_version_file_path(model_name, row['version']))
+            versions.append(row)
+    return versions
+
+def save_model_version(model_name, model, data_hash, extra=None, notes=""):
+    # Save a trained model as a new version
+    #
+    # Args:
+    #     model_name (str) - name of the model (folder in data/models/)
+    #     model - the trained model object
+    #     data_hash (str) - hash of the data the model was trained on
+    #     extra (dict) - any other information needed to use the model
+    #                    (e.g. encoding maps and the list of features)
+    #     notes (str) - short text for the version list (e.g. the accuracy)
+    # Returns: the new version number, or None if it could not be saved
+    versions = list_model_versions(model_name)
+    version = 1
+    if versions:
+        version = versions[-1]['version'] + 1
+
+    artifact = {}
+    artifact['model'] = model
+    artifact['data_hash'] = data_hash
+    artifact['extra'] = extra if extra is not None else {}
+    artifact['version'] = version
+    try:
+        write_artifact(get_version_file_path(model_name, version), artifact)
+    except Exception as e:
+        print(f" Could not save model '{model_name}': {e}")
+        return None
+
+    # Add the version to the index (rewritten in full - it is only a few lines)
+    new_entry = {'version': version, 'saved_at': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                 'data_hash': data_hash, 'notes': notes}
+    versions.append(new_entry)
+    index_file = get_version_index_path(model_name)
+    with open(index_file + ".tmp", "w", newline="") as output_file:
+        writer = csv.DictWriter(output_file, fieldnames=VERSION_COLUMNS, extrasaction='ignore')
+        writer.writeheader()
+        writer.writerows(versions)
+    os.replace(index_file + ".tmp", index_file)
+
+    # Keep only the newest model files
+    for old_entry in versions[:-MAX_SAVED_VERSIONS]:
+        old_file = get_version_file_path(model_name, old_entry['version'])
+        if os.path.exists(old_file):
+            os.remove(old_file)
+    return version
+
+def load_model_version(model_name, data_hash):
+    # Load the newest saved version that was trained on the same data
+    #
+    # Returns: artifact dictionary with 'model', 'extra' and 'version' keys,
+    #          or None if no saved version matches the data
+    versions = list_model_versions(model_name)
+    for entry in reversed(versions):
+        if entry['data_hash'] != data_hash or not entry['available']:
+            continue
+        try:
+            with open(get_version_file_path(model_name, entry['version']), "rb") as input_file:
+                return pickle.load(input_file)
+        except Exception as e:
+            print(f" Saved model '{model_name}' version {entry['version']} could not be loaded: {e}")
+    return None
@@ -0,0 +1,214 @@
+# Ingredient Name Index
+#
+# This module makes searching ingredients by name fast, even with hundreds
+# of thousands of ingredients, by preparing the answers in advance:
+# - Exact lookup: lowercase name -> IDs of the ingredients with that name
+# - Substring search: every name is split into "trigrams" (all pieces of
+#   3 letters, e.g. "tomato" -> tom, oma, mat, ato). A name can only contain
+#   the search text if it has all of the search text's trigrams, so only
+#   those few names have to be checked
+# - Prefix search: the distinct names are kept in a sorted list, and the
+#   names starting with some text are found with binary search (bisect)
+#
+# The index is built from ingredients.csv on first use. After that, adding,
+# renaming or removing ingredients (one at a time or by a bulk import/delete)
+# only touches the names and trigrams of those IDs - see the listener
+# contract in add_table_listener() (data_store.py). A whole-table save is not
+# reported, so the index notices the new table version and is rebuilt.
+#
+# Uses concepts from syllabus:
+# - Dictionaries and sets
+# - String slicing and methods (lower, strip)
+# - Binary search with the bisect module
+# - Functions and modular programming
+
+# Import required libraries
+import bisect  # Binary search in sorted lists
+from .data_store import load_table, get_table_version, add_table_listener  # Shared table access
+
+# Length of the name pieces used for substring search
+GRAM_SIZE = 3
+
+# The index that was built last, and the ingredients table version it matches
+_index_cache = {}
+
+def normalize_name(name):
+    # Turn an ingredient name into the form used in the index (lowercase)
+    return str(name).strip().lower()
+
+def get_trigrams(text):
+    # Get all pieces of GRAM_SIZE letters in a text (as a set)
+    trigrams = set()
+    for start in range(len(text) - GRAM_SIZE + 1):
+        trigrams.add(text[start:start + GRAM_SIZE])
+    return trigrams
+
+def add_to_index(index, ingredient_id, name):
+    # Add one ingredient to the index
+    name = normalize_name(name)
+    index['name_of'][ingredient_id] = name
+
+    ids = index['ids_by_name'].get(name)
+    if ids is None:
+        # First ingredient with this name - index the name itself
+        ids = set()
+        index['ids_by_name'][name] = ids
+        bisect.insort(index['sorted_names'], name)
+        for trigram in get_trigrams(name):
+            index['trigrams'].setdefault(trigram, set()).add(name)
+    ids.add(ingredient_id)
+
+def remove_from_index(index, ingredient_id):
+    # Remove one ingredient from the index (if it is in there)
+    name = index['name_of'].pop(ingredient_id, None)
+    if name is None:
+        return
+
+    ids = index['ids_by_name'][name]
+    ids.discard(ingredient_id)
+    if ids:
+        return
+
+    # Last ingredient with this name - remove the name too
+    del index['ids_by_name'][name]
+    position = bisect.bisect_left(index['sorted_names'], name)
+    del index['sorted_names'][position]
+    for trigram in get_trigrams(name):
+        names = index['trigrams'][trigram]
+        names.discard(name)
+        if not names:
+            del index['trigrams'][trigram]
+
+def build_name_index(ingredients_df):
+    # Build the name index for an ingredients DataFrame
+    #
+    # Returns: dictionary with
+    #   'ids_by_name'  - lowercase name -> set of ingredient IDs
+    #   'name_of'      - ingredient ID -> lowercase name
+    #   'trigrams'     - trigram -> set of lowercase names containing it
+    #   'sorted_names' - distinct lowercase names in sorted order
+    ids = ingredients_df['id'].tolist()
+    names = ingredients_df['name'].astype(str).str.strip().str.lower().tolist()
+
+    name_of = dict(zip(ids, names))
+    ids_by_name = {}
+    for ingredient_id, name in zip(ids, names):
+        ids_by_name.setdefault(name, set()).add(ingredient_id)
+
+    # Trigrams and sorted list only need each distinct name once
+    trigrams = {}
+    for name in ids_by_name:
+        for start in range(len(name) - GRAM_SIZE + 1):
+            trigram = name[start:start + GRAM_SIZE]
+            names_with_trigram = trigrams.get(trigram)
+            if names_with_trigram is None:
+                trigrams[trigram] = {name}
+            else:
+                names_with_trigram.add(name)
+
+    index = {}
+    index['ids_by_name'] = ids_by_name
+    index['name_of'] = name_of
+    index['trigrams'] = trigrams
+    index['sorted_names'] = sorted(ids_by_name)
+    return index
+
+def get_name_index():
+    # Get the name index, building it again only if the table changed
+    # Raises: FileNotFoundError if there is no ingredients table
+    version = get_table_version("ingredients.csv")
+    if version is None:
+        raise FileNotFoundError("ingredients.csv")
+
+    if _index_cache.get('version') != version:
+        ingredients_df = load_table("ingredients.csv")
+        _index_cache['index'] = build_name_index(ingredients_df)
+        _index_cache['version'] = version
+
+    return _index_cache['index']
+
+def update_index_after_change(change, details, old_version, new_version):
+    # Keep the index up to date when ingredient rows change
+    # (called by the data store after append_row(s)/update_row/delete_row(s))
+    if 'index' not in _index_cache or _index_cache.get('version') != old_version:
+        return  # No index yet, or it was already out of date - rebuilt on next use
+    index = _index_cache['index']
+
+    if change == 'append':
+        row = details['row']
+        remove_from_index(index, row.get('id'))
+        add_to_index(index, row.get('id'), row.get('name'))
+    elif change == 'append_many':
+        for row in details['rows']:
+            remove_from_index(index, row.get('id'))
+            add_to_index(index, row.get('id'), row.get('name'))
+    elif change == 'update':
+        if 'name' in details['values']:
+            remove_from_index(index, details['id_value'])
+            add_to_index(index, details['id_value'], details['values']['name'])
+    elif change == 'delete':
+        remove_from_index(index, details['id_value'])
+    elif change == 'delete_many':
+        for id_value in details['id_values']:
+            remove_from_index(index, id_value)
+
+    _index_cache['version'] = new_version
+
+def collect_ids(index, names):
+    # Get the IDs of all ingredients with one of the given names (sorted)
+    ids = []
+    for name in names:
+        ids.extend(index['ids_by_name'][name])
+    return sorted(ids)
+
+def find_ids_by_name(name):
+    # Find ingredients whose name is exactly this name (any upper/lowercase)
+    index = get_name_index()
+    return sorted(index['ids_by_name'].get(normalize_name(name), set()))
+
+def find_ids_with_prefix(prefix):
+    # Find ingredients whose name starts with the given text
+    index = get_name_index()
+    prefix = normalize_name(prefix)
+    sorted_names = index['sorted_names']
+
+    # All names starting with the prefix are next to each other in the
+    # sorted list, beginning at the position where the prefix would go
+    matching_names = []
+    position = bisect.bisect_left(sorted_names, prefix)
+    while position < len(sorted_names) and sorted_names[position].startswith(prefix):
+        matching_names.append(sorted_names[position])
+        position = position + 1
+    return collect_ids(index, matching_names)
+
+def find_ids_containing(text):
+    # Find ingredients whose name contains the given text anywhere
+    index = get_name_index()
+    text = normalize_name(text)
+
+    if len(text) < GRAM_SIZE:
+        # Too short for trigrams - check each distinct name once
+        candidates = index['ids_by_name'].keys()
+    else:
+        # Only names that have every trigram of the text can contain it.
+        # Start with the rarest trigram, so the candidate set stays small.
+        trigram_sets = []
+        for trigram in get_trigrams(text):
+            names = index['trigrams'].get(trigram)
+            if names is None:
+                return []
+            trigram_sets.append(names)
+        trigram_sets.sort(key=len)
+        candidates = set(trigram_sets[0])
+        for names in trigram_sets[1:]:
+            candidates = candidates & names
+
+    # Trigrams can match in a different order, so check the real text
+    matching_names = []
+    for name in candidates:
+        if text in name:
+            matching_names.append(name)
+    return collect_ids(index, matching_names)
+
+# Keep the name lookups in step with changes to ingredients.csv
+add_table_listener("ingredients.csv", update_index_after_change)
@@ -0,0 +1,455 @@
+# Parquet Storage Backend (for the history tables)
+#
+# The waste and expense tables only ever grow, and the reports read them
+# as a whole. This module stores them in Parquet files instead of CSV:
+# - Parquet is a "columnar" format: each column is stored separately with
+#   its own type (whole numbers, decimals, text, dates), so reading only
+#   the columns a report needs ("column pruning") skips the others
+# - The waste table is split into one folder per month of its 'date'
+#   column, e.g. data/parquet/waste/month=2025-08/. Asking for a date range
+#   only opens the folders of those months ("predicate pushdown")
+# - The expense table has no date column, so it is kept in one folder
+#
+# Every new row is written as a small extra file in its folder. When a
+# folder has many small files they are merged into one ("compaction").
+# IDs are unique, so if the program stops halfway through a merge, rows
+# that appear twice are simply dropped again when the table is loaded.
+#
+# This backend needs the optional pyarrow library (pip install pyarrow).
+# Without it, data_store.py keeps using the CSV files.
+#
+# Uses concepts from syllabus:
+# - File handling and the os module (folders and files)
+# - Pandas for DataFrame operations
+# - Dictionaries and lists for table definitions
+# - Exception handling with try-except (optional import)
+
+# Import required libraries
+import os  # For folders and file paths
+import shutil  # For removing whole folders
+import time  # For unique file names
+import pandas as pd  # For DataFrame operations
+from .data_store import get_data_file_path, read_tombstones, remove_deleted_rows  # Data directory and CSV tombstone log
+from .schema import apply_column_types, normalize_units, set_typed_value, to_python_value  # Compact column types of the tables
+
+# pyarrow is optional - without it this backend is not available
+try:
+    import pyarrow as pa  # Arrow tables and types
+    import pyarrow.dataset as pa_dataset  # Reading folders of Parquet files
+    import pyarrow.parquet as pa_parquet  # Writing Parquet files
+except ImportError:
+    pa = None
+
+# This backend can select columns and date ranges while reading
+SUPPORTS_FILTERS = True
+
+# Folder (inside data/) that holds the Parquet tables
+PARQUET_DIRECTORY = "parquet"
+
+# Table definitions: CSV filename -> (folder name, list of (column, type),
+# date column used for monthly folders or None)
+# The first column is the ID column.
+TABLE_DEFINITIONS = {
+    'waste.csv': ('waste', [
+        ('id', 'int64'),
+        ('name', 'string'),
+        ('quantity', 'double'),
+        ('unit', 'string'),
+        ('reason', 'string'),
+        ('date', 'date32'),
+        ('cost', 'double'),
+    ], 'date'),
+    'expenses.csv': ('expenses', [
+        ('id', 'int64'),
+        ('name', 'string'),
+        ('cost', 'double'),
+    ], None),
+}
+
+# Name of the folder level that holds the month, e.g. month=2025-08
+PARTITION_NAME = "month"
+
+# Folder name for rows without a valid date
+NO_DATE_PARTITION = "none"
+
+# Merge the files of a folder once it has more than this many
+MAX_FILES_PER_FOLDER = 20
+
+# Cache of whole loaded tables: folder name -> (version, DataFrame)
+_table_cache = {}
+
+# Cache of the highest ID: folder name -> (version, highest ID)
+_max_id_cache = {}
+
+# Counter increased on every write we make, so cached tables are refreshed
+_write_counter = [0]
+
+def is_available():
+    # Check if pyarrow is installed
+    return pa is not None
+
+def is_supported(filename):
+    # Check if a table is stored in Parquet by this backend
+    return filename in TABLE_DEFINITIONS
+
+def get_table_info(filename):
+    # Get folder name, column names, ID column and date column of a table
+    folder_name, columns, date_column = TABLE_DEFINITIONS[filename]
+    column_names = []
+    for column_name, column_type in columns:
+        column_names.append(column_name)
+    return folder_name, column_names, column_names[0], date_column
+
+def get_schema(filename):
+    # Get the pyarrow schema (column names and types) of a table
+    folder_name, columns, date_column = TABLE_DEFINITIONS[filename]
+    fields = []
+    for column_name, column_type in columns:
+        fields.append((column_name, pa.type_for_alias(column_type)))
+    return pa.schema(fields)
+
+def get_table_directory(filename):
+    # Get the folder of a table, e.g. data/parquet/waste
+    folder_name = TABLE_DEFINITIONS[filename][0]
+    return get_data_file_path(os.path.join(PARQUET_DIRECTORY, folder_name))
+
+def get_partition_directory(filename, month):
+    # Get the folder for one month of a table (or the table folder if
+    # the table is not split by month)
+    table_directory = get_table_directory(filename)
+    if TABLE_DEFINITIONS[filename][2] is None:
+        return table_directory
+    return os.path.join(table_directory, f"{PARTITION_NAME}={month}")
+
+def list_data_files(directory):
+    # List all Parquet files in a folder and its sub-folders
+    data_files = []
+    if not os.path.isdir(directory):
+        return data_files
+    for folder, sub_folders, file_names in os.walk(directory):
+        sub_folders.sort()
+        for file_name in sorted(file_names):
+            if file_name.endswith(".parquet"):
+                data_files.append(os.path.join(folder, file_name))
+    return data_files
+
+def get_table_version(filename):
+    # Get a value that changes whenever the table's files change
+    # Returns: version value, or None if the table does not exist yet
+    table_directory = get_table_directory(filename)
+    if not os.path.isdir(table_directory):
+        return None
+    data_files = list_data_files(table_directory)
+    newest_change = 0
+    total_size = 0
+    for data_file in data_files:
+        file_stat = os.stat(data_file)
+        newest_change = max(newest_change, file_stat.st_mtime_ns)
+        total_size = total_size + file_stat.st_size
+    return ('parquet', len(data_files), newest_change, total_size, _write_counter[0])
+
+def mark_changed(filename):
+    # Remember that a table was changed so its cached copy is not used again
+    _write_counter[0] = _write_counter[0] + 1
+    _table_cache.pop(TABLE_DEFINITIONS[filename][0], None)
+
+def clear_cache():
+    # Forget all cached tables (e.g. after switching to another data folder)
+    _table_cache.clear()
+    _max_id_cache.clear()
+
+def to_arrow_table(filename, df):
+    # Convert a DataFrame to an Arrow table with the right column types
+    schema = get_schema(filename)
+    folder_name, column_names, id_column, date_column = get_table_info(filename)
+
+    df = df.reindex(columns=column_names)
+    if date_column is not None:
+        # datetime64[D] values are stored as Parquet dates
+        dates = pd.to_datetime(df[date_column], errors='coerce')
+        df = df.assign(**{date_column: dates.to_numpy().astype('datetime64[D]')})
+    return pa.Table.from_pandas(df, schema=schema, preserve_index=False)
+
+def get_months(filename, df):
+    # Get the month folder name ('YYYY-MM') of every row
+    date_column = TABLE_DEFINITIONS[filename][2]
+    dates = pd.to_datetime(df[date_column], errors='coerce')
+    # Rounding down to whole months (datetime64[M]) is much faster than
+    # formatting every date as text
+    months = pd.Series(dates.to_numpy().astype('datetime64[M]').astype(str), index=df.index)
+    return months.where(dates.notna(), NO_DATE_PARTITION)
+
+def write_data_file(directory, arrow_table):
+    # Write one new Parquet file into a folder
+    # It is written under a temporary name first and then renamed, so a
+    # half-written file is never read.
+    if not os.path.exists(directory):
+        os.makedirs(directory)
+    file_path = os.path.join(directory, f"part-{time.time_ns()}.parquet")
+    temp_file = file_path + ".tmp"
+    pa_parquet.write_table(arrow_table, temp_file)
+    os.replace(temp_file, file_path)
+    return file_path
+
+def read_table(filename, columns=None, start_date=None, end_date=None):
+    # Read a table from its Parquet files
+    # Only the requested columns are read, and with a date range only the
+    # month folders in that range are opened.
+    #
+    # Returns: pandas DataFrame (sorted by ID, without duplicate IDs)
+    # Raises: FileNotFoundError if the table does not exist yet
+    if not os.path.isdir(get_table_directory(filename)):
+        raise FileNotFoundError(get_table_directory(filename))
+    folder_name, column_names, id_column, date_column = get_table_info(filename)
+    schema = get_schema(filename)
+    data_files = list_data_files(get_table_directory(filename))
+
+    if columns is None:
+        columns = column_names
+    # The ID column is always read, to sort rows and drop duplicates
+    read_columns = list(columns)
+    if id_column not in read_columns:
+        read_columns.insert(0, id_column)
+
+    if not data_files:
+        empty_table = pa.Table.from_pylist([], schema=schema)
+        return finish_frame(filename, empty_table.to_pandas(), columns, id_column, date_column)
+
+    # The month of each file is read from its folder name (month=YYYY-MM)
+    partitioning = None
+    if date_column is not None:
+        partition_schema = pa.schema([(PARTITION_NAME, pa.string())])
+        partitioning = pa_dataset.partitioning(partition_schema, flavor="hive")
+        schema = schema.append(partition_schema.field(0))
+    dataset = pa_dataset.dataset(data_files, schema=schema, format="parquet",
+                                 partitioning=partitioning,
+                                 partition_base_dir=get_table_directory(filename))
+
+    # Date filter: the month check skips whole folders, the date check
+    # then removes the rows outside the range inside those months
+    row_filter = None
+    if date_column is not None and (start_date is not None or end_date is not None):
+        row_filter = build_date_filter(date_column, start_date, end_date)
+
+    arrow_table = dataset.to_table(columns=read_columns, filter=row_filter)
+    return finish_frame(filename, arrow_table.to_pandas(date_as_object=False), columns, id_column, date_column)
+
+def build_date_filter(date_column, start_date, end_date):
+    # Build the pyarrow filter expression for a date range (both inclusive)
+    month_field = pa_dataset.field(PARTITION_NAME)
+    date_field = pa_dataset.field(date_column)
+    conditions = []
+    if start_date is not None:
+        start_date = pd.Timestamp(start_date)
+        conditions.append(month_field >= start_date.strftime('%Y-%m'))
+        conditions.append(date_field >= pa.scalar(start_date.date(), type=pa.date32()))
+    if end_date is not None:
+        end_date = pd.Timestamp(end_date)
+        conditions.append(month_field <= end_date.strftime('%Y-%m'))
+        conditions.append(date_field <= pa.scalar(end_date.date(), type=pa.date32()))
+
+    row_filter = conditions[0]
+    for condition in conditions[1:]:
+        row_filter = row_filter & condition
+    return row_filter
+
+def finish_frame(filename, frame, columns, id_column, date_column):
+    # Sort rows by ID, drop duplicate IDs and keep only the asked-for columns
+    # Quantities are converted to base units (kg -> g, l -> ml) and the
+    # columns get their compact types from schema.py.
+    frame = frame.drop_duplicates(subset=[id_column], keep='last')
+    frame = frame.sort_values(id_column, kind='stable').reset_index(drop=True)
+    if date_column is not None and date_column in frame.columns:
+        frame[date_column] = frame[date_column].astype('datetime64[ns]')
+    # (a copy of the selected columns, so the in-place typing below does not
+    # change a slice of the frame that was read)
+    frame = frame[list(columns)].copy()
+    return apply_column_types(filename, normalize_units(frame))
+
+def load_table(filename, columns=None, start_date=None, end_date=None):
+    # Load a table (whole-table loads are cached until the files change)
+    #
+    # Args:
+    #     columns (list) - only read these columns (default: all)
+    #     start_date, end_date - only read rows in this date range
+    #                            (tables with a date column only)
+    if columns is not None or start_date is not None or end_date is not None:
+        return read_table(filename, columns, start_date, end_date)
+
+    folder_name = TABLE_DEFINITIONS[filename][0]
+    version = get_table_version(filename)
+    cached = _table_cache.get(folder_name)
+    if cached is None or cached[0] != version:
+        cached = (version, read_table(filename))
+        _table_cache[folder_name] = cached
+    return cached[1].copy()
+
+def save_table(filename, df):
+    # Replace the whole table with the rows of a DataFrame
+    # The new files are written to a new folder, which then takes the
+    # place of the old one.
+    table_directory = get_table_directory(filename)
+    new_directory = table_directory + ".new"
+    old_directory = table_directory + ".old"
+    for directory in [new_directory, old_directory]:
+        if os.path.exists(directory):
+            shutil.rmtree(directory)
+
+    os.makedirs(new_directory)
+    arrow_table = to_arrow_table(filename, df)
+    if TABLE_DEFINITIONS[filename][2] is None:
+        write_data_file(new_directory, arrow_table)
+    else:
+        # Convert once, then pick each month's rows by their positions
+        months = get_months(filename, df)
+        month_positions = months.groupby(months.to_numpy()).indices
+        for month in sorted(month_positions):
+            month_directory = os.path.join(new_directory, f"{PARTITION_NAME}={month}")
+            write_data_file(month_directory, arrow_table.take(month_positions[month]))
+
+    if os.path.exists(table_directory):
+        os.replace(table_directory, old_directory)
+    os.replace(new_directory, table_directory)
+    if os.path.exists(old_directory):
+        shutil.rmtree(old_directory)
+    mark_changed(filename)
+
+def compact_directory(filename, directory):
+    # Merge all files of one folder into a single file
+    # The merged file is written first and the old files removed after it;
+    # rows that exist twice in between are dropped on load (unique IDs).
+    data_files = list_data_files(directory)
+    data_files = [data_file for data_file in data_files if os.path.dirname(data_file) == directory]
+    if len(data_files) <= 1:
+        return
+    merged = pa.concat_tables([pa_parquet.read_table(data_file, schema=get_schema(filename)) for data_file in data_files])
+    write_data_file(directory, merged)
+    for data_file in data_files:
+        os.remove(data_file)
+
+def append_row(filename, row):
+    # Add one new row as a small new file in its month folder
+    append_rows(filename, pd.DataFrame([row]))
+
+def append_rows(filename, df):
+    # Add new rows as one new file per month folder they belong to
+    arrow_table = to_arrow_table(filename, df)
+    directories = []
+    if TABLE_DEFINITIONS[filename][2] is None:
+        directory = get_table_directory(filename)
+        write_data_file(directory, arrow_table)
+        directories.append(directory)
+    else:
+        # Convert once, then pick each month's rows by their positions
+        months = get_months(filename, df)
+        month_positions = months.groupby(months.to_numpy()).indices
+        for month in sorted(month_positions):
+            directory = get_partition_directory(filename, month)
+            write_data_file(directory, arrow_table.take(month_positions[month]))
+            directories.append(directory)
+
+    # Too many small files make reading slow - merge them
+    for directory in directories:
+        file_count = 0
+        for file_name in os.listdir(directory):
+            if file_name.endswith(".parquet"):
+                file_count = file_count + 1
+        if file_count > MAX_FILES_PER_FOLDER:
+            compact_directory(filename, directory)
+    mark_changed(filename)
+
+def next_id(filename, id_column):
+    # Get the next free ID (only the ID column is read, and only again
+    # after the table changed)
+    folder_name = TABLE_DEFINITIONS[filename][0]
+    version = get_table_version(filename)
+    if version is None:
+        return 1
+    cached = _max_id_cache.get(folder_name)
+    if cached is None or cached[0] != version:
+        ids = read_table(filename, columns=[id_column])[id_column]
+        max_id = 0
+        if len(ids) > 0:
+            max_id = int(ids.max())
+        cached = (version, max_id)
+        _max_id_cache[folder_name] = cached
+    return cached[1] + 1
+
+def get_row(filename, id_column, id_value):
+    # Get the row with the given ID
+    # Returns: dictionary column name -> value, or None if not found
+    rows = get_rows(filename, id_column, [id_value])
+    if len(rows) == 0:
+        return None
+    # Dates come back as datetime.date, the way they are stored
+    row = {}
+    for column in rows.columns:
+        row[column] = to_python_value(rows[column].iat[0])
+    return row
+
+def get_rows(filename, id_column, id_values):
+    # Get the rows with the given IDs, in the same order as id_values
+    table = load_table(filename)
+    position_of = {}
+    for position in range(len(id_values)):
+        position_of.setdefault(id_values[position], position)
+    matching = table[table[id_column].isin(list(position_of))]
+    order = matching[id_column].map(position_of).sort_values(kind='stable').index
+    return matching.loc[order].reset_index(drop=True)
+
+def rewrite_table(filename, change_rows):
+    # Load the table, change it with change_rows(table) and save it again
+    # Returns: whatever change_rows returns as its second value
+    table = load_table(filename)
+    new_table, result = change_rows(table)
+    if result:
+        save_table(filename, new_table)
+    return result
+
+def update_row(filename, id_column, id_value, values):
+    # Update some columns of the row with the given ID
+    # Returns: True if a row was updated
+    def change_rows(table):
+        matching_rows = table[id_column] == id_value
+        for column in values:
+            set_typed_value(table, matching_rows, column, values[column])
+        return table, bool(matching_rows.any())
+    return rewrite_table(filename, change_rows)
+
+def delete_row(filename, id_column, id_value):
+    # Delete the row with the given ID
+    # Returns: True if a row was deleted
+    return len(delete_rows(filename, id_column, [id_value])) > 0
+
+def delete_rows(filename, id_column, id_values):
+    # Delete many rows by their IDs
+    # Returns: list of the IDs that were found and deleted
+    def change_rows(table):
+        is_deleted = table[id_column].isin(list(id_values))
+        return table[~is_deleted], table.loc[is_deleted, id_column].tolist()
+    return rewrite_table(filename, change_rows)
+
+def import_csv_files():
+    # One-shot importer: copy the waste and expense CSV files into Parquet
+    # Existing Parquet tables are replaced. Rows listed in the table's
+    # tombstone log (deleted with the CSV backend) are left out.
+    print("\n=== Importing CSV files into Parquet ===")
+    if not is_available():
+        print(" pyarrow is not installed (pip install pyarrow).")
+        return
+    for filename in TABLE_DEFINITIONS:
+        csv_file = get_data_file_path(filename)
+        try:
+            csv_df = remove_deleted_rows(pd.read_csv(csv_file), read_tombstones(filename))
+            csv_df = normalize_units(csv_df)  # kg -> g, l -> ml
+        except FileNotFoundError:
+            print(f" {filename} not found - skipped.")
+            continue
+        save_table(filename, csv_df)
+        print(f" Imported {len(csv_df)} rows from {filename}")
+    print(f" Folder: {get_data_file_path(PARQUET_DIRECTORY)}")
+
+# Run the importer when this file is executed directly:
+#     python -m modules.parquet_store
+if __name__ == "__main__":
+    import_csv_files()
@@ -0,0 +1,126 @@
+# Recipe Feasibility Index
+#
+# This module answers the question "which recipes can I make right now?"
+# quickly, even for very large recipe collections:
+# - Every ingredient gets a bit position (its number in the vocabulary)
+# - Every recipe is stored as a bitmask: an integer with one bit set
+#   for each ingredient it needs
+# - An inverted index maps each ingredient to the recipes that use it
+#
+# A recipe can be made when all of its bits are also set in the bitmask of
+# available ingredients (a subset test). Only recipes that use at least one
+# available ingredient are tested, found with the inverted index.
+#
+# The index is built once from recipes.csv and rebuilt only when the
+# recipes table changes.
+#
+# Uses concepts from syllabus:
+# - Dictionaries and sets
+# - Bitwise operators (|, &) on integers
+# - String operations (split, strip)
+# - Functions and modular programming
+
+# Import required libraries
+from .data_store import load_table, get_table_version  # Shared cached access to tables
+
+# The index that was built last, and the recipes table version it was built from
+_index_cache = {}
+
+def split_ingredients(ingredients_str):
+    # Split a comma-separated ingredients string into a list of clean names
+    ingredient_names = []
+    for ingredient in str(ingredients_str).split(','):
+        clean_ingredient = ingredient.strip()
+        if clean_ingredient:
+            ingredient_names.append(clean_ingredient)
+    return ingredient_names
+
+def build_recipe_index(recipes_df):
+    # Build the bitmask index for a recipes DataFrame
+    #
+    # Returns: dictionary with
+    #   'vocabulary'   - ingredient name -> bit position
+    #   'names'        - recipe names (list, position = recipe number)
+    #   'ingredients'  - original ingredients strings (list)
+    #   'masks'        - ingredient bitmask of each recipe (list of int)
+    #   'inverted'     - ingredient name -> set of recipe numbers
+    vocabulary = {}
+    names = []
+    ingredient_strings = []
+    masks = []
+    inverted = {}
+
+    recipe_names = recipes_df['recipe_name'].tolist()
+    recipe_ingredients = recipes_df['ingredients'].tolist()
+
+    for position in range(len(recipe_names)):
+        mask = 0
+        for ingredient in split_ingredients(recipe_ingredients[position]):
+            if ingredient not in vocabulary:
+                vocabulary[ingredient] = len(vocabulary)
+                inverted[ingredient] = set()
+            mask = mask | (1 << vocabulary[ingredient])
+            inverted[ingredient].add(position)
+
+        names.append(recipe_names[position])
+        ingredient_strings.append(recipe_ingredients[position])
+        masks.append(mask)
+
+    index = {}
+    index['vocabulary'] = vocabulary
+    index['names'] = names
+    index['ingredients'] = ingredient_strings
+    index['masks'] = masks
+    index['inverted'] = inverted
+    return index
+
+def get_recipe_index():
+    # Get the recipe index, building it again only if recipes.csv changed
+    # Raises: FileNotFoundError if there is no recipes table
+    version = get_table_version("recipes.csv")
+    if version is None:
+        raise FileNotFoundError("recipes.csv")
+
+    if _index_cache.get('version') != version:
+        recipes_df = load_table("recipes.csv")
+        _index_cache['index'] = build_recipe_index(recipes_df)
+        _index_cache['version'] = version
+
+    return _index_cache['index']
+
+def get_available_mask(index, available_ingredients):
+    # Turn a list of available ingredient names into one bitmask
+    vocabulary = index['vocabulary']
+    available_mask = 0
+    for ingredient in available_ingredients:
+        bit_position = vocabulary.get(ingredient)
+        if bit_position is not None:
+            available_mask = available_mask | (1 << bit_position)
+    return available_mask
+
+def find_makeable_recipes(available_ingredients):
+    # Find all recipes whose ingredients are all available
+    #
+    # Args: available_ingredients (list) - names of ingredients in stock
+    # Returns: list of dictionaries with 'recipe' and 'ingredients' keys,
+    #          in the same order as the recipes table
+    index = get_recipe_index()
+    available_mask = get_available_mask(index, available_ingredients)
+
+    # Candidates: recipes that use at least one available ingredient
+    candidates = set()
+    for ingredient in available_ingredients:
+        recipe_numbers = index['inverted'].get(ingredient)
+        if recipe_numbers is not None:
+            candidates.update(recipe_numbers)
+
+    # Subset test: every bit of the recipe must be in the available mask
+    masks = index['masks']
+    makeable = []
+    for position in sorted(candidates):
+        if masks[position] & available_mask == masks[position]:
+            makeable.append({
+                'recipe': index['names'][position],
+                'ingredients': index['ingredients'][position]
+            })
+    return makeable
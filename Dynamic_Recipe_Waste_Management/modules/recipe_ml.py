@@ -6,27 +6,38 @@
 # - Machine Learning with sklearn
 # - Decision Tree Classifier
 # - Pandas for data manipulation
-# - Binary encoding for ML features
+# - Binary encoding for ML features (stored as a sparse matrix)
 # - Model training and prediction
 
 # Import required libraries (all from syllabus)
 import pandas as pd  # For CSV operations and data manipulation
+import numpy as np  # For fast matrix calculations
+from scipy import sparse  # For sparse matrices (only the 1s are stored)
 from sklearn.tree import DecisionTreeClassifier  # Machine Learning algorithm
 from sklearn.metrics import accuracy_score  # Model evaluation
 import os  # For file path operations
+from .data_store import get_data_file_path, get_file_signature, load_table, append_row, next_id  # Shared cached access to CSV files
+from . import model_store  # For saving and reloading trained models
+from .recipe_index import find_makeable_recipes, split_ingredients  # Fast "what can I make" lookups
 
-def get_data_file_path(filename):
-    # Get the correct path to data files
-    current_dir = os.path.dirname(os.path.abspath(__file__))
-    parent_dir = os.path.dirname(current_dir)
-    data_path = os.path.join(parent_dir, "data", filename)
+# Name of the saved recipe model file in data/models/
+RECIPE_MODEL_NAME = "recipe_model"
 
-    # If data directory doesn't exist, create it
-    data_dir = os.path.dirname(data_path)
-    if not os.path.exists(data_dir):
-        os.makedirs(data_dir)
+# Default number of recipes shown by the ranked suggestions
+DEFAULT_TOP_K = 5
 
-    return data_path
+# File name of the sparse ML dataset in the data directory
+ML_DATASET_FILENAME = "ml_dataset.npz"
+
+# Sparse ML dataset kept in memory (reloaded when the file changes)
+_ml_dataset_cache = {}
+
+# Recipe matrix prepared for ranking (rebuilt when the ML dataset changes)
+_ranking_matrix = {}
+
+# Model kept in memory after the first load, so repeated suggestions
+# in the same run don't even need to read the model file again
+_loaded_recipe_model = {}
 
 def load_available_ingredients():
     # Load available ingredients from ingredients.csv file
@@ -39,9 +50,8 @@ def load_available_ingredients():
     # - DataFrame filtering operations
     # - List operations and tolist() method
     try:
-        # Get correct file path and read ingredients CSV file using pandas
-        ingredients_file = get_data_file_path("ingredients.csv")
-        ingredients_df = pd.read_csv(ingredients_file)
+        # Read ingredients table (cached by the data store)
+        ingredients_df = load_table("ingredients.csv")
 
         # Filter ingredients with quantity > 0 - break down the operation
         ingredients_with_stock = ingredients_df[ingredients_df['quantity'] > 0]
@@ -54,102 +64,174 @@ def load_available_ingredients():
 
 def load_ml_dataset():
     # Load the ML dataset for training the Decision Tree model
-    # This function loads the binary-encoded dataset for machine learning
+    # The dataset is a sparse binary matrix: one row per recipe, one column
+    # per ingredient, and only the 1s are stored (see generate_ml_dataset).
     #
-    # Returns: features (X), target (y), and complete dataframe
+    # Returns: features (X, scipy CSR matrix), target (y, recipe names)
+    #          and the ingredient names of the columns
     #
     # Uses syllabus concepts:
-    # - Pandas DataFrame operations
-    # - drop() method to remove columns
+    # - NumPy arrays and file loading
+    # - Dictionaries for caching
     # - Exception handling with try-except
-    try:
-        # Get correct file path and read ML dataset CSV file
-        ml_file = get_data_file_path("ml_dataset.csv")
-        ml_df = pd.read_csv(ml_file)
+    ml_file = get_data_file_path(ML_DATASET_FILENAME)
+    signature = get_file_signature(ml_file)
 
-        # Features (X) are all columns except recipe_name (independent variables)
-        X = ml_df.drop('recipe_name', axis=1)
-
-        # Target (y) is recipe_name column (dependent variable)
-        y = ml_df['recipe_name']
-
-        return X, y, ml_df
-    except FileNotFoundError:
+    if signature is None:
         print(" ML dataset file not found. Generating from recipes...")
         generate_ml_dataset()  # Generate dataset if not found
-        return load_ml_dataset()  # Recursive call after generation
+        signature = get_file_signature(ml_file)
+        if signature is None:
+            return None, None, None
+
+    # Only read the file again if it changed since the last load
+    if _ml_dataset_cache.get('signature') != signature:
+        with np.load(ml_file) as saved:
+            X = sparse.csr_matrix((saved['data'], saved['indices'], saved['indptr']),
+                                  shape=tuple(saved['shape']))
+            y = saved['recipe_names']
+            ingredient_names = saved['ingredient_names'].tolist()
+        _ml_dataset_cache['signature'] = signature
+        _ml_dataset_cache['dataset'] = (X, y, ingredient_names)
+
+    return _ml_dataset_cache['dataset']
+
+def save_ml_dataset(X, recipe_names, ingredient_names):
+    # Save the sparse ML dataset in the compact .npz format
+    # Only the positions of the 1s are written, not the zeros.
+    #
+    # Args:
+    #     X (scipy CSR matrix) - recipes x ingredients, 1 = recipe uses ingredient
+    #     recipe_names (list) - name of each row
+    #     ingredient_names (list) - name of each column
+    ml_file = get_data_file_path(ML_DATASET_FILENAME)
+
+    # Write to a temporary file first and then rename it,
+    # so a crash can never leave a half-written dataset behind
+    temp_file = ml_file + ".tmp"
+    with open(temp_file, "wb") as output_file:
+        np.savez_compressed(output_file,
+                            data=X.data,
+                            indices=X.indices,
+                            indptr=X.indptr,
+                            shape=np.array(X.shape),
+                            recipe_names=np.array(recipe_names, dtype=str),
+                            ingredient_names=np.array(ingredient_names, dtype=str))
+    os.replace(temp_file, ml_file)
+
+    # Keep the saved dataset in memory, so it is not read back from disk
+    _ml_dataset_cache['signature'] = get_file_signature(ml_file)
+    _ml_dataset_cache['dataset'] = (X, np.array(recipe_names, dtype=str), list(ingredient_names))
+
+def append_recipe_to_dataset(recipe_name, ingredients_str, recipe_count):
+    # Add one new recipe to the ML dataset without rebuilding it
+    # The new recipe becomes one extra row. Ingredients that are not in the
+    # vocabulary yet get new columns at the end, so the column numbers of
+    # all existing ingredients (and the existing rows) stay the same.
+    #
+    # Args:
+    #     recipe_name (str) - name of the new recipe
+    #     ingredients_str (str) - comma-separated ingredients of the new recipe
+    #     recipe_count (int) - number of recipes in recipes.csv including the new one
+    # No dataset yet - build it (this already includes the new recipe)
+    if get_file_signature(get_data_file_path(ML_DATASET_FILENAME)) is None:
+        generate_ml_dataset()
+        return
+
+    X, y, ingredient_names = load_ml_dataset()
+
+    # If the dataset does not match the recipes table (e.g. recipes.csv was
+    # edited by hand), rebuilding it from scratch is the only safe option
+    if X.shape[0] != recipe_count - 1:
+        generate_ml_dataset()
+        return
+
+    # Look up the column of each ingredient, adding new columns as needed
+    vocabulary = {}
+    for column_number in range(len(ingredient_names)):
+        vocabulary[ingredient_names[column_number]] = column_number
+    new_ingredient_names = list(ingredient_names)
+    row_columns = set()
+    for ingredient in split_ingredients(ingredients_str):
+        if ingredient not in vocabulary:
+            vocabulary[ingredient] = len(new_ingredient_names)
+            new_ingredient_names.append(ingredient)
+        row_columns.add(vocabulary[ingredient])
+    row_columns = sorted(row_columns)
+
+    # Append the new row to the CSR arrays - existing rows are just copied
+    indices = np.concatenate([X.indices, np.array(row_columns, dtype=X.indices.dtype)])
+    data = np.concatenate([X.data, np.ones(len(row_columns), dtype=X.data.dtype)])
+    indptr = np.append(X.indptr, len(indices))
+    new_X = sparse.csr_matrix((data, indices, indptr),
+                              shape=(X.shape[0] + 1, len(new_ingredient_names)))
+
+    new_recipe_names = list(y)
+    new_recipe_names.append(recipe_name)
+    save_ml_dataset(new_X, new_recipe_names, new_ingredient_names)
+
+    added_columns = len(new_ingredient_names) - len(ingredient_names)
+    if added_columns > 0:
+        print(f" ML dataset updated ({added_columns} new ingredient(s) added).")
+    else:
+        print(" ML dataset updated.")
+
+def mark_recipe_model_stale():
+    # Forget the recipe model kept in memory
+    # The saved model no longer matches the dataset hash either, so the
+    # next suggestion trains a new model. Nothing is trained right now.
+    _loaded_recipe_model.clear()
 
 def generate_ml_dataset():
     # Generate ML dataset from recipes.csv file
-    # Converts ingredient lists to binary encoding for machine learning
+    # Converts ingredient lists to a sparse binary matrix for machine learning
+    #
+    # Instead of a full table of 0s and 1s (recipes x all ingredients), we
+    # only store where the 1s are. Each ingredient gets a column number from
+    # the vocabulary, and each recipe row lists the column numbers it uses.
+    # Memory and time grow with the number of 1s, not with the table size.
     #
     # This function demonstrates:
     # - String operations (split, strip)
     # - Set operations for unique ingredients
-    # - List comprehensions and loops
-    # - Dictionary creation and manipulation
-    # - Pandas DataFrame operations
+    # - Dictionary creation and manipulation (vocabulary)
+    # - Sparse matrices with scipy
     try:
-        # Get correct file path and load recipes from CSV file
-        recipes_file = get_data_file_path("recipes.csv")
-        recipes_df = pd.read_csv(recipes_file)
+        # Load recipes table (cached by the data store)
+        recipes_df = load_table("recipes.csv")
+
+        recipe_names = recipes_df['recipe_name'].tolist()
 
-        # Get all unique ingredients from all recipes - use simple loops
+        # Split every recipe's ingredients string once
+        recipe_ingredient_lists = []
         all_ingredients = set()
         for ingredients_str in recipes_df['ingredients']:
-            # Split comma-separated ingredients
-            ingredients_parts = ingredients_str.split(',')
-            # Clean each ingredient and add to set
-            for ingredient in ingredients_parts:
-                clean_ingredient = ingredient.strip()
-                all_ingredients.add(clean_ingredient)
-
-        # Convert set to list and sort for consistent order
-        ingredients_list = list(all_ingredients)
-        all_ingredients = sorted(ingredients_list)
-
-        # Create binary encoding for each recipe
-        ml_data = []  # List to store all recipe data
-
-        # Process each recipe row - break down complex operations
-        for _, row in recipes_df.iterrows():
-            recipe_name = row['recipe_name']
-
-            # Split ingredients string into list - use simple operations
-            ingredients_str = row['ingredients']
-            ingredients_parts = ingredients_str.split(',')
-            ingredients_list = []
-            for ingredient in ingredients_parts:
-                clean_ingredient = ingredient.strip()
-                ingredients_list.append(clean_ingredient)
-
-            # Create binary vector - use simple if-else instead of ternary
-            binary_row = {}
-            binary_row['recipe_name'] = recipe_name
-
-            for ingredient in all_ingredients:
-                # Check if ingredient is in this recipe
-                ingredient_present = False
-                for recipe_ingredient in ingredients_list:
-                    if ingredient == recipe_ingredient:
-                        ingredient_present = True
-                        break
-
-                # Set 1 if present, 0 if not
-                if ingredient_present:
-                    binary_row[ingredient] = 1
-                else:
-                    binary_row[ingredient] = 0
-
-            # Add this recipe's data to our list
-            ml_data.append(binary_row)
-
-        # Create DataFrame from list of dictionaries
-        ml_df = pd.DataFrame(ml_data)
-
-        # Save to CSV file using correct path
-        ml_file = get_data_file_path("ml_dataset.csv")
-        ml_df.to_csv(ml_file, index=False)
+            ingredients_list = split_ingredients(ingredients_str)
+            recipe_ingredient_lists.append(ingredients_list)
+            all_ingredients.update(ingredients_list)
+
+        # Vocabulary: ingredient name -> column number (sorted for consistent order)
+        ingredient_names = sorted(all_ingredients)
+        vocabulary = {}
+        for column_number in range(len(ingredient_names)):
+            vocabulary[ingredient_names[column_number]] = column_number
+
+        # Build the CSR arrays: column numbers of each row, one after another
+        indices = []
+        indptr = [0]
+        for ingredients_list in recipe_ingredient_lists:
+            row_columns = set()
+            for ingredient in ingredients_list:
+                row_columns.add(vocabulary[ingredient])
+            indices.extend(sorted(row_columns))
+            indptr.append(len(indices))
+
+        data = np.ones(len(indices), dtype=np.int8)
+        X = sparse.csr_matrix((data, np.array(indices, dtype=np.int32), np.array(indptr, dtype=np.int64)),
+                              shape=(len(recipe_names), len(ingredient_names)))
+
+        # Save in the compact .npz format
+        save_ml_dataset(X, recipe_names, ingredient_names)
 
         print(" ML dataset generated successfully!")
 
@@ -167,10 +249,10 @@ def train_recipe_model():
     # - Model training with fit() method
     # - Model evaluation with accuracy_score
     # - Random state for reproducible results
-    # Load ML dataset (X = features, y = target)
-    X, y, _ = load_ml_dataset()  # We don't need the full dataframe here
+    # Load ML dataset (X = sparse features, y = target, names of the columns)
+    X, y, ingredient_names = load_ml_dataset()
 
-    if len(X) == 0:
+    if X is None or X.shape[0] == 0:
         print(" No data available for training.")
         return None, None
 
@@ -181,7 +263,7 @@ def train_recipe_model():
         min_samples_split=2   # Minimum samples to split a node
     )
 
-    # Train the model using fit() method
+    # Train the model using fit() method (works directly on the sparse matrix)
     model.fit(X, y)
 
     # Calculate training accuracy for evaluation
@@ -191,7 +273,47 @@ def train_recipe_model():
     print(f" Model trained successfully! Training accuracy: {accuracy:.2%}")
 
     # Return model and feature names (column names)
-    return model, X.columns.tolist()
+    return model, list(ingredient_names)
+
+def get_recipe_model():
+    # Get a trained recipe model, training a new one only when needed
+    # The model is saved in data/models/ together with a hash of
+    # ml_dataset.npz and recipes.csv. If those files have not changed,
+    # the saved model is loaded instead of training again.
+    #
+    # Returns: trained model and feature names
+    ml_file = get_data_file_path(ML_DATASET_FILENAME)
+    recipes_file = get_data_file_path("recipes.csv")
+
+    # Make sure the ML dataset exists before hashing it
+    if not os.path.exists(ml_file):
+        print(" ML dataset file not found. Generating from recipes...")
+        generate_ml_dataset()
+
+    data_hash = model_store.compute_data_hash([ml_file, recipes_file])
+
+    # 1. Model already in memory and data unchanged
+    if _loaded_recipe_model.get('data_hash') == data_hash:
+        return _loaded_recipe_model['model'], _loaded_recipe_model['feature_names']
+
+    # 2. Model saved on disk and data unchanged (warm start)
+    artifact = model_store.load_model(RECIPE_MODEL_NAME, data_hash)
+    if artifact is not None:
+        model = artifact['model']
+        feature_names = artifact['extra']['feature_names']
+        print(" Loaded saved recipe model.")
+    else:
+        # 3. Data changed (or first run) - train a new model and save it
+        model, feature_names = train_recipe_model()
+        if model is None:
+            return None, None
+        extra = {'feature_names': feature_names}
+        model_store.save_model(RECIPE_MODEL_NAME, model, data_hash, extra)
+
+    _loaded_recipe_model['data_hash'] = data_hash
+    _loaded_recipe_model['model'] = model
+    _loaded_recipe_model['feature_names'] = feature_names
+    return model, feature_names
 
 def suggest_recipes():
     # Main function to suggest recipes based on available ingredients
@@ -206,33 +328,28 @@ def suggest_recipes():
     
     print(f"\n Available ingredients: {', '.join(available_ingredients)}")
     
-    # Train model
-    model, feature_names = train_recipe_model()
+    # Get model (only trains again if the recipe data has changed)
+    model, feature_names = get_recipe_model()
     
     if model is None:
         print(" Could not train model.")
         return
     
-    # Create input vector for prediction with proper feature names
-    input_data = {}
-    for feature in feature_names:
+    # Create input vector for prediction (same column order as the dataset)
+    # The model was trained on a plain matrix, so a plain array is used here too
+    input_vector = np.zeros((1, len(feature_names)), dtype=np.int8)
+    for column_number in range(len(feature_names)):
         # Check if ingredient is available
-        if feature in available_ingredients:
-            input_data[feature] = 1
-        else:
-            input_data[feature] = 0
-
-    # Convert to DataFrame with proper feature names to avoid warnings
-    import pandas as pd
-    input_df = pd.DataFrame([input_data])
+        if feature_names[column_number] in available_ingredients:
+            input_vector[0, column_number] = 1
 
     # Get prediction
     try:
-        prediction = model.predict(input_df)
+        prediction = model.predict(input_vector)
         suggested_recipe = prediction[0]
 
         # Get prediction probabilities for confidence
-        probabilities = model.predict_proba(input_df)
+        probabilities = model.predict_proba(input_vector)
         max_prob = max(probabilities[0])
         confidence = max_prob * 100
         
@@ -248,6 +365,118 @@ def suggest_recipes():
     except Exception as e:
         print(f" Error in prediction: {e}")
 
+def get_ranking_matrix():
+    # Get the sparse recipe x ingredient matrix used for ranking
+    # The arrays are only rebuilt when the ML dataset changes.
+    #
+    # Returns: dictionary with 'matrix' (recipes x ingredients, sparse 0/1),
+    #          'recipe_names', 'ingredient_names' and 'required_counts',
+    #          or None if there is no ML dataset
+    X, y, ingredient_names = load_ml_dataset()
+    if X is None:
+        return None
+    if _ranking_matrix.get('matrix') is not X:
+        matrix = X.astype(np.float32)
+        _ranking_matrix['matrix'] = X
+        _ranking_matrix['float_matrix'] = matrix
+        _ranking_matrix['recipe_names'] = np.asarray(y)
+        _ranking_matrix['ingredient_names'] = np.array(ingredient_names, dtype=object)
+        _ranking_matrix['required_counts'] = np.asarray(matrix.sum(axis=1)).ravel()
+    return _ranking_matrix
+
+def rank_recipes(available_ingredients, top_k=DEFAULT_TOP_K):
+    # Rank all recipes by how many of their ingredients are available
+    # The whole catalogue is scored with one matrix-vector product:
+    #     matched = recipe_matrix @ available_vector
+    #
+    # Args:
+    #     available_ingredients (list) - names of ingredients in stock
+    #     top_k (int) - number of recipes to return
+    #
+    # Returns: DataFrame with columns recipe_name, coverage (0-1),
+    #          matched, missing_count and missing_ingredients,
+    #          best recipes first
+    ranking = get_ranking_matrix()
+    if ranking is None:
+        return pd.DataFrame(columns=['recipe_name', 'coverage', 'matched', 'missing_count', 'missing_ingredients'])
+    matrix = ranking['float_matrix']
+    ingredient_names = ranking['ingredient_names']
+    required_counts = ranking['required_counts']
+
+    # 1 for every ingredient column that is in stock, 0 otherwise
+    available_set = set(available_ingredients)
+    available_vector = np.zeros(len(ingredient_names), dtype=np.float32)
+    for column_number in range(len(ingredient_names)):
+        if ingredient_names[column_number] in available_set:
+            available_vector[column_number] = 1.0
+
+    # Score every recipe at once (sparse matrix x dense vector)
+    matched_counts = matrix @ available_vector
+    missing_counts = required_counts - matched_counts
+    coverage = np.divide(matched_counts, required_counts,
+                         out=np.zeros_like(matched_counts), where=required_counts > 0)
+
+    # Sort by coverage (high first), then fewer missing, then more matched
+    order = np.lexsort((-matched_counts, missing_counts, -coverage))
+    top_rows = order[:top_k]
+
+    # Names of missing ingredients are only worked out for the top recipes
+    missing_lists = []
+    for row_number in top_rows:
+        row_start = matrix.indptr[row_number]
+        row_end = matrix.indptr[row_number + 1]
+        recipe_columns = matrix.indices[row_start:row_end]
+        missing_columns = recipe_columns[available_vector[recipe_columns] == 0]
+        missing_lists.append(", ".join(ingredient_names[missing_columns]))
+
+    ranked = pd.DataFrame({
+        'recipe_name': ranking['recipe_names'][top_rows],
+        'coverage': coverage[top_rows],
+        'matched': matched_counts[top_rows].astype(int),
+        'missing_count': missing_counts[top_rows].astype(int),
+        'missing_ingredients': missing_lists
+    })
+    return ranked
+
+def show_ranked_recipes():
+    # Show the top K recipes ranked by ingredient coverage
+    # Unlike the AI suggestion, this also shows partial matches
+    print("\n===  Top Recipe Matches ===")
+
+    available_ingredients = load_available_ingredients()
+
+    if not available_ingredients:
+        print(" No ingredients available in stock.")
+        return
+
+    user_top_k = input(f"How many recipes to show? (default {DEFAULT_TOP_K}): ").strip()
+    top_k = DEFAULT_TOP_K
+    if user_top_k:
+        try:
+            top_k = int(user_top_k)
+        except ValueError:
+            print(f" Invalid number. Showing top {DEFAULT_TOP_K}.")
+        if top_k <= 0:
+            top_k = DEFAULT_TOP_K
+
+    ranked = rank_recipes(available_ingredients, top_k)
+    print_ranked_recipes(ranked)
+
+def print_ranked_recipes(ranked):
+    # Print a ranked recipe table (the DataFrame from rank_recipes)
+    if len(ranked) == 0:
+        print(" No recipes found.")
+        return
+
+    print(f"\n{'#':<3} {'Recipe':<22} {'Coverage':>9} {'Missing':>8}")
+    print("-" * 50)
+    for i, row in enumerate(ranked.to_dict('records'), 1):
+        coverage_text = f"{row['coverage'] * 100:.0f}%"
+        print(f"{i:<3} {row['recipe_name']:<22} {coverage_text:>9} {row['missing_count']:>8}")
+        if row['missing_count'] > 0:
+            print(f"    Missing: {row['missing_ingredients']}")
+    print("-" * 50)
+
 def show_recipe_details(recipe_name):
     # Show details of a specific recipe
     # This function demonstrates pandas DataFrame filtering and string operations
@@ -259,9 +488,8 @@ def show_recipe_details(recipe_name):
     # - iloc[] for row selection
     # - String formatting and print operations
     try:
-        # Read recipes CSV file using correct path
-        recipes_file = get_data_file_path("recipes.csv")
-        recipes_df = pd.read_csv(recipes_file)
+        # Read recipes CSV file (cached by the data store)
+        recipes_df = load_table("recipes.csv")
 
         # Filter DataFrame to find matching recipe (boolean indexing)
         recipe_row = recipes_df[recipes_df['recipe_name'] == recipe_name]
@@ -292,9 +520,8 @@ def check_recipe_feasibility(recipe_name, available_ingredients):
     # - Membership operators (in, not in)
     # - List append() method
     try:
-        # Read recipes CSV file using correct path
-        recipes_file = get_data_file_path("recipes.csv")
-        recipes_df = pd.read_csv(recipes_file)
+        # Read recipes CSV file (cached by the data store)
+        recipes_df = load_table("recipes.csv")
 
         # Find the specific recipe
         recipe_row = recipes_df[recipes_df['recipe_name'] == recipe_name]
@@ -323,10 +550,10 @@ def check_recipe_feasibility(recipe_name, available_ingredients):
 
 def get_all_possible_recipes():
     # Show all recipes that can be made with current ingredients
-    # This function demonstrates advanced list operations and built-in functions
+    # This function demonstrates sets, bitmasks and built-in functions
     #
     # Uses syllabus concepts:
-    # - all() built-in function
+    # - Bitwise subset test through the recipe index (recipe_index.py)
     # - enumerate() function for counting
     # - Dictionary creation and manipulation
     # - List append() method and for loops
@@ -340,26 +567,9 @@ def get_all_possible_recipes():
         return
 
     try:
-        # Read recipes from CSV file using correct path
-        recipes_file = get_data_file_path("recipes.csv")
-        recipes_df = pd.read_csv(recipes_file)
-        possible_recipes = []  # List to store recipes we can make
-
-        # Check each recipe using iterrows() method
-        for _, row in recipes_df.iterrows():
-            recipe_name = row['recipe_name']
-            # Split and clean ingredient names
-            required_ingredients = [ing.strip() for ing in row['ingredients'].split(',')]
-
-            # Check if all required ingredients are available using all() function
-            can_make = all(ingredient in available_ingredients for ingredient in required_ingredients)
-
-            if can_make:
-                # Create dictionary for this recipe
-                possible_recipes.append({
-                    'recipe': recipe_name,
-                    'ingredients': row['ingredients']
-                })
+        # Ask the precomputed recipe index which recipes we can make
+        # (the index is only rebuilt when recipes.csv changes)
+        possible_recipes = find_makeable_recipes(available_ingredients)
 
         # Display results
         if possible_recipes:
@@ -384,14 +594,13 @@ def add_new_recipe():
     # - String methods: strip(), title()
     # - Membership operators (in)
     # - Conditional statements (if-else)
-    # - max() function and DataFrame operations
-    # - Dictionary creation and pd.concat()
+    # - Dictionary creation
+    # - Appending a single row to a CSV file
     print("\n=== ➕ Add New Recipe ===")
 
     try:
-        # Load existing recipes from CSV using correct path
-        recipes_file = get_data_file_path("recipes.csv")
-        recipes_df = pd.read_csv(recipes_file)
+        # Load existing recipes from CSV (cached by the data store)
+        recipes_df = load_table("recipes.csv")
 
         # Get new recipe details from user
         recipe_name = input("Enter recipe name: ").strip().title()
@@ -409,33 +618,53 @@ def add_new_recipe():
             print(" Please enter at least one ingredient.")
             return
 
-        # Generate new recipe ID using max() function
-        new_id = recipes_df['recipe_id'].max() + 1 if len(recipes_df) > 0 else 1
-
-        # Create new recipe dictionary
-        new_recipe = {
-            'recipe_id': new_id,
-            'recipe_name': recipe_name,
-            'ingredients': ingredients
-        }
-
-        # Add to DataFrame using pd.concat() (modern pandas approach)
-        new_row_df = pd.DataFrame([new_recipe])
-        recipes_df = pd.concat([recipes_df, new_row_df], ignore_index=True)
-
-        # Save to CSV file using correct path
-        recipes_file = get_data_file_path("recipes.csv")
-        recipes_df.to_csv(recipes_file, index=False)
-
+        # Saves the recipe and updates the ML dataset
+        print("Saving recipe and updating ML dataset...")
+        record_recipe(recipe_name, ingredients)
         print(f" Recipe '{recipe_name}' added successfully!")
-
-        # Regenerate ML dataset to include new recipe
-        print("Updating ML dataset...")
-        generate_ml_dataset()
+        print(" The AI model will be retrained on the next suggestion.")
 
     except FileNotFoundError:
         print(" Recipes file not found.")
 
+def record_recipe(recipe_name, ingredients):
+    # Add a new recipe without asking any questions (used by add_new_recipe()
+    # and the command-line interface)
+    #
+    # Args:
+    #     recipe_name (str) - name of the recipe (saved in title case)
+    #     ingredients (str) - comma-separated ingredients
+    # Returns: dictionary with the saved row (including its new ID)
+    # Raises: ValueError if the recipe exists or has no ingredients
+    recipe_name = recipe_name.strip().title()
+    ingredients = ingredients.strip()
+    if not recipe_name:
+        raise ValueError("Please enter a recipe name.")
+    if not ingredients:
+        raise ValueError("Please enter at least one ingredient.")
+
+    # Load existing recipes from CSV (cached by the data store)
+    recipes_df = load_table("recipes.csv")
+    if recipe_name in recipes_df['recipe_name'].values:
+        raise ValueError(f"Recipe '{recipe_name}' already exists.")
+
+    # Generate new recipe ID from the highest ID remembered by the data store
+    new_recipe = {
+        'recipe_id': next_id("recipes.csv", 'recipe_id'),
+        'recipe_name': recipe_name,
+        'ingredients': ingredients
+    }
+
+    # Append just the new recipe to the end of the file (no full rewrite)
+    append_row("recipes.csv", new_recipe)
+
+    # Add just the new recipe to the ML dataset (no full rebuild)
+    append_recipe_to_dataset(recipe_name, ingredients, len(recipes_df) + 1)
+
+    # The model is retrained later, the next time a suggestion is needed
+    mark_recipe_model_stale()
+    return new_recipe
+
 def recipe_suggestion_menu():
     # Main menu for recipe suggestion features
     while True:
@@ -446,10 +675,11 @@ def recipe_suggestion_menu():
         print("2. View All Possible Recipes")
         print("3. Add New Recipe")
         print("4. Regenerate ML Dataset")
-        print("5. Back to Main Menu")
+        print("5. Top Recipe Matches (Ranked)")
+        print("6. Back to Main Menu")
         print("="*50)
         
-        choice = input(" Enter your choice (1-5): ").strip()
+        choice = input(" Enter your choice (1-6): ").strip()
         
         if choice == "1":
             suggest_recipes()
@@ -461,10 +691,12 @@ def recipe_suggestion_menu():
             print("🔄 Regenerating ML dataset...")
             generate_ml_dataset()
         elif choice == "5":
+            show_ranked_recipes()
+        elif choice == "6":
             print(" Returning to main menu...")
             break
         else:
-            print(" Invalid choice! Please enter a number between 1-5.")
+            print(" Invalid choice! Please enter a number between 1-6.")
 
 # Test function for development
 if __name__ == "__main__":
@@ -0,0 +1,165 @@
+# Report Job Runner
+#
+# This module renders the chart reports of many kitchens (sites) in one go,
+# e.g. as a nightly job on a server:
+# - Every site has its own data folder with the usual CSV/database files
+# - The work is split into jobs (one per site, or one per site and report)
+#   that run side by side in a pool of worker processes, so several CPU
+#   cores are used
+# - Every report is saved to a fixed path: <output folder>/<site>/<report>.png
+#   (the same input always gives the same file names)
+# - Afterwards a summary shows how long each report took
+#
+# Each worker process renders with the Agg backend (see render_report() in
+# reports.py), so no display is needed.
+#
+# Usage from the command line:
+#     python -m modules.report_jobs OUTPUT_FOLDER SITE_FOLDER [SITE_FOLDER ...]
+# The name of each site folder is used as the site name.
+#
+# Uses concepts from syllabus:
+# - Functions and modular programming
+# - Dictionaries and lists for jobs and results
+# - Exception handling with try-except
+# - File handling and the os module
+
+# Import required libraries
+import os  # For folders and file paths
+import sys  # For command line arguments
+import time  # For measuring how long each report takes
+from concurrent.futures import ProcessPoolExecutor  # For running jobs in parallel processes
+from .data_store import set_data_dir  # For pointing a worker at a site's data folder
+from . import reports  # For rendering the chart reports
+
+def get_site_output_dir(output_root, site_name):
+    # Get the output folder of one site, e.g. reports_out/kitchen_a
+    return os.path.join(output_root, site_name)
+
+def render_site_reports(site_name, data_dir, output_root, report_names=None, file_format="png"):
+    # Render reports of one site (this runs inside a worker process)
+    #
+    # Args:
+    #     site_name (str) - name of the site (used for the output folder)
+    #     data_dir (str) - data folder of the site
+    #     output_root (str) - folder that gets one sub-folder per site
+    #     report_names (list) - reports to render (default: all chart reports)
+    #     file_format (str) - "png" or "svg"
+    # Returns: list of result dictionaries, one per report, with
+    #          'site', 'report', 'path' (None if no data), 'seconds', 'error'
+    set_data_dir(data_dir)
+    if report_names is None:
+        report_names = list(reports.REPORT_FIGURE_SIZES)
+    output_dir = get_site_output_dir(output_root, site_name)
+
+    results = []
+    for report_name in report_names:
+        result = {'site': site_name, 'report': report_name, 'path': None, 'error': None}
+        start_time = time.perf_counter()
+        try:
+            result['path'] = reports.render_report(report_name, output_dir, file_format)
+        except Exception as e:
+            result['error'] = str(e)
+        result['seconds'] = time.perf_counter() - start_time
+        results.append(result)
+    return results
+
+def make_jobs(sites, report_names, split_reports):
+    # Make the list of jobs: (site name, data folder, report names)
+    # With split_reports every report of every site is its own job,
+    # otherwise each site's reports are one job.
+    jobs = []
+    for site_name in sorted(sites):
+        if split_reports:
+            for report_name in report_names:
+                jobs.append((site_name, sites[site_name], [report_name]))
+        else:
+            jobs.append((site_name, sites[site_name], list(report_names)))
+    return jobs
+
+def run_report_jobs(sites, output_root, workers=None, file_format="png", report_names=None, split_reports=False):
+    # Render the reports of many sites in a pool of worker processes
+    #
+    # Args:
+    #     sites (dict) - site name -> data folder of that site
+    #     output_root (str) - reports go to output_root/<site>/<report>.<format>
+    #     workers (int) - number of worker processes (default: CPU count)
+    #     file_format (str) - "png" or "svg"
+    #     report_names (list) - reports to render (default: all chart reports)
+    #     split_reports (bool) - one job per report instead of one per site
+    # Returns: list of result dictionaries (see render_site_reports),
+    #          sorted by site and report
+    if report_names is None:
+        report_names = list(reports.REPORT_FIGURE_SIZES)
+    jobs = make_jobs(sites, report_names, split_reports)
+
+    results = []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = []
+        for site_name, data_dir, job_reports in jobs:
+            futures.append(executor.submit(render_site_reports, site_name, data_dir,
+                                           output_root, job_reports, file_format))
+        for future in futures:
+            results.extend(future.result())
+
+    # Same order every run, whichever job finished first
+    order = {}
+    for position in range(len(report_names)):
+        order[report_names[position]] = position
+    results.sort(key=lambda result: (result['site'], order[result['report']]))
+    return results
+
+def print_timing_summary(results, total_seconds=None):
+    # Print how long each report took and what was saved
+    print("\n" + "=" * 70)
+    print("    REPORT JOB SUMMARY")
+    print("=" * 70)
+    print(f"{'Site':<15} {'Report':<18} {'Time (ms)':>10}  Result")
+    print("-" * 70)
+
+    report_seconds = {}
+    for result in results:
+        if result['error'] is not None:
+            outcome = f"ERROR: {result['error']}"
+        elif result['path'] is None:
+            outcome = "no data - skipped"
+        else:
+            outcome = result['path']
+        print(f"{result['site']:<15} {result['report']:<18} {result['seconds'] * 1000:>10.1f}  {outcome}")
+        report_seconds.setdefault(result['report'], []).append(result['seconds'])
+
+    print("-" * 70)
+    print("Average per report:")
+    for report_name in report_seconds:
+        seconds = report_seconds[report_name]
+        print(f"  {report_name:<18} {sum(seconds) / len(seconds) * 1000:>10.1f} ms ({len(seconds)} site(s))")
+    if total_seconds is not None:
+        print(f"Total wall time: {total_seconds:.2f} s")
+    print("=" * 70)
+
+def main(arguments):
+    # Command line entry: OUTPUT_FOLDER SITE_FOLDER [SITE_FOLDER ...]
+    if len(arguments) < 2:
+        print("Usage: python -m modules.report_jobs OUTPUT_FOLDER SITE_FOLDER [SITE_FOLDER ...]")
+        return 1
+
+    output_root = arguments[0]
+    sites = {}
+    for site_dir in arguments[1:]:
+        site_name = os.path.basename(os.path.normpath(site_dir))
+        if site_name in sites:
+            print(f" Two site folders are named '{site_name}' - please rename one.")
+            return 1
+        sites[site_name] = os.path.abspath(site_dir)
+
+    start_time = time.perf_counter()
+    results = run_report_jobs(sites, output_root)
+    print_timing_summary(results, time.perf_counter() - start_time)
+
+    for result in results:
+        if result['error'] is not None:
+            return 1
+    return 0
+
+# Run the job runner when this file is executed directly
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -5,6 +5,17 @@
 # - Expense reports with pie charts
 # - Waste analysis reports
 # - Combined analytics dashboard
+# - Saving all charts to PNG/SVG files without a screen ("render mode")
+#
+# Waste and expense totals come from the rollups (see rollups.py), which are
+# kept up to date as entries are added or deleted, so these reports do not
+# add up the whole history again every time.
+#
+# Each chart is drawn by a draw_...() function onto a Figure it is given.
+# The menu reports draw onto a pyplot window and show it. Render mode draws
+# onto plain Figure objects with the Agg backend (no window, no display
+# needed) and saves them to files. The Figure objects are kept and cleared
+# for the next render, so rendering many times in one program is cheap.
 #
 # Uses concepts from syllabus:
 # - Pandas for data manipulation
@@ -13,77 +24,256 @@
 # - Chart creation and customization
 
 # Import required libraries (all from syllabus)
+import os  # For output folders and file paths
 import pandas as pd  # For CSV operations and data manipulation
 import matplotlib.pyplot as plt  # For creating charts and graphs
-import os  # For file path operations
+from matplotlib.figure import Figure  # Figures that are not tied to a window
+from matplotlib.backends.backend_agg import FigureCanvasAgg  # Drawing to image files without a screen
+from .data_store import load_table, get_data_file_path  # Shared cached access to CSV files
+from .rollups import get_table_totals, get_group_totals  # Ready-made waste/expense totals
 
-def get_data_file_path(filename):
-    # Get the correct path to data files
-    current_dir = os.path.dirname(os.path.abspath(__file__))
-    parent_dir = os.path.dirname(current_dir)
-    data_path = os.path.join(parent_dir, "data", filename)
+# Chart reports that can be rendered to files: name -> figure size (inches)
+# The name is also the output file name, e.g. ingredient_usage.png
+REPORT_FIGURE_SIZES = {
+    'ingredient_usage': (10, 6),
+    'expense_report': (10, 8),
+    'waste_analysis': (15, 6),
+    'dashboard': (15, 12),
+}
 
-    # If data directory doesn't exist, create it
-    data_dir = os.path.dirname(data_path)
-    if not os.path.exists(data_dir):
-        os.makedirs(data_dir)
+# File formats render mode can write
+RENDER_FORMATS = ['png', 'svg']
 
-    return data_path
+# Folder (inside data/) where rendered reports are saved by default
+REPORT_OUTPUT_DIRECTORY = "reports"
 
-def load_data_for_reports():
-    # Load all necessary data files for generating reports
-    # Returns: tuple of DataFrames (ingredients, expenses, waste)
-    # 
-    # Uses syllabus concepts:
-    # - Multiple pandas read_csv() operations
-    # - Exception handling with try-except
-    # - Tuple return values
-    
-    try:
-        ingredients_file = get_data_file_path("ingredients.csv")
-        ingredients = pd.read_csv(ingredients_file)
-    except FileNotFoundError:
-        ingredients = pd.DataFrame()
+# Figures used by render mode, kept between renders: report name -> Figure
+_render_figures = {}
 
-    try:
-        expenses_file = get_data_file_path("expenses.csv")
-        expenses = pd.read_csv(expenses_file)
-    except FileNotFoundError:
-        expenses = pd.DataFrame()
+# Colours used by the charts
+EXPENSE_COLORS = ['#ff9999', '#66b3ff', '#99ff99', '#ffcc99', '#ff99cc', '#c2c2f0', '#ffb3e6']
+WASTE_COLORS = ['red', 'orange', 'yellow', 'pink', 'purple']
 
+def load_ingredients_for_reports():
+    # Load the ingredients table (empty DataFrame if there is none yet)
     try:
-        waste_file = get_data_file_path("waste.csv")
-        waste = pd.read_csv(waste_file)
+        return load_table("ingredients.csv")
     except FileNotFoundError:
-        waste = pd.DataFrame()
-    
-    return ingredients, expenses, waste
+        return pd.DataFrame()
+
+def get_ingredient_usage(ingredients=None):
+    # Get the quantity in stock per ingredient name and unit (highest first),
+    # e.g. 'Tomato (g)' -> 1500.0
+    # Args: ingredients (DataFrame) - ingredients table (default: load it)
+    # Returns: pandas Series (empty if there are no ingredients)
+    if ingredients is None:
+        ingredients = load_ingredients_for_reports()
+    if len(ingredients) == 0:
+        return pd.Series(dtype=float)
+
+    # Group ingredients by name and unit and sum quantities - break down operations
+    # (quantities are stored in base units, so 1 kg and 500 g add up to 1500 g)
+    grouped_ingredients = ingredients.groupby(["name", "unit"], observed=True)
+    usage = grouped_ingredients["quantity"].sum().astype(float)
+    usage.index = [f"{name} ({unit})" for name, unit in usage.index]
+
+    # Sort by quantity (highest first)
+    return usage.sort_values(ascending=False)
+
+def get_expense_breakdown():
+    # Get the total cost per ingredient (highest first) and the overall total
+    # Returns: tuple (pandas Series, total cost); the Series is empty if
+    #          there are no expenses
+    expense_totals = get_table_totals("expenses.csv")
+    if expense_totals['count'] == 0:
+        return pd.Series(dtype=float), 0.0
+
+    # Total cost per ingredient (kept up to date by the rollups)
+    ingredient_wise = get_group_totals("expenses.csv", "name")["cost"]
+    return ingredient_wise.sort_values(ascending=False), expense_totals["cost"]
+
+def get_waste_breakdown():
+    # Get the waste cost per reason and the overall waste cost
+    # Returns: tuple (pandas Series, total cost); the Series is empty if
+    #          there is no waste
+    waste_totals = get_table_totals("waste.csv")
+    if waste_totals['count'] == 0:
+        return pd.Series(dtype=float), 0.0
+    return get_group_totals("waste.csv", "reason")["cost"], waste_totals["cost"]
+
+def get_dashboard_data():
+    # Get everything the dashboard shows
+    # Returns: dictionary with the usage, expense and waste breakdowns and
+    #          the summary numbers
+    ingredients = load_ingredients_for_reports()
+    dashboard_data = {}
+    dashboard_data['usage'] = get_ingredient_usage(ingredients)
+    dashboard_data['expense_by_ingredient'], dashboard_data['total_expenses'] = get_expense_breakdown()
+    dashboard_data['waste_by_reason'], dashboard_data['total_waste_cost'] = get_waste_breakdown()
+    dashboard_data['total_ingredients'] = len(ingredients)
+    return dashboard_data
+
+def rotate_x_labels(ax):
+    # Tilt the x axis labels so long names don't overlap
+    for label in ax.get_xticklabels():
+        label.set_rotation(45)
+        label.set_horizontalalignment('right')
+
+def draw_ingredient_usage(figure, usage_sorted):
+    # Draw the ingredient usage bar chart onto a figure
+    ax = figure.add_subplot(1, 1, 1)
+    bars = ax.bar(usage_sorted.index, usage_sorted.values, color='skyblue', edgecolor='navy')
+
+    # Customize chart
+    ax.set_title("Ingredient Usage Report", fontsize=16, fontweight='bold')
+    ax.set_xlabel("Ingredients", fontsize=12)
+    ax.set_ylabel("Quantity", fontsize=12)
+    rotate_x_labels(ax)
+
+    # Add value labels on bars
+    for bar in bars:
+        height = bar.get_height()
+        ax.text(bar.get_x() + bar.get_width()/2., height + 0.1,
+                f'{height:.1f}', ha='center', va='bottom')
+
+    figure.tight_layout()
+    ax.grid(axis='y', alpha=0.3)
+
+def draw_expense_pie(figure, ingredient_wise_sorted):
+    # Draw the expense distribution pie chart onto a figure
+    ax = figure.add_subplot(1, 1, 1)
+    wedges, texts, autotexts = ax.pie(ingredient_wise_sorted.values,
+                                      labels=ingredient_wise_sorted.index,
+                                      autopct='%1.1f%%',
+                                      colors=EXPENSE_COLORS[:len(ingredient_wise_sorted)],
+                                      startangle=90,
+                                      explode=[0.05] * len(ingredient_wise_sorted))
+
+    # Customize chart
+    ax.set_title("Expense Distribution by Ingredient", fontsize=16, fontweight='bold')
+
+    # Make percentage text more readable
+    for autotext in autotexts:
+        autotext.set_color('white')
+        autotext.set_fontweight('bold')
+
+    ax.axis('equal')  # Equal aspect ratio ensures that pie is drawn as a circle
+    figure.tight_layout()
+
+def draw_waste_analysis(figure, waste_by_reason):
+    # Draw the waste bar and pie charts side by side onto a figure
+    ax1 = figure.add_subplot(1, 2, 1)
+    ax2 = figure.add_subplot(1, 2, 2)
+
+    # Bar chart for waste by reason
+    bars = ax1.bar(waste_by_reason.index, waste_by_reason.values,
+                   color=WASTE_COLORS[:len(waste_by_reason)])
+    ax1.set_title("Waste Cost by Reason", fontweight='bold')
+    ax1.set_xlabel("Reason")
+    ax1.set_ylabel("Cost (₹)")
+    ax1.tick_params(axis='x', rotation=45)
+
+    # Add value labels on bars
+    for bar in bars:
+        height = bar.get_height()
+        ax1.text(bar.get_x() + bar.get_width()/2., height + 0.1,
+                f'₹{height:.1f}', ha='center', va='bottom')
+
+    # Pie chart for waste distribution
+    ax2.pie(waste_by_reason.values, labels=waste_by_reason.index, autopct='%1.1f%%',
+            colors=WASTE_COLORS[:len(waste_by_reason)])
+    ax2.set_title("Waste Distribution", fontweight='bold')
+
+    figure.tight_layout()
+
+def draw_dashboard(figure, dashboard_data):
+    # Draw the four dashboard panels onto a figure
+    # Args: dashboard_data (dict) - see get_dashboard_data()
+    ax1 = figure.add_subplot(2, 2, 1)
+    ax2 = figure.add_subplot(2, 2, 2)
+    ax3 = figure.add_subplot(2, 2, 3)
+    ax4 = figure.add_subplot(2, 2, 4)
+
+    # Chart 1: Ingredient Stock (Bar Chart)
+    usage = dashboard_data['usage']
+    if len(usage) > 0:
+        ax1.bar(usage.index, usage.values, color='lightblue')
+        ax1.set_title("Current Ingredient Stock", fontweight='bold')
+        ax1.set_ylabel("Quantity")
+        ax1.tick_params(axis='x', rotation=45)
+    else:
+        ax1.text(0.5, 0.5, 'No ingredient data', ha='center', va='center', transform=ax1.transAxes)
+        ax1.set_title("Current Ingredient Stock", fontweight='bold')
+
+    # Chart 2: Expense Distribution (Pie Chart)
+    expense_by_ingredient = dashboard_data['expense_by_ingredient']
+    if len(expense_by_ingredient) > 0:
+        ax2.pie(expense_by_ingredient.values, labels=expense_by_ingredient.index, autopct='%1.1f%%')
+        ax2.set_title("Expense Distribution", fontweight='bold')
+    else:
+        ax2.text(0.5, 0.5, 'No expense data', ha='center', va='center', transform=ax2.transAxes)
+        ax2.set_title("Expense Distribution", fontweight='bold')
+
+    # Chart 3: Waste by Reason (Bar Chart)
+    waste_by_reason = dashboard_data['waste_by_reason']
+    if len(waste_by_reason) > 0:
+        ax3.bar(waste_by_reason.index, waste_by_reason.values, color='salmon')
+        ax3.set_title("Waste Cost by Reason", fontweight='bold')
+        ax3.set_ylabel("Cost (₹)")
+        ax3.tick_params(axis='x', rotation=45)
+    else:
+        ax3.text(0.5, 0.5, 'No waste data', ha='center', va='center', transform=ax3.transAxes)
+        ax3.set_title("Waste Cost by Reason", fontweight='bold')
+
+    # Chart 4: Summary Statistics (Text)
+    ax4.axis('off')  # Turn off axis for text display
+
+    total_ingredients = dashboard_data['total_ingredients']
+    total_expenses = dashboard_data['total_expenses']
+    total_waste_cost = dashboard_data['total_waste_cost']
+
+    summary_text = f"""
+     SUMMARY STATISTICS
+
+     Total Ingredients: {total_ingredients}
+     Total Expenses: ₹{total_expenses:.2f}
+     Total Waste Cost: ₹{total_waste_cost:.2f}
+
+    Efficiency Metrics:
+    - Waste Percentage: {(total_waste_cost/total_expenses*100) if total_expenses > 0 else 0:.1f}%
+    - Active Ingredients: {total_ingredients}
+    """
+
+    ax4.text(0.1, 0.9, summary_text, transform=ax4.transAxes, fontsize=12,
+             verticalalignment='top', bbox=dict(boxstyle="round,pad=0.3", facecolor="lightgray"))
+
+    figure.suptitle("Kitchen Management Analytics Dashboard", fontsize=16, fontweight='bold')
+    figure.tight_layout()
+
+def get_window_figure(report_name):
+    # Get the pyplot window figure of a report, cleared for drawing
+    # (pyplot gives back the same figure for the same name)
+    figure_size = REPORT_FIGURE_SIZES[report_name]
+    return plt.figure(num=report_name, figsize=figure_size, clear=True)
 
 def ingredient_usage_report():
     # Generate ingredient usage report with bar chart
     # This function demonstrates data visualization with matplotlib
-    # 
+    #
     # Uses syllabus concepts:
     # - Pandas groupby() for data aggregation
     # - Matplotlib bar chart creation
     # - Chart customization (title, labels, colors)
-    
+
     print("\n===  Ingredient Usage Report ===")
-    
+
     # Load data
-    ingredients, expenses, waste = load_data_for_reports()
-    
-    if len(ingredients) == 0:
+    usage_sorted = get_ingredient_usage()
+
+    if len(usage_sorted) == 0:
         print(" No ingredient data found.")
         return
-    
-    # Group ingredients by name and sum quantities - break down operations
-    grouped_ingredients = ingredients.groupby("name")
-    usage = grouped_ingredients["quantity"].sum()
 
-    # Sort by quantity (highest first)
-    usage_sorted = usage.sort_values(ascending=False)
-    
     # CLI output
     print("\n Current Ingredient Stock:")
     print("-" * 40)
@@ -91,55 +281,31 @@ def ingredient_usage_report():
         print(f"{ingredient:<20} {quantity:>8.1f}")
     print("-" * 40)
     print(f"Total ingredients: {len(usage_sorted)}")
-    
+
     # Create bar chart
-    plt.figure(figsize=(10, 6))
-    bars = plt.bar(usage_sorted.index, usage_sorted.values, color='skyblue', edgecolor='navy')
-    
-    # Customize chart
-    plt.title("Ingredient Usage Report", fontsize=16, fontweight='bold')
-    plt.xlabel("Ingredients", fontsize=12)
-    plt.ylabel("Quantity", fontsize=12)
-    plt.xticks(rotation=45, ha='right')
-    
-    # Add value labels on bars
-    for bar in bars:
-        height = bar.get_height()
-        plt.text(bar.get_x() + bar.get_width()/2., height + 0.1,
-                f'{height:.1f}', ha='center', va='bottom')
-    
-    plt.tight_layout()
-    plt.grid(axis='y', alpha=0.3)
+    draw_ingredient_usage(get_window_figure('ingredient_usage'), usage_sorted)
     plt.show()
-    
+
     print("Bar chart displayed!")
 
 def expense_report():
     # Generate expense report with pie chart
     # This function demonstrates pie chart creation and data analysis
-    # 
+    #
     # Uses syllabus concepts:
     # - Pandas groupby() and sum() for aggregation
     # - Matplotlib pie chart creation
     # - Percentage calculations and formatting
-    
+
     print("\n===  Expense Report ===")
-    
-    # Load data
-    ingredients, expenses, waste = load_data_for_reports()
-    
-    if len(expenses) == 0:
+
+    # Get the ready-made expense totals
+    ingredient_wise_sorted, total_cost = get_expense_breakdown()
+
+    if len(ingredient_wise_sorted) == 0:
         print(" No expense records found.")
         return
-    
-    # Group expenses by ingredient and sum costs - break down operations
-    grouped_expenses = expenses.groupby("name")
-    ingredient_wise = grouped_expenses["cost"].sum()
-    total_cost = expenses["cost"].sum()
 
-    # Sort by cost (highest first)
-    ingredient_wise_sorted = ingredient_wise.sort_values(ascending=False)
-    
     # CLI output
     print("\n Expense Breakdown:")
     print("-" * 40)
@@ -148,54 +314,31 @@ def expense_report():
         print(f"{ingredient:<20} ₹{cost:>8.2f} ({percentage:>5.1f}%)")
     print("-" * 40)
     print(f"Total Expenses: ₹{total_cost:.2f}")
-    
+
     # Create pie chart
-    plt.figure(figsize=(10, 8))
-    colors = ['#ff9999', '#66b3ff', '#99ff99', '#ffcc99', '#ff99cc', '#c2c2f0', '#ffb3e6']
-    
-    wedges, texts, autotexts = plt.pie(ingredient_wise_sorted.values, 
-                                      labels=ingredient_wise_sorted.index,
-                                      autopct='%1.1f%%',
-                                      colors=colors[:len(ingredient_wise_sorted)],
-                                      startangle=90,
-                                      explode=[0.05] * len(ingredient_wise_sorted))
-    
-    # Customize chart
-    plt.title("Expense Distribution by Ingredient", fontsize=16, fontweight='bold')
-    
-    # Make percentage text more readable
-    for autotext in autotexts:
-        autotext.set_color('white')
-        autotext.set_fontweight('bold')
-    
-    plt.axis('equal')  # Equal aspect ratio ensures that pie is drawn as a circle
-    plt.tight_layout()
+    draw_expense_pie(get_window_figure('expense_report'), ingredient_wise_sorted)
     plt.show()
-    
+
     print("🥧 Pie chart displayed!")
 
 def waste_analysis_report():
     # Generate waste analysis report
     # This function demonstrates waste data analysis and visualization
-    # 
+    #
     # Uses syllabus concepts:
     # - Pandas data analysis operations
     # - Multiple chart types (bar and pie)
     # - Data filtering and grouping
-    
+
     print("\n===  Waste Analysis Report ===")
-    
-    # Load data
-    ingredients, expenses, waste = load_data_for_reports()
-    
-    if len(waste) == 0:
+
+    # Get the ready-made waste totals
+    waste_by_reason, total_waste_cost = get_waste_breakdown()
+
+    if len(waste_by_reason) == 0:
         print(" No waste data found.")
         return
-    
-    # Analyze waste by reason
-    waste_by_reason = waste.groupby("reason")["cost"].sum()
-    total_waste_cost = waste["cost"].sum()
-    
+
     # CLI output
     print("\n Waste Analysis:")
     print("-" * 40)
@@ -204,111 +347,117 @@ def waste_analysis_report():
         print(f"{reason:<15} ₹{cost:>8.2f} ({percentage:>5.1f}%)")
     print("-" * 40)
     print(f"Total Waste Cost: ₹{total_waste_cost:.2f}")
-    
-    # Create charts
-    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(15, 6))
-    
-    # Bar chart for waste by reason
-    bars = ax1.bar(waste_by_reason.index, waste_by_reason.values, 
-                   color=['red', 'orange', 'yellow', 'pink', 'purple'][:len(waste_by_reason)])
-    ax1.set_title("Waste Cost by Reason", fontweight='bold')
-    ax1.set_xlabel("Reason")
-    ax1.set_ylabel("Cost (₹)")
-    ax1.tick_params(axis='x', rotation=45)
 
-    # Add value labels on bars
-    for bar in bars:
-        height = bar.get_height()
-        ax1.text(bar.get_x() + bar.get_width()/2., height + 0.1,
-                f'₹{height:.1f}', ha='center', va='bottom')
-    
-    # Pie chart for waste distribution
-    ax2.pie(waste_by_reason.values, labels=waste_by_reason.index, autopct='%1.1f%%',
-            colors=['red', 'orange', 'yellow', 'pink', 'purple'][:len(waste_by_reason)])
-    ax2.set_title("Waste Distribution", fontweight='bold')
-    
-    plt.tight_layout()
+    # Create charts
+    draw_waste_analysis(get_window_figure('waste_analysis'), waste_by_reason)
     plt.show()
-    
+
     print(" Waste analysis charts displayed!")
 
 def combined_analytics_dashboard():
     # Generate a comprehensive analytics dashboard
     # This function demonstrates advanced data visualization
-    # 
+    #
     # Uses syllabus concepts:
     # - Multiple subplot creation
     # - Complex data analysis and aggregation
     # - Advanced matplotlib customization
-    
+
     print("\n=== Combined Analytics Dashboard ===")
-    
-    # Load data
-    ingredients, expenses, waste = load_data_for_reports()
-    
-    # Create figure with subplots
-    fig, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=(15, 12))
-    
-    # Chart 1: Ingredient Stock (Bar Chart)
-    if len(ingredients) > 0:
-        usage = ingredients.groupby("name")["quantity"].sum().sort_values(ascending=False)
-        ax1.bar(usage.index, usage.values, color='lightblue')
-        ax1.set_title("Current Ingredient Stock", fontweight='bold')
-        ax1.set_ylabel("Quantity")
-        ax1.tick_params(axis='x', rotation=45)
-    else:
-        ax1.text(0.5, 0.5, 'No ingredient data', ha='center', va='center', transform=ax1.transAxes)
-        ax1.set_title("Current Ingredient Stock", fontweight='bold')
-    
-    # Chart 2: Expense Distribution (Pie Chart)
-    if len(expenses) > 0:
-        expense_by_ingredient = expenses.groupby("name")["cost"].sum()
-        ax2.pie(expense_by_ingredient.values, labels=expense_by_ingredient.index, autopct='%1.1f%%')
-        ax2.set_title("Expense Distribution", fontweight='bold')
-    else:
-        ax2.text(0.5, 0.5, 'No expense data', ha='center', va='center', transform=ax2.transAxes)
-        ax2.set_title("Expense Distribution", fontweight='bold')
-    
-    # Chart 3: Waste by Reason (Bar Chart)
-    if len(waste) > 0:
-        waste_by_reason = waste.groupby("reason")["cost"].sum()
-        ax3.bar(waste_by_reason.index, waste_by_reason.values, color='salmon')
-        ax3.set_title("Waste Cost by Reason", fontweight='bold')
-        ax3.set_ylabel("Cost (₹)")
-        ax3.tick_params(axis='x', rotation=45)
-    else:
-        ax3.text(0.5, 0.5, 'No waste data', ha='center', va='center', transform=ax3.transAxes)
-        ax3.set_title("Waste Cost by Reason", fontweight='bold')
-    
-    # Chart 4: Summary Statistics (Text)
-    ax4.axis('off')  # Turn off axis for text display
-    
-    # Calculate summary statistics
-    total_ingredients = len(ingredients) if len(ingredients) > 0 else 0
-    total_expenses = expenses["cost"].sum() if len(expenses) > 0 else 0
-    total_waste_cost = waste["cost"].sum() if len(waste) > 0 else 0
-    
-    summary_text = f"""
-     SUMMARY STATISTICS
-    
-     Total Ingredients: {total_ingredients}
-     Total Expenses: ₹{total_expenses:.2f}
-     Total Waste Cost: ₹{total_waste_cost:.2f}
-    
-    Efficiency Metrics:
-    - Waste Percentage: {(total_waste_cost/total_expenses*100) if total_expenses > 0 else 0:.1f}%
-    - Active Ingredients: {total_ingredients}
-    """
-    
-    ax4.text(0.1, 0.9, summary_text, transform=ax4.transAxes, fontsize=12,
-             verticalalignment='top', bbox=dict(boxstyle="round,pad=0.3", facecolor="lightgray"))
-    
-    plt.suptitle("Kitchen Management Analytics Dashboard", fontsize=16, fontweight='bold')
-    plt.tight_layout()
+
+    # Load data (waste and expenses only as ready-made totals)
+    dashboard_data = get_dashboard_data()
+
+    draw_dashboard(get_window_figure('dashboard'), dashboard_data)
     plt.show()
-    
+
     print(" Complete analytics dashboard displayed!")
 
+def get_render_figure(report_name):
+    # Get the render-mode Figure of a report, cleared for drawing
+    # The Figure is made once with an Agg canvas and then reused, so no
+    # pyplot window state is created for each render.
+    figure = _render_figures.get(report_name)
+    if figure is None:
+        figure = Figure(figsize=REPORT_FIGURE_SIZES[report_name])
+        FigureCanvasAgg(figure)
+        _render_figures[report_name] = figure
+    else:
+        figure.clear()
+    return figure
+
+def get_report_output_dir():
+    # Get the default folder for rendered reports (data/reports)
+    return get_data_file_path(REPORT_OUTPUT_DIRECTORY)
+
+def draw_report(figure, report_name):
+    # Draw one chart report onto a figure
+    # Returns: True if it was drawn, False if there is no data for it
+    if report_name == 'ingredient_usage':
+        usage_sorted = get_ingredient_usage()
+        if len(usage_sorted) == 0:
+            return False
+        draw_ingredient_usage(figure, usage_sorted)
+    elif report_name == 'expense_report':
+        ingredient_wise_sorted, total_cost = get_expense_breakdown()
+        if len(ingredient_wise_sorted) == 0:
+            return False
+        draw_expense_pie(figure, ingredient_wise_sorted)
+    elif report_name == 'waste_analysis':
+        waste_by_reason, total_waste_cost = get_waste_breakdown()
+        if len(waste_by_reason) == 0:
+            return False
+        draw_waste_analysis(figure, waste_by_reason)
+    elif report_name == 'dashboard':
+        draw_dashboard(figure, get_dashboard_data())
+    else:
+        raise ValueError(f"Unknown report: {report_name}")
+    return True
+
+def render_report(report_name, output_dir=None, file_format="png"):
+    # Render one chart report to a file, e.g. data/reports/dashboard.png
+    # Nothing is shown on screen, so this also works without a display.
+    #
+    # Args:
+    #     report_name (str) - one of REPORT_FIGURE_SIZES
+    #     output_dir (str) - folder for the file (default: data/reports)
+    #     file_format (str) - "png" or "svg"
+    # Returns: path of the saved file, or None if there was no data
+    if file_format not in RENDER_FORMATS:
+        raise ValueError(f"Unknown file format: {file_format}")
+    if output_dir is None:
+        output_dir = get_report_output_dir()
+    if not os.path.exists(output_dir):
+        os.makedirs(output_dir)
+
+    figure = get_render_figure(report_name)
+    if not draw_report(figure, report_name):
+        return None
+
+    output_path = os.path.join(output_dir, f"{report_name}.{file_format}")
+    figure.savefig(output_path, format=file_format)
+    return output_path
+
+def render_all_reports(output_dir=None, file_format="png"):
+    # Render every chart report to files in one go (e.g. for a nightly job)
+    # Returns: list of the saved file paths
+    saved_paths = []
+    for report_name in REPORT_FIGURE_SIZES:
+        output_path = render_report(report_name, output_dir, file_format)
+        if output_path is None:
+            print(f" {report_name}: no data - skipped.")
+        else:
+            saved_paths.append(output_path)
+    return saved_paths
+
+def save_all_reports():
+    # Menu option: save all charts as PNG files
+    print("\n=== Save Reports to Files ===")
+    saved_paths = render_all_reports()
+    for output_path in saved_paths:
+        print(f" Saved: {output_path}")
+    print(f" {len(saved_paths)} report(s) saved.")
+
 def generate_text_report():
     # Generate a comprehensive text-based report
     # This function demonstrates data analysis without visualization
@@ -320,8 +469,10 @@ def generate_text_report():
     
     print("\n=== Comprehensive Text Report ===")
     
-    # Load data
-    ingredients, expenses, waste = load_data_for_reports()
+    # Load data (waste and expenses only as ready-made totals)
+    ingredients = load_ingredients_for_reports()
+    expense_totals = get_table_totals("expenses.csv")
+    waste_totals = get_table_totals("waste.csv")
     
     print("\n" + "="*60)
     print("           KITCHEN MANAGEMENT REPORT")
@@ -331,15 +482,18 @@ def generate_text_report():
     print("\n INGREDIENT ANALYSIS:")
     if len(ingredients) > 0:
         total_items = len(ingredients)
-        total_quantity = ingredients['quantity'].sum()
-        avg_quantity = ingredients['quantity'].mean()
-        
         print(f"- Total ingredient entries: {total_items}")
-        print(f"- Total quantity in stock: {total_quantity:.1f}")
-        print(f"- Average quantity per item: {avg_quantity:.1f}")
         
-        # Top ingredients by quantity
-        top_ingredients = ingredients.groupby('name')['quantity'].sum().sort_values(ascending=False).head(3)
+        # Quantities in different units can't be added up, so the totals
+        # are split per unit (stored in base units: g, ml, pieces, slices)
+        unit_totals = ingredients.groupby('unit', observed=True)['quantity'].agg(['sum', 'mean', 'count'])
+        print(f"- Quantity in stock per unit:")
+        for unit, totals in unit_totals.iterrows():
+            print(f"  - {unit}: {totals['sum']:.1f} in total, "
+                  f"{totals['mean']:.1f} on average ({int(totals['count'])} item(s))")
+        
+        # Top ingredients by quantity (per name and unit, e.g. 'Rice (g)')
+        top_ingredients = get_ingredient_usage(ingredients).head(3)
         print(f"- Top ingredients by quantity:")
         for i, (name, qty) in enumerate(top_ingredients.items(), 1):
             print(f"  {i}. {name}: {qty:.1f}")
@@ -348,17 +502,17 @@ def generate_text_report():
     
     # Expenses Section
     print("\n EXPENSE ANALYSIS:")
-    if len(expenses) > 0:
-        total_cost = expenses['cost'].sum()
-        avg_cost = expenses['cost'].mean()
-        num_purchases = len(expenses)
+    if expense_totals['count'] > 0:
+        total_cost = expense_totals['cost']
+        num_purchases = expense_totals['count']
+        avg_cost = total_cost / num_purchases
         
         print(f"- Total expenses: ₹{total_cost:.2f}")
         print(f"- Average cost per purchase: ₹{avg_cost:.2f}")
         print(f"- Number of purchases: {num_purchases}")
 
         # Most expensive ingredients
-        expensive_ingredients = expenses.groupby('name')['cost'].sum().sort_values(ascending=False).head(3)
+        expensive_ingredients = get_group_totals("expenses.csv", "name")['cost'].sort_values(ascending=False).head(3)
         print(f"- Most expensive ingredients:")
         for i, (name, cost) in enumerate(expensive_ingredients.items(), 1):
             print(f"  {i}. {name}: ₹{cost:.2f}")
@@ -367,24 +521,24 @@ def generate_text_report():
     
     # Waste Section
     print("\n WASTE ANALYSIS:")
-    if len(waste) > 0:
-        total_waste_cost = waste['cost'].sum()
-        waste_items = len(waste)
-        avg_waste_cost = waste['cost'].mean()
+    if waste_totals['count'] > 0:
+        total_waste_cost = waste_totals['cost']
+        waste_items = waste_totals['count']
+        avg_waste_cost = total_waste_cost / waste_items
         
         print(f"- Total waste cost: ₹{total_waste_cost:.2f}")
         print(f"- Number of waste entries: {waste_items}")
         print(f"- Average waste cost per item: ₹{avg_waste_cost:.2f}")
 
         # Waste by reason
-        waste_reasons = waste.groupby('reason')['cost'].sum().sort_values(ascending=False)
+        waste_reasons = get_group_totals("waste.csv", "reason")['cost'].sort_values(ascending=False)
         print(f"- Waste by reason:")
         for reason, cost in waste_reasons.items():
             print(f"  - {reason}: ₹{cost:.2f}")
         
         # Calculate waste percentage
-        if len(expenses) > 0:
-            waste_percentage = (total_waste_cost / expenses['cost'].sum()) * 100
+        if expense_totals['cost'] > 0:
+            waste_percentage = (total_waste_cost / expense_totals['cost']) * 100
             print(f"- Waste percentage of total expenses: {waste_percentage:.1f}%")
     else:
         print("- No waste data available")
@@ -411,10 +565,11 @@ def reports_menu():
         print("3. Waste Analysis Report")
         print("4. Combined Analytics Dashboard")
         print("5. Generate Text Report")
-        print("6. Back to Main Menu")
+        print("6. Save All Charts to Files")
+        print("7. Back to Main Menu")
         print("="*50)
         
-        choice = input(" Enter your choice (1-6): ").strip()
+        choice = input(" Enter your choice (1-7): ").strip()
         
         if choice == "1":
             ingredient_usage_report()
@@ -427,10 +582,12 @@ def reports_menu():
         elif choice == "5":
             generate_text_report()
         elif choice == "6":
+            save_all_reports()
+        elif choice == "7":
             print(" Returning to main menu...")
             break
         else:
-            print(" Invalid choice! Please enter a number between 1-6.")
+            print(" Invalid choice! Please enter a number between 1-7.")
 
 # Test function for development
 if __name__ == "__main__":
@@ -0,0 +1,287 @@
+# Waste and Expense Rollups
+#
+# The reports show totals like "waste cost by reason" or "expenses by
+# ingredient". Adding these up from every row each time gets slower as the
+# history grows, so this module keeps the totals ready ("materialized"):
+# - For each group (e.g. reason 'Expired', ingredient 'Tomato', month
+#   '2025-08', ingredient and unit ('Milk', 'ml')) the number of rows and
+#   the sum of cost (and quantity)
+# - The totals of the whole table
+# - What each row added, so a deleted or changed row can be taken out again
+#
+# A report therefore reads one small total per group instead of the whole
+# table. Added, updated and removed rows (also many at once) only adjust the
+# counts and sums of their own groups, using the "what each row added"
+# record above; the changes arrive as described at add_table_listener() in
+# data_store.py. Anything else that gives the table a new version (e.g. a
+# whole-table save) means the totals are added up again from the table.
+#
+# Uses concepts from syllabus:
+# - Dictionaries and tuples
+# - Pandas groupby() for building the totals once
+# - Functions and modular programming
+
+# Import required libraries
+import pandas as pd  # For building the totals and returning them as tables
+from .data_store import load_table, get_table_version, add_table_listener  # Shared table access
+
+# Rollup definitions: filename -> (list of groupings, list of summed columns)
+# The 'month' grouping is the 'YYYY-MM' of the 'date' column, and the
+# 'name_unit' grouping is the pair (name, unit) - quantities of one
+# ingredient are only added up when they are in the same unit.
+ROLLUP_DEFINITIONS = {
+    'waste.csv': (['reason', 'name', 'month', 'name_unit'], ['cost', 'quantity']),
+    'expenses.csv': (['name'], ['cost']),
+}
+
+# Groupings that are not a column of their own: grouping -> table columns
+COMBINED_GROUPINGS = {
+    'month': ['date'],
+    'name_unit': ['name', 'unit'],
+}
+
+# The rollups that were built last, and the table versions they match
+# Key: filename, Value: {'version': ..., 'rollup': ...}
+_rollup_cache = {}
+
+def month_of(date_value):
+    # Get the 'YYYY-MM' month of a date (text, date or Timestamp)
+    # Returns: text, or None if the value is not a valid date
+    try:
+        timestamp = pd.Timestamp(date_value)
+    except (ValueError, TypeError):
+        return None
+    if pd.isna(timestamp):
+        return None
+    return timestamp.strftime('%Y-%m')
+
+def clean_key(value):
+    # Missing names or reasons are not counted in any group (like groupby)
+    if value is None or (isinstance(value, float) and pd.isna(value)):
+        return None
+    return value
+
+def pair_key(name, unit):
+    # Get the (name, unit) group of a row (None if one of them is missing)
+    name = clean_key(name)
+    unit = clean_key(unit)
+    if name is None or unit is None:
+        return None
+    return (name, unit)
+
+def clean_number(value):
+    # Missing or invalid numbers count as 0 (like sum())
+    try:
+        number = float(value)
+    except (ValueError, TypeError):
+        return 0.0
+    if pd.isna(number):
+        return 0.0
+    return number
+
+def get_group_keys(table, group_by):
+    # Get the group of every row of a table for one grouping
+    # Returns: list (None for rows that are in no group)
+    if group_by == 'month':
+        dates = pd.to_datetime(table['date'], errors='coerce')
+        months = pd.Series(dates.to_numpy().astype('datetime64[M]').astype(str), index=table.index)
+        return months.where(dates.notna(), None).tolist()
+    if group_by == 'name_unit':
+        return list(map(pair_key, get_group_keys(table, 'name'), get_group_keys(table, 'unit')))
+    keys = table[group_by].astype(object)
+    return keys.where(keys.notna(), None).tolist()
+
+def build_rollup(filename, table):
+    # Build the rollup of a table
+    #
+    # Returns: dictionary with
+    #   'totals' - {'count': rows, summed column: total} for the whole table
+    #   'groups' - grouping -> group key -> {'count': rows, column: total}
+    #   'row_of' - row ID -> (group key per grouping..., value per column...)
+    group_columns, sum_columns = ROLLUP_DEFINITIONS[filename]
+
+    values = pd.DataFrame(index=table.index)
+    for column in sum_columns:
+        # Add up in 64-bit, even if the table keeps the numbers as float32
+        values[column] = pd.to_numeric(table[column], errors='coerce').fillna(0.0).astype('float64')
+
+    totals = {'count': len(table)}
+    for column in sum_columns:
+        totals[column] = float(values[column].sum())
+
+    groups = {}
+    key_lists = []
+    for group_by in group_columns:
+        keys = get_group_keys(table, group_by)
+        key_lists.append(keys)
+        grouped = values.groupby(pd.Series(keys, index=table.index, dtype=object))
+        group_sums = grouped.sum()
+        group_counts = grouped.size()
+        groups[group_by] = {}
+        for key in group_sums.index:
+            group = {'count': int(group_counts[key])}
+            for column in sum_columns:
+                group[column] = float(group_sums.at[key, column])
+            groups[group_by][key] = group
+
+    value_lists = []
+    for column in sum_columns:
+        value_lists.append(values[column].tolist())
+
+    rollup = {}
+    rollup['totals'] = totals
+    rollup['groups'] = groups
+    rollup['row_of'] = dict(zip(table['id'].tolist(), zip(*key_lists, *value_lists)))
+    return rollup
+
+def get_rollup_columns(filename):
+    # Get the table columns a rollup is built from: the ID, the grouping
+    # columns (see COMBINED_GROUPINGS) and the summed columns
+    group_columns, sum_columns = ROLLUP_DEFINITIONS[filename]
+    columns = ['id']
+    for name in group_columns + sum_columns:
+        for column in COMBINED_GROUPINGS.get(name, [name]):
+            if column not in columns:
+                columns.append(column)
+    return columns
+
+def get_rollup(filename):
+    # Get the rollup of a table, building it again only if the table changed
+    # Only the columns the rollup needs are loaded (with Parquet storage the
+    # other columns are never read from disk).
+    # A table that does not exist yet has an empty rollup.
+    version = get_table_version(filename)
+    cached = _rollup_cache.get(filename)
+    if cached is None or cached['version'] != version:
+        columns = get_rollup_columns(filename)
+        try:
+            table = load_table(filename, columns=columns)
+        except FileNotFoundError:
+            table = pd.DataFrame(columns=columns)
+        cached = {'version': version, 'rollup': build_rollup(filename, table)}
+        _rollup_cache[filename] = cached
+    return cached['rollup']
+
+def make_entry(filename, row):
+    # Get what one row adds to the rollup: (group keys..., values...)
+    # The month comes from the row's 'date' (or its 'month', if it has no
+    # date), and the (name, unit) pair from 'name' and 'unit' (each falling
+    # back to the row's old 'name_unit' pair, e.g. when only the name changed)
+    group_columns, sum_columns = ROLLUP_DEFINITIONS[filename]
+    entry = []
+    for group_by in group_columns:
+        if group_by == 'month' and 'date' in row:
+            entry.append(month_of(row['date']))
+        elif group_by == 'month':
+            entry.append(row.get('month'))
+        elif group_by == 'name_unit':
+            old_pair = row.get('name_unit') or (None, None)
+            entry.append(pair_key(row.get('name', old_pair[0]), row.get('unit', old_pair[1])))
+        else:
+            entry.append(clean_key(row.get(group_by)))
+    for column in sum_columns:
+        entry.append(clean_number(row.get(column)))
+    return tuple(entry)
+
+def change_totals(filename, rollup, entry, sign):
+    # Add (sign=1) or take out (sign=-1) one row's entry
+    group_columns, sum_columns = ROLLUP_DEFINITIONS[filename]
+    group_keys = entry[:len(group_columns)]
+    values = entry[len(group_columns):]
+
+    rollup['totals']['count'] = rollup['totals']['count'] + sign
+    for column, value in zip(sum_columns, values):
+        rollup['totals'][column] = rollup['totals'][column] + sign * value
+
+    for group_by, key in zip(group_columns, group_keys):
+        if key is None:
+            continue
+        group = rollup['groups'][group_by].get(key)
+        if group is None:
+            group = {'count': 0}
+            for column in sum_columns:
+                group[column] = 0.0
+            rollup['groups'][group_by][key] = group
+        group['count'] = group['count'] + sign
+        for column, value in zip(sum_columns, values):
+            group[column] = group[column] + sign * value
+        if group['count'] <= 0:
+            # Last row of this group is gone
+            del rollup['groups'][group_by][key]
+
+def add_row(filename, rollup, row_id, entry):
+    # Add one row to the rollup (replacing an older row with the same ID)
+    remove_row(filename, rollup, row_id)
+    rollup['row_of'][row_id] = entry
+    change_totals(filename, rollup, entry, 1)
+
+def remove_row(filename, rollup, row_id):
+    # Take one row out of the rollup (if it is in there)
+    entry = rollup['row_of'].pop(row_id, None)
+    if entry is not None:
+        change_totals(filename, rollup, entry, -1)
+
+def update_rollup_after_change(filename, change, details, old_version, new_version):
+    # Keep the rollup of a table up to date when rows change
+    # (called by the data store after append_row(s)/update_row/delete_row(s))
+    cached = _rollup_cache.get(filename)
+    if cached is None or cached['version'] != old_version:
+        return  # No rollup yet, or it was already out of date - rebuilt on next use
+    rollup = cached['rollup']
+
+    if change == 'append':
+        row = details['row']
+        add_row(filename, rollup, row.get('id'), make_entry(filename, row))
+    elif change == 'append_many':
+        for row in details['rows']:
+            add_row(filename, rollup, row.get('id'), make_entry(filename, row))
+    elif change == 'update':
+        old_entry = rollup['row_of'].get(details['id_value'])
+        if old_entry is not None:
+            # Start from the row's old groups and values, then apply the change
+            group_columns, sum_columns = ROLLUP_DEFINITIONS[filename]
+            row = dict(zip(group_columns + sum_columns, old_entry))
+            row.update(details['values'])
+            add_row(filename, rollup, details['id_value'], make_entry(filename, row))
+    elif change == 'delete':
+        remove_row(filename, rollup, details['id_value'])
+    elif change == 'delete_many':
+        for id_value in details['id_values']:
+            remove_row(filename, rollup, id_value)
+
+    cached['version'] = new_version
+
+def get_table_totals(filename):
+    # Get the number of rows and the column totals of a whole table
+    # Returns: dictionary, e.g. {'count': 12, 'cost': 590.0}
+    return dict(get_rollup(filename)['totals'])
+
+def get_group_totals(filename, group_by):
+    # Get the totals per group, e.g. get_group_totals("waste.csv", "reason")
+    # Returns: pandas DataFrame with one row per group (sorted by group) and
+    #          a column per summed column plus 'count'. Combined groupings
+    #          like 'name_unit' get one index level per column.
+    group_columns, sum_columns = ROLLUP_DEFINITIONS[filename]
+    groups = get_rollup(filename)['groups'][group_by]
+    keys = sorted(groups)
+    if group_by == 'name_unit':
+        index = pd.MultiIndex.from_tuples(keys, names=COMBINED_GROUPINGS[group_by])
+    else:
+        index = pd.Index(keys, name=group_by, dtype=object)
+    totals = pd.DataFrame(index=index)
+    for column in sum_columns + ['count']:
+        column_values = []
+        for key in keys:
+            column_values.append(groups[key][column])
+        totals[column] = column_values
+    return totals
+
+def make_listener(filename):
+    # Make the listener function for one table
+    def listener(change, details, old_version, new_version):
+        update_rollup_after_change(filename, change, details, old_version, new_version)
+    return listener
+
+# Adjust the totals whenever waste or expense rows are added, changed or removed
+for rollup_filename in ROLLUP_DEFINITIONS:
+    add_table_listener(rollup_filename, make_listener(rollup_filename))
@@ -0,0 +1,447 @@
+# Table Schema and Validation
+#
+# This module is the one place that knows what a valid ingredient, waste
+# entry or expense looks like:
+# - The allowed units, storage types and waste reasons
+# - Which check every column of a table needs (TABLE_SCHEMAS)
+# - validate_record() checks one record, e.g. from a menu or a command
+# - validate_frame() checks a whole DataFrame at once, e.g. a chunk of a
+#   bulk import, with column operations instead of a loop over the rows:
+#   units/storage types/reasons through a categorical (a value that is not
+#   one of the categories gets code -1) and dates through
+#   pd.to_datetime(errors='coerce')
+# Both use the same rules and the same error messages, so a row is accepted
+# by the menus exactly when it would be accepted by an import.
+#
+# It also gives every column a compact type for when a table is loaded into
+# memory (COLUMN_TYPES, used by the data store):
+# - 'category' for text with few different values (names, units, storage
+#   types, reasons): each text is stored once and every row only keeps a
+#   small number pointing to it
+# - int32 IDs and float32 quantities (half the size of the defaults)
+# - datetime64 dates instead of text
+# Costs stay float64, so money totals are not rounded.
+#
+# Quantities are always kept in a base unit (UNIT_CONVERSIONS): 2 kg is
+# saved as 2000 g and 1.5 l as 1500 ml. Records are converted when they are
+# checked (menus, commands, imports) and old rows when a table is loaded,
+# with one lookup table for all rows at once (normalize_units()). Summing
+# the quantities of one ingredient then never mixes g with kg.
+#
+# Uses concepts from syllabus:
+# - Lists and dictionaries for the rules
+# - Pandas and NumPy for checking whole columns
+# - Datetime for date checks
+# - Exception handling (ValueError for invalid data)
+
+# Import required libraries
+import numpy as np  # For the list of errors per row
+import pandas as pd  # For checking whole columns at once
+from datetime import datetime  # For checking single dates
+
+# Allowed values
+VALID_UNITS = ['g', 'kg', 'ml', 'l', 'pieces', 'slices']
+VALID_STORAGE_TYPES = ['fridge', 'pantry', 'freezer']
+VALID_REASONS = ['expired', 'spoiled', 'leftover', 'overcooked', 'burnt']
+
+# Unit conversions: unit -> (base unit, factor to multiply the quantity by)
+UNIT_CONVERSIONS = {
+    'g': ('g', 1.0),
+    'kg': ('g', 1000.0),
+    'ml': ('ml', 1.0),
+    'l': ('ml', 1000.0),
+    'pieces': ('pieces', 1.0),
+    'slices': ('slices', 1.0),
+}
+
+# The same table as two lookups for whole columns: unit -> base unit, unit -> factor
+BASE_UNITS = {}
+UNIT_FACTORS = {}
+for unit_name in UNIT_CONVERSIONS:
+    BASE_UNITS[unit_name] = UNIT_CONVERSIONS[unit_name][0]
+    UNIT_FACTORS[unit_name] = UNIT_CONVERSIONS[unit_name][1]
+
+# Decimals kept after a conversion (1.1 kg is 1100 g, not 1100.0000000000002 g)
+QUANTITY_DECIMALS = 6
+
+# Checks that pick from a list of allowed values
+CHOICES = {
+    'unit': VALID_UNITS,
+    'storage': VALID_STORAGE_TYPES,
+    'reason': VALID_REASONS,
+}
+
+# Date format used in all tables
+DATE_FORMAT = "%Y-%m-%d"
+
+# Table schemas: filename -> list of (column, check)
+# Checks:
+#   'text'     - any text that is not empty (saved in Title Case)
+#   'quantity' - a number greater than 0
+#   'cost'     - a number of 0 or more (empty = 0)
+#   'unit', 'storage', 'reason' - one of the allowed values
+#                (reasons are saved in Title Case, e.g. 'Expired')
+#   'date'     - a date in YYYY-MM-DD format
+#   'today'    - like 'date', but empty = today
+TABLE_SCHEMAS = {
+    'ingredients.csv': [
+        ('name', 'text'),
+        ('quantity', 'quantity'),
+        ('unit', 'unit'),
+        ('expiry_date', 'date'),
+        ('storage_type', 'storage'),
+        ('date_added', 'today'),
+        ('cost', 'cost'),
+    ],
+    'waste.csv': [
+        ('name', 'text'),
+        ('quantity', 'quantity'),
+        ('unit', 'unit'),
+        ('reason', 'reason'),
+        ('date', 'today'),
+        ('cost', 'cost'),
+    ],
+    'expenses.csv': [
+        ('name', 'text'),
+        ('cost', 'cost'),
+    ],
+}
+
+# Checks whose column may be left out (a default is used)
+OPTIONAL_CHECKS = ['cost', 'today']
+
+# Column types of the tables when they are in memory
+COLUMN_TYPES = {
+    'ingredients.csv': {
+        'id': 'int32',
+        'name': 'category',
+        'quantity': 'float32',
+        'unit': 'category',
+        'expiry_date': 'datetime64[ns]',
+        'storage_type': 'category',
+        'date_added': 'datetime64[ns]',
+        'cost': 'float64',
+    },
+    'waste.csv': {
+        'id': 'int32',
+        'name': 'category',
+        'quantity': 'float32',
+        'unit': 'category',
+        'reason': 'category',
+        'date': 'datetime64[ns]',
+        'cost': 'float64',
+    },
+    'expenses.csv': {
+        'id': 'int32',
+        'name': 'category',
+        'cost': 'float64',
+    },
+}
+
+def get_today():
+    # Get today's date as 'YYYY-MM-DD'
+    return datetime.today().strftime(DATE_FORMAT)
+
+def get_error_message(column, check):
+    # Get the message for a value that failed its check
+    column = column.replace("_", " ")  # e.g. 'expiry date'
+    if check == 'text':
+        return f"{column} cannot be empty"
+    if check in CHOICES:
+        return f"{column} must be one of: {', '.join(CHOICES[check])}"
+    if check == 'quantity':
+        return f"{column} must be a positive number"
+    if check == 'cost':
+        return f"{column} must be a number (0 or more)"
+    return f"{column} must be a date in YYYY-MM-DD format (e.g., 2025-08-25)"
+
+def get_check(filename, column):
+    # Get the check of one column of a table
+    for schema_column, check in TABLE_SCHEMAS[filename]:
+        if schema_column == column:
+            return check
+    raise KeyError(f"{filename} has no column {column}")
+
+def check_value(check, value, today=None):
+    # Check and clean one value
+    # Returns: (cleaned value, True if the value is valid)
+    text = "" if value is None else str(value).strip()
+
+    if check == 'text':
+        return text.title(), text != ""
+
+    if check in CHOICES:
+        cleaned = text.lower()
+        is_valid = cleaned in CHOICES[check]
+        if check == 'reason':
+            cleaned = cleaned.title()
+        return cleaned, is_valid
+
+    if check in ['quantity', 'cost']:
+        if check == 'cost' and text == "":
+            text = "0"
+        try:
+            number = float(text)
+        except ValueError:
+            return None, False
+        if check == 'quantity':
+            return number, number > 0  # Also False for nan
+        return number, number >= 0
+
+    # 'date' or 'today'
+    if check == 'today' and text == "":
+        text = today if today is not None else get_today()
+    try:
+        return datetime.strptime(text, DATE_FORMAT).strftime(DATE_FORMAT), True
+    except ValueError:
+        return None, False
+
+def validate_value(filename, column, value):
+    # Check one value of a column, e.g. the unit typed in a menu
+    # Returns: (cleaned value, error message or None if the value is valid)
+    check = get_check(filename, column)
+    cleaned, is_valid = check_value(check, value)
+    if not is_valid:
+        return cleaned, get_error_message(column, check)
+    return cleaned, None
+
+def validate_record(filename, record):
+    # Check a whole record (dictionary column -> value) of a table
+    # Columns of the schema that are missing get their default.
+    #
+    # Returns: new dictionary with the cleaned values, in schema order
+    # Raises: ValueError listing every value that is not valid
+    cleaned_record = {}
+    errors = []
+    today = get_today()
+    for column, check in TABLE_SCHEMAS[filename]:
+        cleaned, is_valid = check_value(check, record.get(column), today)
+        if not is_valid:
+            errors.append(get_error_message(column, check))
+        cleaned_record[column] = cleaned
+    if errors:
+        raise ValueError("; ".join(errors))
+    if 'unit' in cleaned_record:
+        quantity, unit = normalize_quantity(cleaned_record['quantity'], cleaned_record['unit'])
+        cleaned_record['quantity'] = quantity
+        cleaned_record['unit'] = unit
+    return cleaned_record
+
+def normalize_quantity(quantity, unit):
+    # Convert one quantity to its base unit, e.g. (2, 'kg') -> (2000.0, 'g')
+    # Returns: (quantity, unit) - unchanged for an unknown unit
+    if unit not in UNIT_CONVERSIONS:
+        return quantity, unit
+    base_unit, factor = UNIT_CONVERSIONS[unit]
+    return round(quantity * factor, QUANTITY_DECIMALS), base_unit
+
+def normalize_units(frame):
+    # Convert the quantities of all rows to their base unit at once
+    # (one lookup of the whole unit column in UNIT_FACTORS, no loop over rows)
+    # Tables without a 'unit' column and rows with an unknown unit are not
+    # changed. Like apply_column_types(), this changes the frame in place.
+    # Returns: the same DataFrame
+    if 'unit' not in frame.columns or 'quantity' not in frame.columns:
+        return frame
+    if isinstance(frame['unit'].dtype, pd.CategoricalDtype):
+        # A loaded table: only the few different units need a look
+        categories = pd.Series(frame['unit'].cat.categories)
+        if not (categories.map(UNIT_FACTORS).fillna(1.0) != 1.0).any():
+            return frame
+    units = frame['unit'].astype(object)
+    factors = units.map(UNIT_FACTORS).fillna(1.0)
+    to_convert = (factors != 1.0).to_numpy()
+    if not to_convert.any():
+        return frame  # Already in base units (the usual case)
+
+    base_units = units.map(BASE_UNITS)
+    quantities = pd.to_numeric(frame['quantity'], errors='coerce').astype('float64')
+    frame['quantity'] = quantities.where(~to_convert, (quantities * factors).round(QUANTITY_DECIMALS))
+    frame['unit'] = units.where(~to_convert, base_units)
+    return frame
+
+def check_column(values, check, today):
+    # Check and clean a whole column (all rows at once)
+    #
+    # Args:
+    #     values (pandas Series) - the values as text
+    #     check (str) - kind of check (see TABLE_SCHEMAS)
+    #     today (str) - today's date as 'YYYY-MM-DD'
+    # Returns: (cleaned values, NumPy array of True for rows that are not valid)
+    text = values.astype(str).str.strip()
+    text = text.where(values.notna(), "")
+
+    if check == 'text':
+        return text.str.title(), (text == "").to_numpy()
+
+    if check in CHOICES:
+        cleaned = text.str.lower()
+        # Values that are not one of the categories get code -1
+        is_bad = pd.Categorical(cleaned, categories=CHOICES[check]).codes < 0
+        if check == 'reason':
+            cleaned = cleaned.str.title()
+        return cleaned, is_bad
+
+    if check in ['quantity', 'cost']:
+        if check == 'cost':
+            text = text.where(text != "", "0")
+        numbers = pd.to_numeric(text, errors='coerce').astype(float)
+        if check == 'quantity':
+            is_bad = ~(numbers > 0)  # Also True for NaN (not a number)
+        else:
+            is_bad = ~(numbers >= 0)
+        return numbers, is_bad.to_numpy()
+
+    # 'date' or 'today'
+    if check == 'today':
+        text = text.where(text != "", today)
+    dates = pd.to_datetime(text, format=DATE_FORMAT, errors='coerce')
+    return dates.dt.strftime(DATE_FORMAT), dates.isna().to_numpy()
+
+def check_columns_present(filename, columns):
+    # Make sure a DataFrame has every column that has no default
+    # Raises: ValueError naming the missing columns
+    missing = []
+    for column, check in TABLE_SCHEMAS[filename]:
+        if column not in columns and check not in OPTIONAL_CHECKS:
+            missing.append(column)
+    if missing:
+        raise ValueError(f"Missing column(s): {', '.join(missing)}")
+
+def validate_frame(filename, frame, today=None):
+    # Check all rows of a DataFrame at once
+    # Columns of the schema that are missing get their default.
+    #
+    # Returns: (DataFrame with the cleaned schema columns,
+    #           NumPy array with the errors of each row - "" if the row is valid)
+    # Raises: ValueError if a column without a default is missing
+    check_columns_present(filename, frame.columns)
+    if today is None:
+        today = get_today()
+
+    errors = np.full(len(frame), "", dtype=object)
+    cleaned_frame = pd.DataFrame(index=frame.index)
+    for column, check in TABLE_SCHEMAS[filename]:
+        if column in frame.columns:
+            values = frame[column]
+        else:
+            values = pd.Series("", index=frame.index)
+        cleaned, is_bad = check_column(values, check, today)
+        message = get_error_message(column, check)
+        errors = np.where(is_bad & (errors != ""), errors + "; " + message, errors)
+        errors = np.where(is_bad & (errors == ""), message, errors)
+        cleaned_frame[column] = cleaned
+    return normalize_units(cleaned_frame), errors
+
+def ask_value(filename, column, prompt, prefix=" "):
+    # Keep asking the user for a value until it passes its check
+    # (used by the interactive add_* functions)
+    # Returns: the cleaned value
+    while True:
+        cleaned, error = validate_value(filename, column, input(prompt))
+        if error is None:
+            return cleaned
+        print(f"{prefix}{error[0].upper()}{error[1:]}. Please try again.")
+
+def convert_column(values, column_type):
+    # Convert one column to a compact type
+    # Returns: the converted column, or None if some values don't fit the type
+    #          (the column is then kept as it is, so nothing is lost on save)
+    if column_type == 'category':
+        return values.astype('category')
+
+    if column_type.startswith('datetime64'):
+        dates = pd.to_datetime(values, format=DATE_FORMAT, errors='coerce')
+        if (dates.isna() & values.notna() & (values.astype(str) != "")).any():
+            return None  # Some text is not a valid date
+        return dates
+
+    numbers = pd.to_numeric(values, errors='coerce')
+    if (numbers.isna() & values.notna()).any():
+        return None  # Some text is not a number
+    if column_type == 'int32':
+        if numbers.isna().any() or (numbers % 1 != 0).any():
+            return None
+        if len(numbers) > 0 and (numbers.max() > np.iinfo(np.int32).max or numbers.min() < np.iinfo(np.int32).min):
+            return None
+    return numbers.astype(column_type)
+
+def apply_column_types(filename, frame):
+    # Give the columns of a loaded table their compact types (COLUMN_TYPES)
+    # Columns that already have the right type are not touched.
+    # The DataFrame is changed in place, so only pass a frame you own (a new
+    # frame or a .copy(), not a slice or a caller's table).
+    # Returns: the same DataFrame
+    column_types = COLUMN_TYPES.get(filename)
+    if column_types is None:
+        return frame
+    for column in column_types:
+        if column not in frame.columns or str(frame[column].dtype) == column_types[column]:
+            continue
+        converted = convert_column(frame[column], column_types[column])
+        if converted is not None:
+            frame[column] = converted
+    return frame
+
+def get_default_types_copy(frame):
+    # Get a copy of a table with the types pandas would use by default
+    # (text and dates as Python strings, 64-bit numbers), to compare memory
+    default_frame = frame.copy()
+    for column in default_frame.columns:
+        values = default_frame[column]
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            default_frame[column] = values.astype(object)
+        elif pd.api.types.is_datetime64_any_dtype(values.dtype):
+            default_frame[column] = values.dt.strftime(DATE_FORMAT).astype(object)
+        elif pd.api.types.is_integer_dtype(values.dtype):
+            default_frame[column] = values.astype('int64')
+        elif pd.api.types.is_float_dtype(values.dtype):
+            default_frame[column] = values.astype('float64')
+    return default_frame
+
+def set_typed_value(table, matching_rows, column, value):
+    # Change one column of some rows of a typed table (changed in place)
+    # A new text becomes an extra category first, and a date text becomes a
+    # real date, so the column keeps its compact type.
+    values = table[column]
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        if not pd.isna(value) and value not in values.cat.categories:
+            table[column] = values.cat.add_categories([value])
+    elif pd.api.types.is_datetime64_any_dtype(values.dtype):
+        value = pd.to_datetime(value)
+    table.loc[matching_rows, column] = value
+
+def to_python_value(value):
+    # Turn one value of a typed table into a plain Python value
+    # (dates -> datetime.date, numpy numbers -> int/float), so a row dictionary
+    # looks the same as before the compact types
+    if isinstance(value, pd.Timestamp):
+        return value.date()
+    if isinstance(value, np.float32):
+        return float(str(value))  # 0.1, not 0.10000000149011612
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+def get_memory_usage(frame):
+    # Get the memory used by a DataFrame in bytes (including the text)
+    return int(frame.memory_usage(deep=True).sum())
+
+def append_typed_rows(filename, frame, new_rows):
+    # Add rows to the end of a table that already has its compact types
+    # Category columns get the new values as extra categories, so the
+    # existing rows keep their codes and the result stays a category.
+    # Neither frame nor new_rows is changed.
+    # Returns: new DataFrame
+    new_rows = apply_column_types(filename, new_rows.copy())
+    frame = frame.copy(deep=False)
+    for column in frame.columns:
+        if isinstance(frame[column].dtype, pd.CategoricalDtype) and column in new_rows.columns:
+            categories = frame[column].cat.categories
+            new_values = pd.Index(new_rows[column].dropna().unique())
+            missing = new_values.difference(categories)
+            if len(missing) > 0:
+                frame[column] = frame[column].cat.add_categories(missing)
+            new_rows[column] = pd.Categorical(new_rows[column], categories=frame[column].cat.categories)
+    combined = pd.concat([frame, new_rows], ignore_index=True)
+    return apply_column_types(filename, combined)
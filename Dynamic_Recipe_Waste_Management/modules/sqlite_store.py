@@ -0,0 +1,350 @@
+# SQLite Storage Backend
+#
+# This module stores our tables in one SQLite database file (data/kitchen.db)
+# instead of separate CSV files. It has the same functions as the CSV part of
+# data_store.py, so data_store can use either one:
+# - Load and save whole tables
+# - Append single rows (or many rows in one transaction) and get the next free ID
+# - Update or delete a single row by its ID without rewriting anything else
+# - Delete many rows by ID in one transaction
+# - Look up rows by ID through the primary key index
+# - Import the existing CSV files into the database (one-shot importer)
+#
+# The database has indexes on id, name, expiry_date and date, so looking up,
+# updating or deleting one row takes O(log n) time instead of a full scan.
+#
+# Uses concepts from syllabus:
+# - File handling and databases (sqlite3 from the standard library)
+# - Pandas for reading query results into DataFrames
+# - Dictionaries and lists for table definitions
+# - Exception handling with try-except
+
+# Import required libraries
+import pandas as pd  # For DataFrame operations
+import sqlite3  # SQLite database (built into Python)
+import datetime  # For converting date values to text
+from .data_store import get_data_file_path, read_tombstones, remove_deleted_rows  # Data directory and CSV tombstone log
+from .schema import apply_column_types, normalize_units, to_python_value  # Compact column types of the tables
+
+# Name of the database file in the data directory
+DATABASE_FILENAME = "kitchen.db"
+
+# Table definitions: CSV filename -> (table name, list of (column, SQL type))
+# The first column is the ID column (primary key)
+TABLE_DEFINITIONS = {
+    'ingredients.csv': ('ingredients', [
+        ('id', 'INTEGER PRIMARY KEY'),
+        ('name', 'TEXT'),
+        ('quantity', 'REAL'),
+        ('unit', 'TEXT'),
+        ('expiry_date', 'TEXT'),
+        ('storage_type', 'TEXT'),
+        ('date_added', 'TEXT'),
+        ('cost', 'REAL'),
+    ]),
+    'waste.csv': ('waste', [
+        ('id', 'INTEGER PRIMARY KEY'),
+        ('name', 'TEXT'),
+        ('quantity', 'REAL'),
+        ('unit', 'TEXT'),
+        ('reason', 'TEXT'),
+        ('date', 'TEXT'),
+        ('cost', 'REAL'),
+    ]),
+    'expenses.csv': ('expenses', [
+        ('id', 'INTEGER PRIMARY KEY'),
+        ('name', 'TEXT'),
+        ('cost', 'REAL'),
+    ]),
+    'recipes.csv': ('recipes', [
+        ('recipe_id', 'INTEGER PRIMARY KEY'),
+        ('recipe_name', 'TEXT'),
+        ('ingredients', 'TEXT'),
+    ]),
+}
+
+# Secondary indexes: (table name, column)
+# The id columns are already indexed because they are primary keys
+INDEXES = [
+    ('ingredients', 'name'),
+    ('ingredients', 'expiry_date'),
+    ('waste', 'name'),
+    ('waste', 'date'),
+    ('expenses', 'name'),
+    ('recipes', 'recipe_name'),
+]
+
+# One shared connection per run (opened on first use)
+_connection = {}
+
+# Cache of loaded tables: table name -> (database version, DataFrame)
+_table_cache = {}
+
+# Counter increased on every write we make, so cached tables are refreshed
+_write_counter = [0]
+
+def get_database_path():
+    # Get the path of the SQLite database file
+    return get_data_file_path(DATABASE_FILENAME)
+
+def get_connection():
+    # Open the database (once) and make sure all tables and indexes exist
+    connection = _connection.get('db')
+    if connection is None:
+        connection = sqlite3.connect(get_database_path())
+        create_tables(connection)
+        _connection['db'] = connection
+    return connection
+
+def close_connection():
+    # Close the shared database connection (e.g. before deleting the file)
+    connection = _connection.pop('db', None)
+    if connection is not None:
+        connection.close()
+    _table_cache.clear()
+
+def create_tables(connection):
+    # Create all tables and indexes if they don't exist yet
+    for filename in TABLE_DEFINITIONS:
+        table_name, columns = TABLE_DEFINITIONS[filename]
+        column_parts = []
+        for column_name, column_type in columns:
+            column_parts.append(f"{column_name} {column_type}")
+        columns_sql = ", ".join(column_parts)
+        connection.execute(f"CREATE TABLE IF NOT EXISTS {table_name} ({columns_sql})")
+
+    for table_name, column_name in INDEXES:
+        index_name = f"idx_{table_name}_{column_name}"
+        connection.execute(f"CREATE INDEX IF NOT EXISTS {index_name} ON {table_name} ({column_name})")
+    connection.commit()
+
+def is_supported(filename):
+    # Check if a CSV table is stored in SQLite by this backend
+    return filename in TABLE_DEFINITIONS
+
+def get_table_info(filename):
+    # Get table name, column names and ID column for a CSV filename
+    table_name, columns = TABLE_DEFINITIONS[filename]
+    column_names = []
+    for column_name, column_type in columns:
+        column_names.append(column_name)
+    return table_name, column_names, column_names[0]
+
+def to_sql_value(value):
+    # Convert a Python / NumPy / pandas value to something sqlite3 can store
+    if value is None:
+        return None
+    if isinstance(value, float) and value != value:
+        return None  # NaN becomes NULL
+    if isinstance(value, (datetime.date, datetime.datetime, pd.Timestamp)):
+        return value.strftime("%Y-%m-%d")
+    if hasattr(value, 'item'):
+        return to_sql_value(value.item())  # NumPy number -> Python number
+    return value
+
+def get_database_version(connection):
+    # Get a number that changes whenever the database is changed
+    # (by us, or by another program using the same file)
+    data_version = connection.execute("PRAGMA data_version").fetchone()[0]
+    return (data_version, _write_counter[0])
+
+def get_table_version(filename):
+    # Get a value that changes whenever the database changes
+    connection = get_connection()
+    return ('sqlite',) + get_database_version(connection)
+
+def mark_changed(table_name):
+    # Remember that a table was changed so its cached copy is not used again
+    _write_counter[0] = _write_counter[0] + 1
+    _table_cache.pop(table_name, None)
+
+def load_table(filename):
+    # Load a whole table as a DataFrame (cached until the database changes)
+    # Quantities are converted to base units (kg -> g, l -> ml) and the
+    # columns get their compact types from schema.py.
+    table_name, column_names, id_column = get_table_info(filename)
+    connection = get_connection()
+    version = get_database_version(connection)
+
+    cached = _table_cache.get(table_name)
+    if cached is None or cached[0] != version:
+        query = f"SELECT * FROM {table_name} ORDER BY {id_column}"
+        frame = apply_column_types(filename, normalize_units(pd.read_sql_query(query, connection)))
+        cached = (version, frame)
+        _table_cache[table_name] = cached
+
+    return cached[1].copy()
+
+def save_table(filename, df):
+    # Replace all rows of a table with the rows of a DataFrame
+    # Done in one transaction, so a crash leaves the old table untouched
+    table_name, column_names, id_column = get_table_info(filename)
+    connection = get_connection()
+
+    rows = []
+    for record in df.to_dict('records'):
+        values = []
+        for column_name in column_names:
+            values.append(to_sql_value(record.get(column_name)))
+        rows.append(values)
+
+    placeholders = ", ".join(["?"] * len(column_names))
+    columns_sql = ", ".join(column_names)
+    with connection:
+        connection.execute(f"DELETE FROM {table_name}")
+        connection.executemany(f"INSERT INTO {table_name} ({columns_sql}) VALUES ({placeholders})", rows)
+    mark_changed(table_name)
+
+def append_row(filename, row):
+    # Insert one new row
+    table_name, column_names, id_column = get_table_info(filename)
+    connection = get_connection()
+
+    values = []
+    for column_name in column_names:
+        values.append(to_sql_value(row.get(column_name)))
+
+    placeholders = ", ".join(["?"] * len(column_names))
+    columns_sql = ", ".join(column_names)
+    with connection:
+        connection.execute(f"INSERT INTO {table_name} ({columns_sql}) VALUES ({placeholders})", values)
+    mark_changed(table_name)
+
+def append_rows(filename, df):
+    # Insert many new rows in one transaction
+    # If anything goes wrong, none of the rows are inserted.
+    table_name, column_names, id_column = get_table_info(filename)
+    connection = get_connection()
+
+    rows = []
+    for record in df.to_dict('records'):
+        values = []
+        for column_name in column_names:
+            values.append(to_sql_value(record.get(column_name)))
+        rows.append(values)
+
+    placeholders = ", ".join(["?"] * len(column_names))
+    columns_sql = ", ".join(column_names)
+    with connection:
+        connection.executemany(f"INSERT INTO {table_name} ({columns_sql}) VALUES ({placeholders})", rows)
+    mark_changed(table_name)
+
+def next_id(filename, id_column):
+    # Get the next free ID (MAX on the primary key is an index lookup)
+    table_name, column_names, primary_key = get_table_info(filename)
+    connection = get_connection()
+    max_id = connection.execute(f"SELECT MAX({id_column}) FROM {table_name}").fetchone()[0]
+    if max_id is None:
+        return 1
+    return int(max_id) + 1
+
+def update_row(filename, id_column, id_value, values):
+    # Update some columns of the row with the given ID
+    #
+    # Args:
+    #     values (dict) - column name -> new value
+    # Returns: True if a row was updated, False if the ID was not found
+    table_name, column_names, primary_key = get_table_info(filename)
+    connection = get_connection()
+
+    set_parts = []
+    parameters = []
+    for column_name in values:
+        set_parts.append(f"{column_name} = ?")
+        parameters.append(to_sql_value(values[column_name]))
+    parameters.append(to_sql_value(id_value))
+
+    set_sql = ", ".join(set_parts)
+    with connection:
+        cursor = connection.execute(f"UPDATE {table_name} SET {set_sql} WHERE {id_column} = ?", parameters)
+    mark_changed(table_name)
+    return cursor.rowcount > 0
+
+def delete_row(filename, id_column, id_value):
+    # Delete the row with the given ID
+    # Returns: True if a row was deleted, False if the ID was not found
+    table_name, column_names, primary_key = get_table_info(filename)
+    connection = get_connection()
+    with connection:
+        cursor = connection.execute(f"DELETE FROM {table_name} WHERE {id_column} = ?", [to_sql_value(id_value)])
+    mark_changed(table_name)
+    return cursor.rowcount > 0
+
+def delete_rows(filename, id_column, id_values):
+    # Delete many rows by their IDs in one transaction
+    # If anything goes wrong, none of the rows are deleted.
+    # Returns: list of the IDs that were found and deleted
+    table_name, column_names, primary_key = get_table_info(filename)
+    connection = get_connection()
+    deleted_ids = []
+    with connection:
+        for id_value in id_values:
+            cursor = connection.execute(f"DELETE FROM {table_name} WHERE {id_column} = ?", [to_sql_value(id_value)])
+            if cursor.rowcount > 0:
+                deleted_ids.append(id_value)
+    mark_changed(table_name)
+    return deleted_ids
+
+def get_row(filename, id_column, id_value):
+    # Get the row with the given ID (an index lookup on the primary key)
+    # Returns: dictionary column name -> value, or None if not found
+    rows = get_rows(filename, id_column, [id_value])
+    if len(rows) == 0:
+        return None
+    # Same value types as the CSV and Parquet backends (dates as datetime.date)
+    row = {}
+    for column in rows.columns:
+        row[column] = to_python_value(rows[column].iat[0])
+    return row
+
+def get_rows(filename, id_column, id_values):
+    # Get the rows with the given IDs, in the same order as id_values
+    # Returns: pandas DataFrame with the compact column types, like
+    #          load_table() (IDs that are not found are skipped)
+    table_name, column_names, primary_key = get_table_info(filename)
+    connection = get_connection()
+    id_values = list(id_values)
+
+    # Ask for the IDs in groups (SQLite limits the number of ? per query)
+    parts = []
+    for start in range(0, len(id_values), 500):
+        group = []
+        for id_value in id_values[start:start + 500]:
+            group.append(to_sql_value(id_value))
+        placeholders = ", ".join(["?"] * len(group))
+        query = f"SELECT * FROM {table_name} WHERE {id_column} IN ({placeholders})"
+        parts.append(pd.read_sql_query(query, connection, params=group))
+    if not parts:
+        rows = pd.read_sql_query(f"SELECT * FROM {table_name} WHERE 0", connection)
+        return apply_column_types(filename, rows)
+    rows = pd.concat(parts, ignore_index=True)
+
+    # Put the rows in the requested order
+    position_of = {}
+    for position in range(len(id_values)):
+        position_of.setdefault(to_sql_value(id_values[position]), position)
+    order = rows[id_column].map(position_of).sort_values(kind='stable').index
+    rows = rows.loc[order].reset_index(drop=True)
+    return apply_column_types(filename, normalize_units(rows))
+
+def import_csv_files():
+    # One-shot importer: copy every existing CSV table into the database
+    # Existing rows in the database tables are replaced. Rows listed in the
+    # table's tombstone log (deleted with the CSV backend) are left out.
+    print("\n=== Importing CSV files into SQLite ===")
+    for filename in TABLE_DEFINITIONS:
+        csv_file = get_data_file_path(filename)
+        try:
+            csv_df = remove_deleted_rows(pd.read_csv(csv_file), read_tombstones(filename))
+            csv_df = normalize_units(csv_df)  # kg -> g, l -> ml
+        except FileNotFoundError:
+            print(f" {filename} not found - skipped.")
+            continue
+        save_table(filename, csv_df)
+        print(f" Imported {len(csv_df)} rows from {filename}")
+    print(f" Database: {get_database_path()}")
+
+# Run the importer when this file is executed directly:
+#     python -m modules.sqlite_store
+if __name__ == "__main__":
+    import_csv_files()
@@ -6,6 +6,10 @@
 # - Calculate waste cost
 # - Suggest waste reduction tips
 #
+# record_waste_entry() adds a waste entry without asking any questions, so the
+# command-line interface (cli.py) and scripts can use it too. The values are
+# checked by schema.py, the same way as in a bulk import.
+#
 # Uses concepts from syllabus:
 # - Pandas for CSV operations
 # - Datetime for date handling
@@ -15,22 +19,9 @@
 
 # Import required libraries (all from syllabus)
 import pandas as pd  # For CSV operations and data manipulation
-from datetime import datetime  # For date handling
-import os  # For file path operations
-
-def get_data_file_path(filename):
-    # Get the correct path to data files
-    # This function handles different execution contexts
-    current_dir = os.path.dirname(os.path.abspath(__file__))
-    parent_dir = os.path.dirname(current_dir)
-    data_path = os.path.join(parent_dir, "data", filename)
-
-    # If data directory doesn't exist, create it
-    data_dir = os.path.dirname(data_path)
-    if not os.path.exists(data_dir):
-        os.makedirs(data_dir)
-
-    return data_path
+from .data_store import get_data_file_path, load_table, save_table, append_row, next_id, delete_row, has_id, get_row  # Shared cached access to CSV files
+from .rollups import get_table_totals, get_group_totals  # Ready-made waste totals
+from .schema import VALID_UNITS, VALID_REASONS, validate_record, ask_value  # Shared validation rules
 
 def load_waste_data():
     # Load waste data from CSV file
@@ -43,11 +34,8 @@ def load_waste_data():
     # - Exception handling with try-except
     # - DataFrame creation with specific columns
     try:
-        # Get correct file path
-        waste_file = get_data_file_path("waste.csv")
-
-        # Read waste CSV file using pandas
-        waste_df = pd.read_csv(waste_file)
+        # Read waste table (cached by the data store)
+        waste_df = load_table("waste.csv")
         return waste_df
     except FileNotFoundError:
         # If file doesn't exist, create empty DataFrame with required columns
@@ -56,8 +44,8 @@ def load_waste_data():
         waste_df = pd.DataFrame(columns=columns)
 
         # Save the empty DataFrame to create the file
+        save_table("waste.csv", waste_df)
         waste_file = get_data_file_path("waste.csv")
-        waste_df.to_csv(waste_file, index=False)
         print(f"SUCCESS: Created new waste database at: {waste_file}")
 
         return waste_df
@@ -72,155 +60,63 @@ def save_waste_data(df):
     # - Pandas to_csv() method
     # - File writing without index
     try:
-        # Get correct file path
-        waste_file = get_data_file_path("waste.csv")
-
-        # Save to CSV without index column
-        df.to_csv(waste_file, index=False)
+        # Save to CSV without index
+        save_table("waste.csv", df)
     except Exception as e:
         print(f"ERROR: Error saving waste data: {e}")
         print("TIP: Please check file permissions and try again.")
 
+def record_waste_entry(name, quantity, unit, reason, cost, date=None):
+    # Check the values of a new waste entry and append it to waste.csv
+    # Only the new row is written (no full rewrite of the file).
+    #
+    # Args:
+    #     date (str) - 'YYYY-MM-DD' (default: today)
+    # Returns: dictionary with the saved row (including its new ID)
+    # Raises: ValueError if a value is not valid
+    record = {}
+    record['name'] = name
+    record['quantity'] = quantity
+    record['unit'] = unit
+    record['reason'] = reason
+    record['date'] = date
+    record['cost'] = cost
+    checked = validate_record("waste.csv", record)
+
+    # The new ID comes from the highest ID remembered by the data store
+    new_waste = {'id': next_id("waste.csv", 'id')}
+    new_waste.update(checked)
+
+    append_row("waste.csv", new_waste)
+    return new_waste
+
 def add_waste_entry():
     # Add a new waste entry to the database
     # This function demonstrates user input validation and data processing
     #
     # Uses syllabus concepts:
     # - input() function for user interaction
-    # - String methods: strip(), title(), lower()
-    # - Data type conversion with float() and int()
-    # - Exception handling for input validation
-    # - Datetime operations
-    # - Dictionary creation and DataFrame operations
+    # - Validation rules shared with the bulk import (schema.py)
+    # - Exception handling
+    # - Dictionary creation
     print("\n=== Add Waste Entry ===")
-    
-    # Load current waste data
-    waste_df = load_waste_data()
-    
-    # Get ingredient name from user - break down the chained operations for clarity
-    user_input = input("Enter ingredient name that was wasted: ")  # Get input from user
-    clean_input = user_input.strip()  # Remove extra spaces from beginning and end
-    name = clean_input.title()  # Convert to Title Case (First Letter Capitalized)
-
-    # Get quantity with validation - keep asking until we get a valid number
-    quantity = 0  # Initialize quantity variable
-    while True:  # Keep looping until we get valid input
-        try:  # Try to convert user input to a number
-            user_quantity = input("Enter quantity wasted: ")  # Get quantity from user
-            quantity = float(user_quantity)  # Convert string to decimal number
 
-            # Check if quantity is positive (greater than 0)
-            if quantity <= 0:
-                print("WARNING: Quantity must be positive. Please try again.")
-            else:
-                break  # Exit the loop if quantity is valid (positive number)
-
-        except ValueError:
-            # This runs if user enters something that can't be converted to a number
-            print("WARNING: Please enter a valid number for quantity.")
-    
-    # Get unit with validation - replace complex string operations with simple loops
-    valid_units = ['g', 'kg', 'ml', 'l', 'pieces', 'slices']
-
-    # Create unit options string using simple loop instead of join()
-    unit_options = ""
-    for unit_option in valid_units:
-        unit_options = unit_options + unit_option + "/"
-    unit_options = unit_options[:-1]  # Remove last slash
-
-    unit = ""
-    while True:
-        user_unit = input(f"Enter unit ({unit_options}): ")
-        clean_unit = user_unit.strip()
-        unit = clean_unit.lower()
-
-        # Check if unit is valid using simple loop instead of 'in' operator
-        unit_found = False
-        for valid_unit in valid_units:
-            if unit == valid_unit:
-                unit_found = True
-                break
-
-        if unit_found:
-            break
-        else:
-            # Create error message using simple loop
-            valid_units_text = ""
-            for valid_unit in valid_units:
-                valid_units_text = valid_units_text + valid_unit + ", "
-            valid_units_text = valid_units_text[:-2]  # Remove last comma and space
-            print(f"WARNING: Please enter a valid unit: {valid_units_text}")
-    
-    # Get waste reason with validation - use simple loops instead of join()
-    valid_reasons = ['expired', 'spoiled', 'leftover', 'overcooked', 'burnt']
-
-    # Create reasons text using simple loop
-    reasons_text = ""
-    for reason_option in valid_reasons:
-        reasons_text = reasons_text + reason_option + ", "
-    reasons_text = reasons_text[:-2]  # Remove last comma and space
-    print(f"Waste reasons: {reasons_text}")
-
-    reason = ""
-    while True:
-        user_reason = input("Enter reason for waste: ")
-        clean_reason = user_reason.strip()
-        reason_lower = clean_reason.lower()
+    # Ask for each value until it is valid (checked by schema.py)
+    prefix = "WARNING: "
+    name = ask_value("waste.csv", "name", "Enter ingredient name that was wasted: ", prefix)
+    quantity = ask_value("waste.csv", "quantity", "Enter quantity wasted: ", prefix)
+    unit = ask_value("waste.csv", "unit", f"Enter unit ({'/'.join(VALID_UNITS)}): ", prefix)
+    print(f"Waste reasons: {', '.join(VALID_REASONS)}")
+    reason = ask_value("waste.csv", "reason", "Enter reason for waste: ", prefix)
+    cost = ask_value("waste.csv", "cost", "Enter estimated cost of wasted item: ", prefix)
 
-        # Check if reason is valid using simple loop
-        reason_found = False
-        for valid_reason in valid_reasons:
-            if reason_lower == valid_reason:
-                reason_found = True
-                reason = reason_lower.title()  # Convert to title case
-                break
-
-        if reason_found:
-            break
-        else:
-            print(f"WARNING: Please enter a valid reason: {reasons_text}")
-    
-    # Get cost with validation
-    cost = 0
-    while True:
-        try:
-            user_cost = input("Enter estimated cost of wasted item: ")
-            cost = float(user_cost)
-            if cost < 0:
-                print("WARNING: Cost cannot be negative. Please try again.")
-            else:
-                break  # Exit loop if cost is valid
-        except ValueError:
-            print("WARNING: Please enter a valid number for cost.")
-
-    # Generate new ID - break down the logic
-    waste_count = len(waste_df)
-    if waste_count == 0:
-        new_id = 1
-    else:
-        max_id = waste_df['id'].max()
-        new_id = max_id + 1
-
-    # Get current date - break down the chained operations
-    current_date = datetime.today()
-    today = current_date.strftime("%Y-%m-%d")
-
-    # Create new waste entry dictionary - use separate lines for clarity
-    new_waste = {}
-    new_waste['id'] = new_id
-    new_waste['name'] = name
-    new_waste['quantity'] = quantity
-    new_waste['unit'] = unit
-    new_waste['reason'] = reason
-    new_waste['date'] = today
-    new_waste['cost'] = cost
-
-    # Add to DataFrame - create new row first, then add
-    new_row_df = pd.DataFrame([new_waste])
-    waste_df = pd.concat([waste_df, new_row_df], ignore_index=True)
-
-    # Save to file
-    save_waste_data(waste_df)
+    # Save the new waste entry (appends just the new row to the file)
+    try:
+        record_waste_entry(name, quantity, unit, reason, cost)
+    except Exception as e:
+        print(f"ERROR: Error saving waste data: {e}")
+        print("TIP: Please check file permissions and try again.")
+        return
 
     print(f"SUCCESS: Waste entry for '{name}' added successfully!")
     cost_formatted = f"₹{cost:.2f}"
@@ -238,10 +134,10 @@ def view_waste_history():
     # - String formatting and conditional statements
     print("\n===  Waste History ===")
     
-    # Load waste data
-    waste_df = load_waste_data()
+    # Count the entries from the ready-made totals (no need to load the table)
+    waste_totals = get_table_totals("waste.csv")
     
-    if len(waste_df) == 0:
+    if waste_totals['count'] == 0:
         print("INFO: No waste entries found.")
         return
     
@@ -255,6 +151,10 @@ def view_waste_history():
     
     choice = input("Enter your choice (1-5): ").strip()
     
+    # Only the options that list single entries need the whole table
+    if choice not in ["4", "5"]:
+        waste_df = load_waste_data()
+    
     if choice == "1":
         # Show all waste entries
         display_waste_table(waste_df)
@@ -277,36 +177,36 @@ def view_waste_history():
             display_waste_table(filtered)
     
     elif choice == "4":
-        # Summary by ingredient using groupby
-        print("\n Waste Summary by Ingredient:")
-        summary = waste_df.groupby('name').agg({
-            'quantity': 'sum',
-            'cost': 'sum'
-        }).round(2)
-        print(summary.to_string())
-        
-        # Calculate total waste cost
-        total_cost = waste_df['cost'].sum()
-        print(f"\nCOST: Total waste cost: ₹{total_cost:.2f}")
+        print_waste_by_ingredient()
     
     elif choice == "5":
-        # Monthly summary (simplified - just by month-year)
-        print("\n Monthly Waste Summary:")
-        # Convert date column to datetime for better processing
-        waste_df['date'] = pd.to_datetime(waste_df['date'])
-        waste_df['month_year'] = waste_df['date'].dt.strftime('%Y-%m')
-        
-        monthly_summary = waste_df.groupby('month_year').agg({
-            'cost': 'sum',
-            'id': 'count'  # Count number of entries
-        }).round(2)
-        monthly_summary.columns = ['Total_Cost', 'Number_of_Entries']
-        print(monthly_summary.to_string())
+        print_monthly_waste()
     
     else:
         print("WARNING: Invalid choice. Showing all waste entries:")
         display_waste_table(waste_df)
 
+def print_waste_by_ingredient():
+    # Summary by ingredient and unit (totals kept up to date by the rollups)
+    # Quantities are stored in base units, so kg and g are already one
+    # unit; an ingredient recorded in two units (e.g. g and pieces) gets
+    # one line per unit
+    print("\n Waste Summary by Ingredient:")
+    summary = get_group_totals("waste.csv", "name_unit")[['quantity', 'cost']].round(2)
+    print(summary.to_string())
+    
+    # Total waste cost
+    total_cost = get_table_totals("waste.csv")['cost']
+    print(f"\nCOST: Total waste cost: ₹{total_cost:.2f}")
+
+def print_monthly_waste():
+    # Monthly summary (simplified - just by month-year)
+    print("\n Monthly Waste Summary:")
+    monthly_summary = get_group_totals("waste.csv", "month")[['cost', 'count']].round(2)
+    monthly_summary.index.name = 'month_year'
+    monthly_summary.columns = ['Total_Cost', 'Number_of_Entries']
+    print(monthly_summary.to_string())
+
 def display_waste_table(df):
     # Display waste DataFrame in a formatted table
     # This function demonstrates DataFrame display operations
@@ -420,8 +320,8 @@ def delete_waste_entry():
     while True:
         try:
             waste_id = int(input("\nEnter waste entry ID to delete: "))
-            # Check if ID exists using membership operator
-            if waste_id in waste_df['id'].values:
+            # Check if ID exists (O(1) lookup in the data store's ID index)
+            if has_id("waste.csv", waste_id):
                 break
             else:
                 print("WARNING: Waste entry ID not found. Please try again.")
@@ -429,7 +329,7 @@ def delete_waste_entry():
             print("WARNING: Please enter a valid number for ID.")
     
     # Get waste entry info for confirmation
-    waste_to_delete = waste_df[waste_df['id'] == waste_id].iloc[0]
+    waste_to_delete = get_row("waste.csv", waste_id)
     
     # Confirm deletion
     print(f"\nAre you sure you want to delete this waste entry?")
@@ -442,11 +342,8 @@ def delete_waste_entry():
     confirmation = input("\nType 'yes' to confirm deletion: ").strip().lower()
     
     if confirmation == 'yes':
-        # Remove the waste entry (keep all rows except the one with matching ID)
-        waste_df = waste_df[waste_df['id'] != waste_id]
-        
-        # Save changes
-        save_waste_data(waste_df)
+        # Remove only the row with matching ID (no full rewrite with SQLite)
+        delete_row("waste.csv", 'id', waste_id)
         
         print(f"SUCCESS: Waste entry for {waste_to_delete['name']} deleted successfully.")
     else: